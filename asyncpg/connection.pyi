@@ -1,7 +1,12 @@
 from asyncio import AbstractEventLoop
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from os import PathLike
 from ssl import SSLContext
+from typing import BinaryIO
 
+from asyncpg.cursor import CursorFactory
 from asyncpg.prepared_stmt import PreparedStatement
+from asyncpg.transaction import Transaction
 
 from asyncpg import Record
 
@@ -9,6 +14,31 @@ class Connection:
     async def execute(
         self, query: str, *args: object, timeout: float | None = None
     ) -> str: ...
+    async def executemany(
+        self,
+        command: str,
+        args: Iterable[Sequence[object]],
+        *,
+        timeout: float | None = None,
+    ) -> None: ...
+    async def copy_records_to_table(
+        self,
+        table_name: str,
+        *,
+        records: Iterable[Sequence[object]],
+        columns: Sequence[str] | None = None,
+        schema_name: str | None = None,
+        timeout: float | None = None,
+        where: str | None = None,
+    ) -> str: ...
+    async def copy_from_query(
+        self,
+        query: str,
+        *args: object,
+        output: str | PathLike[str] | BinaryIO | Callable[[bytes], Awaitable[None]],
+        timeout: float | None = None,
+        format: str | None = None,
+    ) -> str: ...
     async def fetchrow(
         self,
         query: str,
@@ -23,6 +53,14 @@ class Connection:
         timeout: float | None = None,
         record_class: type[Record] | None = None,
     ) -> list[Record]: ...
+    def cursor(
+        self,
+        query: str,
+        *args: object,
+        prefetch: int | None = None,
+        timeout: float | None = None,
+        record_class: type[Record] | None = None,
+    ) -> CursorFactory: ...
     async def prepare(
         self,
         query: str,
@@ -31,7 +69,16 @@ class Connection:
         timeout: float | None = None,
         record_class: type[Record] | None = None,
     ) -> PreparedStatement: ...
+    def transaction(
+        self,
+        *,
+        isolation: str | None = None,
+        readonly: bool = False,
+        deferrable: bool = False,
+    ) -> Transaction: ...
     async def close(self) -> None: ...
+    def is_closed(self) -> bool: ...
+    def is_in_transaction(self) -> bool: ...
 
 async def connect(
     dsn: str | None = None,
@@ -0,0 +1,16 @@
+from typing import Generator
+
+from asyncpg import Record
+
+class CursorFactory:
+    def __aiter__(self) -> CursorIterator: ...
+    def __await__(self) -> Generator[object, None, Cursor]: ...
+
+class CursorIterator:
+    def __aiter__(self) -> CursorIterator: ...
+    async def __anext__(self) -> Record: ...
+
+class Cursor:
+    async def fetch(self, n: int, *, timeout: float | None = None) -> list[Record]: ...
+    async def fetchrow(self, *, timeout: float | None = None) -> Record | None: ...
+    async def forward(self, n: int, *, timeout: float | None = None) -> int: ...
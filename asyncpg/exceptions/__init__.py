@@ -8,3 +8,11 @@ class UndefinedTableError(Exception):
 
 class PostgresError(Exception):
     pass
+
+
+class FeatureNotSupportedError(PostgresError):
+    pass
+
+
+class InvalidCachedStatementError(FeatureNotSupportedError):
+    pass
@@ -1,7 +1,16 @@
 from asyncpg.types import Type, Attribute
 
+from asyncpg import Record
+
 class PreparedStatement:
     """A representation of a prepared statement."""
 
     def get_parameters(self) -> tuple[Type, ...]: ...
     def get_attributes(self) -> tuple[Attribute, ...]: ...
+    def get_statusmsg(self) -> str: ...
+    async def fetch(
+        self, *args: object, timeout: float | None = None
+    ) -> list[Record]: ...
+    async def fetchrow(
+        self, *args: object, timeout: float | None = None
+    ) -> Record | None: ...
@@ -8,11 +8,11 @@ class Record:
     def __contains__(self, key: str) -> bool: ...
     def __eq__(self, value: object) -> bool: ...
     def __getattribute__(self, name: str) -> object: ...
-    def __getitem__(self, key: str) -> object: ...
+    def __getitem__(self, key: str | int) -> object: ...
     def __ge__(self, value: Record) -> bool: ...
     def __gt__(self, value: Record) -> bool: ...
     def __hash__(self) -> int: ...
-    def __iter__(self) -> Iterator[tuple[str, object]]: ...
+    def __iter__(self) -> Iterator[object]: ...
     def __len__(self) -> int: ...
     def __le__(self, value: Record) -> bool: ...
     def __lt__(self, value: Record) -> bool: ...
@@ -0,0 +1,87 @@
+"""
+Compares latency of formatting generated code by ruff run through `python -m ruff` and by the ruff binary,
+for code passed through stdin and for batches of files.
+"""
+
+import asyncio
+import pathlib
+import time
+from collections.abc import Sequence
+
+from strictql_postgres.code_generator import render_code_for_query_with_fetch_all_method
+from strictql_postgres.code_quality import (
+    RUFF_MODULE_COMMAND,
+    CodeFixer,
+    find_ruff_command,
+)
+from strictql_postgres.common_types import NotEmptyRowSchema
+from strictql_postgres.python_types import Integer, String
+from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
+
+FILES_COUNT = 500
+SINGLE_FILE_REPEATS = 20
+REPEATS = 3
+
+
+def create_files() -> dict[pathlib.Path, str]:
+    return {
+        pathlib.Path(f"fetch_users_{index}.py"): (
+            render_code_for_query_with_fetch_all_method(
+                query=f"select id, name from users limit {index}",
+                result_schema=NotEmptyRowSchema(
+                    {
+                        "id": Integer(is_optional=True),
+                        "name": String(is_optional=True),
+                    }
+                ),
+                bind_params=[],
+                function_name=StringInSnakeLowerCase(f"fetch_users_{index}"),
+            )
+        )
+        for index in range(FILES_COUNT)
+    }
+
+
+async def measure_single_file_latency(ruff_command: Sequence[str], code: str) -> float:
+    code_fixer = CodeFixer(ruff_command=ruff_command)
+    best_duration = float("inf")
+    for _ in range(SINGLE_FILE_REPEATS):
+        started_at = time.perf_counter()
+        await code_fixer.try_to_improve_code(code=code)
+        best_duration = min(best_duration, time.perf_counter() - started_at)
+    return best_duration
+
+
+async def measure_batch_latency_per_file(
+    ruff_command: Sequence[str], files: dict[pathlib.Path, str]
+) -> float:
+    code_fixer = CodeFixer(ruff_command=ruff_command)
+    best_duration = float("inf")
+    for _ in range(REPEATS):
+        started_at = time.perf_counter()
+        await code_fixer.try_to_improve_files(files=files)
+        best_duration = min(best_duration, time.perf_counter() - started_at)
+    return best_duration / len(files)
+
+
+async def main() -> None:
+    files = create_files()
+    ruff_commands = {
+        "python -m ruff": RUFF_MODULE_COMMAND,
+        "ruff binary": find_ruff_command(),
+    }
+    for name, ruff_command in ruff_commands.items():
+        single_file_latency = await measure_single_file_latency(
+            ruff_command=ruff_command, code=next(iter(files.values()))
+        )
+        batch_latency_per_file = await measure_batch_latency_per_file(
+            ruff_command=ruff_command, files=files
+        )
+        print(
+            f"{name:<20} {single_file_latency * 1000:>8.2f} ms/file through stdin"
+            f" {batch_latency_per_file * 1000:>8.3f} ms/file in a batch of {len(files)} files"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,281 @@
+"""
+Measures what the generated code costs applications using it: import time of the generated package,
+memory allocated per loaded module and time to the first completed query,
+for synthetic projects of different sizes generated by each of packaging settings.
+Time of the code generation is measured too, it includes rendering of the shared models module.
+
+Each measurement runs in a new interpreter, so modules are imported from scratch.
+Queries are introspected from a schema snapshot and the first query is run on a fake connection returning
+a prepared record, so Postgres is not required.
+"""
+
+import asyncio
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+
+from pydantic import BaseModel, SecretStr
+
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.generated_code_writer import write_generated_code
+from strictql_postgres.python_types import (
+    ALL_TYPES,
+    Bool,
+    DateTimeType,
+    DecimalType,
+    Float,
+    Integer,
+    String,
+)
+from strictql_postgres.queries_generator import generate_queries
+from strictql_postgres.queries_to_generate import (
+    DataBaseSettings,
+    QueryToGenerate,
+    StrictQLQueriesToGenerate,
+)
+from strictql_postgres.schema_snapshot import SchemaSnapshot
+from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
+
+QUERIES_COUNTS = (100, 1_000, 10_000)
+QUERIES_PER_PACKAGE = 100
+REPEATS = 3
+GENERATED_PACKAGE_NAME = "generated_code"
+
+# each shape of rows is shared by this count of queries, so count of shapes grows with count of queries
+QUERIES_PER_ROW_SHAPE = 2
+
+# types of columns cycled through by generated queries
+COLUMNS_TYPES: Sequence[ALL_TYPES] = (
+    Integer(is_optional=False),
+    String(is_optional=True),
+    Float(is_optional=True),
+    Bool(is_optional=False),
+    DecimalType(is_optional=True),
+    DateTimeType(is_optional=True),
+)
+
+# the first query always has the same shape, the fake connection returns a record of it
+FIRST_QUERY_FUNCTION_NAME = "fetch_rows_0"
+FIRST_QUERY_RECORD = (1, "name")
+
+MEASURE_SCRIPT = """
+import asyncio
+import importlib
+import json
+import sys
+import time
+import tracemalloc
+
+# dependencies of the generated code are imported beforehand, only the cost of the generated code itself is measured
+import asyncpg
+import pydantic
+
+package_name, first_query_module_name, first_query_function_name, trace_memory = sys.argv[1:5]
+module_names = sys.stdin.read().split()
+
+
+class FakeConnection:
+    async def fetch(self, query, *args, timeout=None):
+        return [FIRST_QUERY_RECORD]
+
+
+if trace_memory == "1":
+    tracemalloc.start()
+started_at = time.perf_counter()
+package = importlib.import_module(package_name)
+for module_name in module_names:
+    importlib.import_module(module_name)
+import_seconds = time.perf_counter() - started_at
+allocated_bytes, _ = tracemalloc.get_traced_memory()
+loaded_modules_count = sum(1 for name in sys.modules if name.startswith(package_name))
+tracemalloc.stop()
+
+function = getattr(importlib.import_module(first_query_module_name), first_query_function_name)
+asyncio.run(function(FakeConnection()))
+first_query_seconds = time.perf_counter() - started_at
+
+print(
+    json.dumps(
+        {
+            "import_seconds": import_seconds,
+            "first_query_seconds": first_query_seconds,
+            "bytes_per_module": allocated_bytes / loaded_modules_count,
+            "loaded_modules_count": loaded_modules_count,
+        }
+    )
+)
+""".replace("FIRST_QUERY_RECORD", repr(FIRST_QUERY_RECORD))
+
+
+class Measurement(BaseModel):  # type: ignore[explicit-any]
+    import_seconds: float
+    first_query_seconds: float
+    bytes_per_module: float
+    loaded_modules_count: int
+
+
+def create_queries_introspections(queries_count: int) -> dict[str, QueryIntrospection]:
+    introspections = {}
+    for index in range(queries_count):
+        if index == 0:
+            response_schema: dict[str, ALL_TYPES] = {
+                "id": Integer(is_optional=False),
+                "name": String(is_optional=True),
+            }
+        else:
+            # the shape is identified by the name of its first column, other columns vary by count and types
+            shape_index = index // QUERIES_PER_ROW_SHAPE
+            response_schema = {f"shape_{shape_index}_id": Integer(is_optional=False)}
+            for column_index in range(shape_index % 12):
+                response_schema[f"column_{column_index}"] = COLUMNS_TYPES[
+                    (shape_index + column_index) % len(COLUMNS_TYPES)
+                ]
+        query = f"select {', '.join(response_schema)} from table_{index}"
+        introspections[query] = QueryIntrospection(
+            response_schema=response_schema, bind_params_types=[]
+        )
+    return introspections
+
+
+async def generate_project(
+    generated_code_path: pathlib.Path,
+    introspections: dict[str, QueryIntrospection],
+    lazy_imports: bool,
+    shared_models: bool,
+) -> float:
+    """
+    Generates and writes the project, returns time of the code generation.
+    """
+    connection_url = SecretStr("")
+    queries_to_generate = StrictQLQueriesToGenerate(
+        queries_to_generate={
+            generated_code_path
+            / f"queries_{index // QUERIES_PER_PACKAGE}"
+            / f"fetch_rows_{index}.py": QueryToGenerate(
+                query=query,
+                parameters={},
+                database_name="db",
+                database_connection_url=connection_url,
+                query_type="fetch",
+                function_name=StringInSnakeLowerCase(f"fetch_rows_{index}"),
+                lazy_imports=lazy_imports,
+                shared_models=shared_models,
+            )
+            for index, query in enumerate(introspections)
+        },
+        databases={"db": DataBaseSettings(connection_url=connection_url)},
+        generated_code_path=generated_code_path,
+        code_format="none",
+        lazy_imports=lazy_imports,
+        shared_models=shared_models,
+    )
+    schema_snapshot = SchemaSnapshot.create(introspections={"db": introspections})
+    started_at = time.perf_counter()
+    generated_files = await generate_queries(
+        queries_to_generate=queries_to_generate, schema_snapshot=schema_snapshot
+    )
+    generation_seconds = time.perf_counter() - started_at
+    write_generated_code(
+        target_directory=generated_code_path,
+        files={
+            file_path: generated_file.content
+            for file_path, generated_file in generated_files.items()
+        },
+        meta_file_name="meta",
+    )
+    return generation_seconds
+
+
+def run_measure_script(
+    project_path: pathlib.Path, module_names: Sequence[str], trace_memory: bool
+) -> Measurement:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            MEASURE_SCRIPT,
+            GENERATED_PACKAGE_NAME,
+            f"{GENERATED_PACKAGE_NAME}.queries_0.{FIRST_QUERY_FUNCTION_NAME}",
+            FIRST_QUERY_FUNCTION_NAME,
+            "1" if trace_memory else "0",
+        ],
+        # names of modules are passed through stdin, there are too many of them for arguments
+        input="\n".join(module_names),
+        cwd=project_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return Measurement.model_validate_json(result.stdout)
+
+
+def measure_import(
+    project_path: pathlib.Path, module_names: Sequence[str]
+) -> Measurement:
+    """
+    Returns the fastest of runs, memory is measured by a separate run, because tracing allocations slows imports down.
+    """
+    measurements = [
+        run_measure_script(
+            project_path=project_path, module_names=module_names, trace_memory=False
+        )
+        for _ in range(REPEATS)
+    ]
+    memory_measurement = run_measure_script(
+        project_path=project_path, module_names=module_names, trace_memory=True
+    )
+    return Measurement(
+        import_seconds=min(measurement.import_seconds for measurement in measurements),
+        first_query_seconds=min(
+            measurement.first_query_seconds for measurement in measurements
+        ),
+        bytes_per_module=memory_measurement.bytes_per_module,
+        loaded_modules_count=memory_measurement.loaded_modules_count,
+    )
+
+
+async def main() -> None:
+    # eagerly imported packages are imported module by module, the same as by applications referring to all queries
+    settings = {
+        "eager": (False, False),
+        "eager, shared models": (False, True),
+        "lazy": (True, False),
+        "lazy, shared models": (True, True),
+    }
+    for queries_count in QUERIES_COUNTS:
+        introspections = create_queries_introspections(queries_count=queries_count)
+        for name, (lazy_imports, shared_models) in settings.items():
+            with tempfile.TemporaryDirectory() as project_dir:
+                project_path = pathlib.Path(project_dir)
+                generation_seconds = await generate_project(
+                    generated_code_path=project_path / GENERATED_PACKAGE_NAME,
+                    introspections=introspections,
+                    lazy_imports=lazy_imports,
+                    shared_models=shared_models,
+                )
+                module_names = (
+                    []
+                    if lazy_imports
+                    else [
+                        f"{GENERATED_PACKAGE_NAME}.queries_{index // QUERIES_PER_PACKAGE}.fetch_rows_{index}"
+                        for index in range(queries_count)
+                    ]
+                )
+                measurement = measure_import(
+                    project_path=project_path, module_names=module_names
+                )
+            print(
+                f"{queries_count:>6} queries {name:<22}"
+                f" generation {generation_seconds:>7.2f} s"
+                f" import {measurement.import_seconds * 1000:>9.2f} ms"
+                f" first query {measurement.first_query_seconds * 1000:>9.2f} ms"
+                f" {measurement.bytes_per_module / 1024:>8.1f} KiB/module"
+                f" in {measurement.loaded_modules_count} modules"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
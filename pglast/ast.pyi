@@ -1,4 +1,5 @@
 from pglast.enums.nodes import JoinType
+from pglast.enums.parsenodes import SetOperation
 
 class Node:
     pass
@@ -9,6 +10,27 @@ class A_Star(Node):
 class ColumnRef(Node):
     fields: tuple[Node, ...]
 
+class String(Node):
+    sval: str
+
+class A_Const(Node):
+    isnull: bool
+
+class TypeCast(Node):
+    arg: Node
+
+class FuncCall(Node):
+    funcname: tuple[String, ...]
+
+class GroupingSet(Node):
+    pass
+
+class CommonTableExpr(Node):
+    ctename: str
+
+class WithClause(Node):
+    ctes: tuple[CommonTableExpr, ...]
+
 class RawStmt(Node):
     stmt: Node
     stmt_len: int
@@ -24,23 +46,47 @@ class Alias(Node):
 
 class RangeVar(Node):
     alias: Alias | None
+    schemaname: str | None
     relname: str
 
 class JoinExpr(Node):
-    alias: Alias
+    alias: Alias | None
     jointype: JoinType
     larg: Node
     rarg: Node
 
 class SelectStmt(Node):
-    targetList: tuple[ResTarget, ...]
+    targetList: tuple[ResTarget, ...] | None
     fromClause: tuple[Node, ...] | None
+    valuesLists: tuple[tuple[Node, ...], ...] | None
+    groupClause: tuple[Node, ...] | None
+    withClause: WithClause | None
+    op: SetOperation
 
 class RangeSubselect(Node):
     lateral: bool
     subquery: Node
     alias: Alias
 
+class ParamRef(Node):
+    number: int
+
 class InsertStmt(Node):
     relation: RangeVar
-    cols: tuple[ResTarget, ...]
+    cols: tuple[ResTarget, ...] | None
+    selectStmt: Node | None
+    onConflictClause: Node | None
+    returningList: tuple[ResTarget, ...] | None
+    withClause: WithClause | None
+
+class UpdateStmt(Node):
+    relation: RangeVar
+    fromClause: tuple[Node, ...] | None
+    returningList: tuple[ResTarget, ...] | None
+    withClause: WithClause | None
+
+class DeleteStmt(Node):
+    relation: RangeVar
+    usingClause: tuple[Node, ...] | None
+    returningList: tuple[ResTarget, ...] | None
+    withClause: WithClause | None
@@ -0,0 +1,7 @@
+from enum import IntEnum, auto
+
+class SetOperation(IntEnum):
+    SETOP_NONE = 0
+    SETOP_UNION = auto()
+    SETOP_INTERSECT = auto()
+    SETOP_EXCEPT = auto()
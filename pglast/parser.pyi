@@ -0,0 +1 @@
+class ParseError(Exception): ...
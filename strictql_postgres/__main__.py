@@ -3,6 +3,7 @@ import logging
 import os
 import pathlib
 import sys
+from typing import Collection, Mapping
 
 from cyclopts import App
 from rich.console import Console
@@ -20,22 +21,27 @@ from strictql_postgres.config_manager import (
 )
 from strictql_postgres.dir_diff import get_diff_for_changed_files, get_missed_files
 from strictql_postgres.directory_reader import read_directory_python_files_recursive
+from strictql_postgres.fast_check import FastCheckError, check_generated_code_inputs
 from strictql_postgres.generated_code_writer import (
     GeneratedCodeWriterError,
+    GeneratedFile,
+    read_generated_code,
     write_generated_code,
 )
 from strictql_postgres.meta_file import (
     FILE_EXTENSIONS_TO_EXCLUDE,
     STRICTQL_META_FILE_NAME,
     generate_meta_file,
+    parse_meta_file_content,
 )
-from strictql_postgres.python_types import FilesContentByPath
 from strictql_postgres.queries_generator import (
     PostgresConnectionError,
     QueriesGeneratorErrors,
+    create_schema_snapshot,
     generate_queries,
 )
 from strictql_postgres.queries_to_generate import StrictQLQueriesToGenerate
+from strictql_postgres.schema_snapshot import SchemaSnapshot, SchemaSnapshotError
 
 logger = logging.getLogger(__name__)
 
@@ -46,10 +52,19 @@ app = App(console=console)
 @dataclasses.dataclass(frozen=True)
 class GenerateQueriesResult:
     queries_to_generate: StrictQLQueriesToGenerate
-    generated_code: FilesContentByPath
+    generated_files: Mapping[pathlib.Path, GeneratedFile]
 
+    @property
+    def generated_code(self) -> dict[pathlib.Path, str]:
+        return {
+            file_path: generated_file.content
+            for file_path, generated_file in self.generated_files.items()
+        }
 
-async def _generate_queries() -> GenerateQueriesResult:
+
+def _get_queries_to_generate(
+    require_connection_urls: bool = True,
+) -> StrictQLQueriesToGenerate:
     pyproject_toml_path = pathlib.Path("pyproject.toml").resolve()
 
     try:
@@ -90,6 +105,19 @@ async def _generate_queries() -> GenerateQueriesResult:
             code_generated_dir=parsed_strictql_settings.code_generate_dir,
             parsed_databases=parsed_strictql_settings.databases,
             environment_variables=os.environ,
+            introspection_concurrency=parsed_strictql_settings.introspection_concurrency,
+            formatter_concurrency=parsed_strictql_settings.formatter_concurrency,
+            render_concurrency=parsed_strictql_settings.render_concurrency,
+            cache_dir=parsed_strictql_settings.cache_dir,
+            validation=parsed_strictql_settings.validation,
+            model_backend=parsed_strictql_settings.model_backend,
+            prepared_statements=parsed_strictql_settings.prepared_statements,
+            infer_nullability=parsed_strictql_settings.infer_nullability,
+            schema_snapshot_path=parsed_strictql_settings.schema_snapshot_path,
+            code_format=parsed_strictql_settings.format,
+            shared_models=parsed_strictql_settings.shared_models,
+            lazy_imports=parsed_strictql_settings.lazy_imports,
+            require_connection_urls=require_connection_urls,
         )
     except GetStrictQLQueriesToGenerateError:
         console.print(
@@ -99,64 +127,122 @@ async def _generate_queries() -> GenerateQueriesResult:
         console.print_exception()
         sys.exit(1)
 
+    return queries_to_generate
+
+
+def _print_postgres_connection_error(error: PostgresConnectionError) -> None:
+    text = Text(
+        f"Error occurred while connecting to database `{error.database}`:\n",
+        style=Style(color="red", bold=True),
+    )
+    error_text = Text(
+        error.error,
+        style=Style(
+            color="black",
+            bold=False,
+        ),
+    )
+    console.print(
+        text + error_text,
+    )
+
+
+def _print_queries_generator_errors(error: QueriesGeneratorErrors) -> None:
+    console.print(
+        f"Error occurred for {len(error.errors)} queries",
+        style=Style(color="red", bold=True),
+    )
+    table = Table("query", "error", show_lines=True, show_edge=True)
+    for query_generate_error in error.errors:
+        table.add_row(
+            Text(
+                query_generate_error.query_to_generate.query,
+                style=Style(color="blue", bold=True),
+            ),
+            Text(query_generate_error.error),
+        )
+
+    console.print(table)
+
+
+def _load_schema_snapshot(path: pathlib.Path) -> SchemaSnapshot:
+    try:
+        return SchemaSnapshot.load(path=path)
+    except SchemaSnapshotError as error:
+        console.print(error.error, style=Style(color="red", bold=True))
+        sys.exit(1)
+
+
+async def _generate_queries(
+    queries_to_generate: StrictQLQueriesToGenerate,
+    incremental: bool = False,
+    offline: bool = False,
+    files_to_generate: Collection[pathlib.Path] | None = None,
+) -> GenerateQueriesResult:
     console.print(
         f"Generating code for {len(queries_to_generate.queries_to_generate)} queries...",
         style=Style(color="green"),
     )
-    try:
-        generated_code = await generate_queries(queries_to_generate)
-    except PostgresConnectionError as error:
-        text = Text(
-            f"Error occurred while connecting to database `{error.database}`:\n",
-            style=Style(color="red", bold=True),
+    previously_generated_files: Mapping[pathlib.Path, GeneratedFile] = {}
+    if incremental:
+        previously_generated_files = read_generated_code(
+            target_directory=queries_to_generate.generated_code_path,
+            meta_file_name=STRICTQL_META_FILE_NAME,
         )
-        error_text = Text(
-            error.error,
-            style=Style(
-                color="black",
-                bold=False,
-            ),
+    schema_snapshot = None
+    if offline:
+        schema_snapshot = _load_schema_snapshot(
+            path=queries_to_generate.schema_snapshot_path
         )
-        console.print(
-            text + error_text,
+    try:
+        generated_files = await generate_queries(
+            queries_to_generate,
+            previously_generated_files=previously_generated_files,
+            schema_snapshot=schema_snapshot,
+            files_to_generate=files_to_generate,
         )
+    except PostgresConnectionError as error:
+        _print_postgres_connection_error(error=error)
         sys.exit(1)
     except QueriesGeneratorErrors as error:
-        console.print(
-            f"Error occurred for {len(error.errors)} queries",
-            style=Style(color="red", bold=True),
-        )
-        table = Table("query", "error", show_lines=True, show_edge=True)
-        for query_generate_error in error.errors:
-            table.add_row(
-                Text(
-                    query_generate_error.query_to_generate.query,
-                    style=Style(color="blue", bold=True),
-                ),
-                Text(query_generate_error.error),
-            )
-
-        console.print(table)
+        _print_queries_generator_errors(error=error)
         sys.exit(1)
 
     return GenerateQueriesResult(
-        queries_to_generate=queries_to_generate, generated_code=generated_code
+        queries_to_generate=queries_to_generate, generated_files=generated_files
     )
 
 
 @app.command()  # type: ignore[misc] # Expression contains "Any", todo fix it on cyclopts
-async def generate() -> None:
+async def generate(incremental: bool = True, offline: bool = False) -> None:
     """
     Сгенерировать код для выполнения sql-запросов в Postgres.
 
     Команда будет искать настройки `strictql` в файле `pyproject.toml`, если файла или настроек нет, то произойдет ошибка.
+
+    Parameters
+    ----------
+    incremental
+        Не генерировать заново файлы, для которых не изменились запрос, его настройки и типы из базы данных.
+    offline
+        Взять типы запросов из снимка схемы, созданного командой `snapshot`, без подключения к базам данных.
     """
-    generate_queries_result = await _generate_queries()
+    generate_queries_result = await _generate_queries(
+        queries_to_generate=_get_queries_to_generate(
+            require_connection_urls=not offline
+        ),
+        incremental=incremental,
+        offline=offline,
+    )
     try:
         write_generated_code(
             target_directory=generate_queries_result.queries_to_generate.generated_code_path,
             files=generate_queries_result.generated_code,
             meta_file_name=STRICTQL_META_FILE_NAME,
+            files_inputs_hashes={
+                file_path: generated_file.inputs_hashes
+                for file_path, generated_file in generate_queries_result.generated_files.items()
+            },
         )
     except GeneratedCodeWriterError:
         console.print(
@@ -173,18 +259,116 @@ async def generate() -> None:
 
 
 @app.command()  # type: ignore[misc] # Expression contains "Any", todo fix it on cyclopts
-async def check() -> None:
+async def snapshot() -> None:
+    """
+    Сохранить типы результатов и параметров всех запросов из баз данных в снимок схемы.
+
+    Снимок используется командами `generate --offline` и `check --offline` вместо подключения к базам данных,
+    его можно закоммитить в репозиторий.
+    """
+    queries_to_generate = _get_queries_to_generate()
+    console.print(
+        f"Introspecting {len(queries_to_generate.queries_to_generate)} queries...",
+        style=Style(color="green"),
+    )
+    try:
+        schema_snapshot = await create_schema_snapshot(
+            queries_to_generate=queries_to_generate
+        )
+    except PostgresConnectionError as error:
+        _print_postgres_connection_error(error=error)
+        sys.exit(1)
+    except QueriesGeneratorErrors as error:
+        _print_queries_generator_errors(error=error)
+        sys.exit(1)
+
+    schema_snapshot.save(path=queries_to_generate.schema_snapshot_path)
+    console.print(
+        f"Schema snapshot saved to {queries_to_generate.schema_snapshot_path}",
+        style=Style(color="green", bold=True),
+    )
+
+
+@app.command()  # type: ignore[misc] # Expression contains "Any", todo fix it on cyclopts
+async def check(fast: bool = False, offline: bool = False) -> None:
     """
     Проверить, что код для выпонления sql-запросов в Postgres находится в актуальном состоянии.
 
     Команда будет искать настройки `strictql` в файле `pyproject.toml`, если файла или настроек нет, то произойдет ошибка.
+
+    Parameters
+    ----------
+    fast
+        Проверить код по хешам запросов и их настроек из мета-файла без подключения к базам данных.
+        Код генерируется заново только для запросов, которые изменились.
+        Типы из баз данных при этом не проверяются.
+    offline
+        Взять типы запросов из снимка схемы, созданного командой `snapshot`, без подключения к базам данных.
     """
+    queries_to_generate = _get_queries_to_generate(
+        require_connection_urls=not fast and not offline
+    )
+    files_to_generate = None
+    if fast:
+        try:
+            fast_check_result = check_generated_code_inputs(
+                queries_to_generate=queries_to_generate,
+                meta_file_name=STRICTQL_META_FILE_NAME,
+            )
+        except FastCheckError as error:
+            console.print(error.error, style=Style(color="red", bold=True))
+            sys.exit(1)
 
-    generate_queries_result = await _generate_queries()
+        for title, files in [
+            ("Missed files:", fast_check_result.missed_files),
+            ("Extra files:", fast_check_result.extra_files),
+        ]:
+            if files:
+                files_table = Table(style=Style(color="red"))
+                files_table.add_column("File", justify="center")
+                for file in sorted(files):
+                    files_table.add_row(str(file))
+                console.print(title, files_table)
+        if fast_check_result.missed_files or fast_check_result.extra_files:
+            sys.exit(1)
+
+        if not fast_check_result.stale_files:
+            console.print(
+                "Check completed successfully.", style=Style(color="green", bold=True)
+            )
+            return
+
+        console.print(
+            f"Inputs of {len(fast_check_result.stale_files)} queries changed since the code generation, checking them by generating the code...",
+            style=Style(color="yellow"),
+        )
+        queries_to_generate = _get_queries_to_generate(
+            require_connection_urls=not offline
+        )
+        # modules not generated from a single query, like `__init__.py` files of lazy packages,
+        # are still generated from all queries, so they are checked too
+        files_to_generate = [
+            file_path
+            for file_path in queries_to_generate.queries_to_generate
+            if file_path.resolve() in fast_check_result.stale_files
+        ]
+
+    generate_queries_result = await _generate_queries(
+        queries_to_generate=queries_to_generate,
+        offline=offline,
+        files_to_generate=files_to_generate,
+    )
 
     actual_files = read_directory_python_files_recursive(
         path=generate_queries_result.queries_to_generate.generated_code_path
     )
+    if fast:
+        # other files are already checked by hashes
+        actual_files = {
+            file_path: file_content
+            for file_path, file_content in actual_files.items()
+            if file_path in generate_queries_result.generated_code
+        }
 
     missed_files = get_missed_files(
         actual=actual_files, expected=generate_queries_result.generated_code
@@ -240,8 +424,11 @@ async def check() -> None:
             f"Meta file: {meta_file_path.resolve()} does not exist",
             style=Style(color="red", bold=True),
         )
+        sys.exit(1)
 
-    actual_meta_file_content = meta_file_path.read_text()
+    actual_meta_file_content = parse_meta_file_content(
+        meta_file_path.read_text()
+    ).checksum
     expected_meta_file_content = generate_meta_file(
         path=generate_queries_result.queries_to_generate.generated_code_path,
         meta_file_name=STRICTQL_META_FILE_NAME,
@@ -2,5 +2,17 @@ from strictql_postgres.asyncpg_result_converter import (
     convert_record_to_pydantic_model,
     convert_records_to_pydantic_models,
 )
+from strictql_postgres.binary_copy import BinaryCopyDecodeError, BinaryCopyDecoder
+from strictql_postgres.prepared_statements_registry import (
+    PreparedStatementsRegistry,
+    PreparedStatementsRegistryError,
+)
 
-__all__ = ["convert_records_to_pydantic_models", "convert_record_to_pydantic_model"]
+__all__ = [
+    "convert_records_to_pydantic_models",
+    "convert_record_to_pydantic_model",
+    "PreparedStatementsRegistry",
+    "PreparedStatementsRegistryError",
+    "BinaryCopyDecoder",
+    "BinaryCopyDecodeError",
+]
@@ -0,0 +1,338 @@
+import datetime
+import decimal
+import struct
+from collections.abc import Callable, Sequence
+
+from strictql_postgres.dataclass_error import Error
+
+ValueDecoder = Callable[[memoryview], object]
+
+_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+# signature, flags and length of the header extension area
+_HEADER_SIZE = len(_SIGNATURE) + 8
+_TRAILER = -1
+
+_INT16 = struct.Struct(">h")
+_INT32 = struct.Struct(">i")
+_FLOAT4 = struct.Struct(">f")
+_FLOAT8 = struct.Struct(">d")
+
+_INT32_MAX = 2**31 - 1
+_INT32_MIN = -(2**31)
+_INT64_MAX = 2**63 - 1
+_INT64_MIN = -(2**63)
+
+_POSTGRES_EPOCH_DATE_ORDINAL = datetime.date(2000, 1, 1).toordinal()
+_POSTGRES_EPOCH_DATETIME = datetime.datetime(2000, 1, 1)
+_POSTGRES_EPOCH_DATETIME_UTC = datetime.datetime(2000, 1, 1, tzinfo=datetime.UTC)
+
+_NUMERIC_NEGATIVE = 0x4000
+_NUMERIC_NAN = 0xC000
+_NUMERIC_POSITIVE_INFINITY = 0xD000
+_NUMERIC_NEGATIVE_INFINITY = 0xF000
+
+
+class BinaryCopyDecodeError(Error):
+    pass
+
+
+def _read_int16(data: memoryview, offset: int) -> int:
+    return int.from_bytes(data[offset : offset + 2], "big", signed=True)
+
+
+def _read_int32(data: memoryview, offset: int) -> int:
+    return int.from_bytes(data[offset : offset + 4], "big", signed=True)
+
+
+def _read_int64(data: memoryview, offset: int) -> int:
+    return int.from_bytes(data[offset : offset + 8], "big", signed=True)
+
+
+def _decode_int(data: memoryview) -> int:
+    return int.from_bytes(data, "big", signed=True)
+
+
+def _decode_float4(data: memoryview) -> float:
+    value: float = _FLOAT4.unpack(data)[0]  # type: ignore[misc] # struct returns tuples of Any
+    return value
+
+
+def _decode_float8(data: memoryview) -> float:
+    value: float = _FLOAT8.unpack(data)[0]  # type: ignore[misc] # struct returns tuples of Any
+    return value
+
+
+def _decode_text(data: memoryview) -> str:
+    return str(data, "utf-8")
+
+
+def _decode_jsonb(data: memoryview) -> str:
+    # jsonb is sent as text prefixed by the version of the format
+    return str(data[1:], "utf-8")
+
+
+def _decode_bool(data: memoryview) -> bool:
+    return data[0] != 0
+
+
+def _decode_bytea(data: memoryview) -> bytes:
+    return bytes(data)
+
+
+def _decode_numeric(data: memoryview) -> decimal.Decimal:
+    digits_count = _read_int16(data, 0)
+    weight = _read_int16(data, 2)
+    sign = _read_int16(data, 4) & 0xFFFF
+    scale = _read_int16(data, 6)
+    if sign == _NUMERIC_NAN:
+        return decimal.Decimal("NaN")
+    if sign == _NUMERIC_POSITIVE_INFINITY:
+        return decimal.Decimal("Infinity")
+    if sign == _NUMERIC_NEGATIVE_INFINITY:
+        return decimal.Decimal("-Infinity")
+
+    # digits are in base 10000, the first one is multiplied by 10000 in the power of weight
+    decimal_digits = "".join(
+        f"{_read_int16(data, 8 + index * 2):04d}" for index in range(digits_count)
+    )
+    exponent = (weight - digits_count + 1) * 4
+    # the value has exactly `scale` digits after the point, the same as numbers fetched by asyncpg
+    if exponent < -scale:
+        decimal_digits = decimal_digits[: len(decimal_digits) + exponent + scale]
+    else:
+        decimal_digits += "0" * (exponent + scale)
+    return decimal.Decimal(
+        (
+            1 if sign == _NUMERIC_NEGATIVE else 0,
+            tuple(int(digit) for digit in decimal_digits or "0"),
+            -scale,
+        )
+    )
+
+
+def _decode_date(data: memoryview) -> datetime.date:
+    days = _decode_int(data)
+    if days == _INT32_MAX:
+        return datetime.date.max
+    if days == _INT32_MIN:
+        return datetime.date.min
+    return datetime.date.fromordinal(_POSTGRES_EPOCH_DATE_ORDINAL + days)
+
+
+def _create_time(microseconds: int, tzinfo: datetime.tzinfo | None) -> datetime.time:
+    seconds, microsecond = divmod(microseconds, 1_000_000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return datetime.time(hour, minute, second, microsecond, tzinfo=tzinfo)
+
+
+def _decode_time(data: memoryview) -> datetime.time:
+    return _create_time(microseconds=_decode_int(data), tzinfo=None)
+
+
+def _decode_timetz(data: memoryview) -> datetime.time:
+    # offset of the time zone is sent in seconds west of UTC
+    offset_seconds = _read_int32(data, 8)
+    return _create_time(
+        microseconds=_read_int64(data, 0),
+        tzinfo=datetime.timezone(datetime.timedelta(seconds=-offset_seconds)),
+    )
+
+
+def _decode_timestamp(data: memoryview) -> datetime.datetime:
+    microseconds = _decode_int(data)
+    if microseconds == _INT64_MAX:
+        return datetime.datetime.max
+    if microseconds == _INT64_MIN:
+        return datetime.datetime.min
+    return _POSTGRES_EPOCH_DATETIME + datetime.timedelta(microseconds=microseconds)
+
+
+def _decode_timestamptz(data: memoryview) -> datetime.datetime:
+    microseconds = _decode_int(data)
+    if microseconds == _INT64_MAX:
+        return datetime.datetime.max.replace(tzinfo=datetime.UTC)
+    if microseconds == _INT64_MIN:
+        return datetime.datetime.min.replace(tzinfo=datetime.UTC)
+    return _POSTGRES_EPOCH_DATETIME_UTC + datetime.timedelta(microseconds=microseconds)
+
+
+def _decode_interval(data: memoryview) -> datetime.timedelta:
+    # months are converted to 30 days, the same as by asyncpg
+    return datetime.timedelta(
+        days=_read_int32(data, 8) + _read_int32(data, 12) * 30,
+        microseconds=_read_int64(data, 0),
+    )
+
+
+_VALUE_DECODER_BY_POSTGRES_TYPE: dict[str, ValueDecoder] = {
+    "int2": _decode_int,
+    "int4": _decode_int,
+    "int8": _decode_int,
+    "float4": _decode_float4,
+    "float8": _decode_float8,
+    "varchar": _decode_text,
+    "char": _decode_text,
+    "bpchar": _decode_text,
+    "text": _decode_text,
+    "bool": _decode_bool,
+    "bytea": _decode_bytea,
+    "json": _decode_text,
+    "jsonb": _decode_jsonb,
+    "numeric": _decode_numeric,
+    "date": _decode_date,
+    "time": _decode_time,
+    "timetz": _decode_timetz,
+    "timestamp": _decode_timestamp,
+    "timestamptz": _decode_timestamptz,
+    "interval": _decode_interval,
+}
+
+
+def _decode_array_elements(
+    data: memoryview,
+    offset: int,
+    dimensions: Sequence[int],
+    element_decoder: ValueDecoder,
+) -> tuple[list[object], int]:
+    elements: list[object] = []
+    for _ in range(dimensions[0]):
+        if len(dimensions) > 1:
+            element, offset = _decode_array_elements(
+                data=data,
+                offset=offset,
+                dimensions=dimensions[1:],
+                element_decoder=element_decoder,
+            )
+            elements.append(element)
+            continue
+        length = _read_int32(data, offset)
+        offset += 4
+        if length == -1:
+            elements.append(None)
+            continue
+        elements.append(element_decoder(data[offset : offset + length]))
+        offset += length
+    return elements, offset
+
+
+def _create_array_decoder(element_decoder: ValueDecoder) -> ValueDecoder:
+    def decode_array(data: memoryview) -> list[object]:
+        dimensions_count = _read_int32(data, 0)
+        # flags and the type of elements follow the count of dimensions
+        offset = 12
+        dimensions = []
+        for _ in range(dimensions_count):
+            dimensions.append(_read_int32(data, offset))
+            # lower bounds of dimensions are skipped, arrays are decoded to lists
+            offset += 8
+        if dimensions_count == 0:
+            return []
+        elements, _ = _decode_array_elements(
+            data=data,
+            offset=offset,
+            dimensions=dimensions,
+            element_decoder=element_decoder,
+        )
+        return elements
+
+    return decode_array
+
+
+def get_value_decoder(postgres_type: str) -> ValueDecoder | None:
+    """
+    Returns the decoder of values of the type in the binary format, types of arrays are named by the `[]` suffix.
+    """
+    element_type = postgres_type.removesuffix("[]")
+    value_decoder = _VALUE_DECODER_BY_POSTGRES_TYPE.get(element_type)
+    if value_decoder is None or element_type == postgres_type:
+        return value_decoder
+    return _create_array_decoder(element_decoder=value_decoder)
+
+
+class BinaryCopyDecoder:
+    """
+    Decodes rows from chunks of the output of `COPY ... TO STDOUT (FORMAT binary)` by types of columns.
+
+    Chunks may split rows anywhere, the rest of a chunk is decoded with the next one.
+    """
+
+    def __init__(self, columns_types: Sequence[str]) -> None:
+        value_decoders = []
+        for column_type in columns_types:
+            value_decoder = get_value_decoder(postgres_type=column_type)
+            if value_decoder is None:
+                raise BinaryCopyDecodeError(
+                    error=f"Postgres type `{column_type}` is not supported by the binary copy decoder"
+                )
+            value_decoders.append(value_decoder)
+        self._value_decoders = value_decoders
+        self._rest = b""
+        self._is_header_read = False
+        self._is_trailer_read = False
+
+    def feed(self, chunk: bytes) -> list[tuple[object, ...]]:
+        if self._is_trailer_read:
+            raise BinaryCopyDecodeError(error="Data after the end of the copy output")
+        buffer = self._rest + chunk if self._rest else chunk
+        data = memoryview(buffer)
+        offset = 0
+        if not self._is_header_read:
+            if len(data) < _HEADER_SIZE:
+                self._rest = buffer
+                return []
+            if data[: len(_SIGNATURE)] != _SIGNATURE:
+                raise BinaryCopyDecodeError(
+                    error="Copy output is not in the binary format"
+                )
+            header_size = _HEADER_SIZE + _read_int32(data, _HEADER_SIZE - 4)
+            if len(data) < header_size:
+                self._rest = buffer
+                return []
+            offset = header_size
+            self._is_header_read = True
+
+        rows = []
+        columns_count = len(self._value_decoders)
+        size = len(data)
+        while size - offset >= 2:
+            fields_count: int = _INT16.unpack_from(data, offset)[0]  # type: ignore[misc] # struct returns tuples of Any
+            if fields_count == _TRAILER:
+                self._is_trailer_read = True
+                offset += 2
+                break
+            if fields_count != columns_count:
+                raise BinaryCopyDecodeError(
+                    error=f"Row has `{fields_count}` columns, expected `{columns_count}`"
+                )
+            position = offset + 2
+            values: list[object] = []
+            for value_decoder in self._value_decoders:
+                if size - position < 4:
+                    break
+                length: int = _INT32.unpack_from(data, position)[0]  # type: ignore[misc] # struct returns tuples of Any
+                position += 4
+                if length == -1:
+                    values.append(None)
+                    continue
+                if size - position < length:
+                    break
+                values.append(value_decoder(data[position : position + length]))
+                position += length
+            if len(values) < columns_count:
+                # the row is continued by the next chunk
+                break
+            rows.append(tuple(values))
+            offset = position
+
+        self._rest = bytes(data[offset:])
+        if self._is_trailer_read and len(self._rest) > 0:
+            raise BinaryCopyDecodeError(error="Data after the end of the copy output")
+        return rows
+
+    def finish(self) -> None:
+        """
+        Checks that the whole copy output is decoded.
+        """
+        if not self._is_trailer_read:
+            raise BinaryCopyDecodeError(error="Copy output ended in the middle")
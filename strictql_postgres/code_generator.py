@@ -1,42 +1,180 @@
 import dataclasses
-
-from mako.template import (  # type: ignore[import-untyped] # mako has not typing annotations
-    Template,
-)
+from collections.abc import Sequence
 
 from pglast import prettify
+from strictql_postgres.code_layout import (
+    format_code_layout,
+    sort_imports,
+    sort_models,
+)
 from strictql_postgres.code_quality import (
     CodeFixer,
     CodeQualityImproverError,
 )
 from strictql_postgres.common_types import BindParams, NotEmptyRowSchema
 from strictql_postgres.format_exception import format_exception
-from strictql_postgres.model_name_generator import generate_model_name_by_function_name
+from strictql_postgres.model_name_generator import (
+    generate_columns_model_name_by_function_name,
+    generate_model_name_by_function_name,
+    generate_params_model_name_by_function_name,
+    generate_record_decoder_name_by_model_name,
+)
+from strictql_postgres.plain_insert import PlainInsert
 from strictql_postgres.python_types import (
+    FilesContentByPath,
     InnerModelType,
+    ModelBackend,
     ModelType,
+    NumpyColumnType,
+    PreparedStatements,
+    RecordValidation,
+    format_model_fields,
     format_type,
+    generate_code_for_model,
+    generate_record_decoders_code,
+    get_model_import,
+    get_numpy_column_type,
+)
+from strictql_postgres.shared_models import (
+    create_shared_model_type,
+    get_shared_model_names,
 )
 from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
-from strictql_postgres.templates import TEMPLATES_DIR
+from strictql_postgres.templates import render_template
+
+# count of rows fetched by a server-side cursor at once in generated `stream` functions by default
+DEFAULT_STREAM_PREFETCH = 1000
 
 
 class GenerateCodeError(Exception):
     pass
 
 
+async def improve_rendered_code(
+    rendered_code: str, code_quality_improver: CodeFixer
+) -> str:
+    try:
+        return await code_quality_improver.try_to_improve_code(code=rendered_code)
+    except CodeQualityImproverError as code_quality_improver_error:
+        raise GenerateCodeError(
+            f"Code quality improver failed: {format_exception(exception=code_quality_improver_error)}"
+        ) from code_quality_improver_error
+
+
+async def improve_rendered_files(
+    rendered_files: FilesContentByPath, code_quality_improver: CodeFixer
+) -> FilesContentByPath:
+    try:
+        return await code_quality_improver.try_to_improve_files(files=rendered_files)
+    except CodeQualityImproverError as code_quality_improver_error:
+        raise GenerateCodeError(
+            f"Code quality improver failed: {format_exception(exception=code_quality_improver_error)}"
+        ) from code_quality_improver_error
+
+
 @dataclasses.dataclass
 class BindParamToTemplate:
     name_in_function: str
     type_str: str
 
 
-async def generate_code_for_query_with_fetch_row_method(
+@dataclasses.dataclass(frozen=True)
+class ColumnToTemplate:
+    name: str
+    index: int
+    type_str: str
+    is_optional: bool
+    numpy_column_type: NumpyColumnType | None
+
+
+@dataclasses.dataclass(frozen=True)
+class RowModelCode:
+    imports: set[str]
+    models_code: set[str]
+    decoders_code: list[str]
+    decoder_name: str
+    fields: list[tuple[str, str]]
+
+
+def generate_row_model_code(
+    model_type: ModelType,
+    validation: RecordValidation,
+    model_backend: ModelBackend,
+    shared_models_module: str | None = None,
+    defer_build: bool = False,
+    record_type: str = "Record",
+) -> RowModelCode:
+    """
+    Generates the model of fetched rows with its decoders.
+
+    If `shared_models_module` is passed, models are not defined in the generated file, they are imported from
+    the shared models module by names made of hashes of their fields, the model is imported under its usual name too.
+    """
+    if shared_models_module is None:
+        formatted_type = format_type(
+            type=InnerModelType(model_type=model_type, is_optional=False),
+            model_backend=model_backend,
+            defer_build=defer_build,
+        )
+        record_decoders = generate_record_decoders_code(
+            model_type=model_type,
+            validation=validation,
+            model_backend=model_backend,
+            record_type=record_type,
+        )
+        return RowModelCode(
+            imports=formatted_type.imports | record_decoders.imports,
+            models_code=formatted_type.models_code,
+            decoders_code=record_decoders.decoders_code,
+            decoder_name=generate_record_decoder_name_by_model_name(
+                model_name=model_type.name
+            ),
+            fields=record_decoders.fields,
+        )
+
+    shared_model_type = create_shared_model_type(
+        model_type=model_type, model_backend=model_backend
+    )
+    record_decoders = generate_record_decoders_code(
+        model_type=shared_model_type,
+        validation=validation,
+        model_backend=model_backend,
+        record_type=record_type,
+    )
+    imports = {
+        f"from {shared_models_module} import {shared_model_name}"
+        for shared_model_name in get_shared_model_names(model_type=shared_model_type)
+    }
+    imports.add(
+        f"from {shared_models_module} import {shared_model_type.name} as {model_type.name}"
+    )
+    imports |= record_decoders.imports
+    if model_backend != "pydantic":
+        # decoders of other backends cast values of records to types of fields
+        imports |= generate_code_for_model(
+            model_type=shared_model_type, model_backend=model_backend
+        ).imports - {get_model_import(model_backend=model_backend)}
+    return RowModelCode(
+        imports=imports,
+        models_code=set(),
+        decoders_code=record_decoders.decoders_code,
+        decoder_name=generate_record_decoder_name_by_model_name(
+            model_name=shared_model_type.name
+        ),
+        fields=record_decoders.fields,
+    )
+
+
+def render_code_for_query_with_fetch_row_method(
     query: str,
     result_schema: NotEmptyRowSchema,
     bind_params: BindParams,
     function_name: StringInSnakeLowerCase,
-    code_quality_improver: CodeFixer,
+    validation: RecordValidation = "validated",
+    model_backend: ModelBackend = "pydantic",
+    prepared_statements: PreparedStatements = "implicit",
+    shared_models_module: str | None = None,
+    defer_build: bool = False,
 ) -> str:
     query = prettify(query)
     model_type = ModelType(
@@ -44,32 +182,39 @@ async def generate_code_for_query_with_fetch_row_method(
         fields=result_schema.schema,
     )
 
-    formatted_type = format_type(
-        type=InnerModelType(model_type=model_type, is_optional=False),
-    )
     imports = {
         "from asyncpg import Connection",
         "from datetime import timedelta",
-        "from strictql_postgres.api import convert_record_to_pydantic_model",
+        "from asyncpg import Record",
     }
-    imports |= formatted_type.imports
+    if prepared_statements == "registry":
+        imports.add("from asyncpg.exceptions import InvalidCachedStatementError")
+        imports.add("from strictql_postgres.api import PreparedStatementsRegistry")
+    row_model_code = generate_row_model_code(
+        model_type=model_type,
+        validation=validation,
+        model_backend=model_backend,
+        shared_models_module=shared_models_module,
+        defer_build=defer_build,
+    )
+    imports |= row_model_code.imports
     rendered_code: str
     if len(bind_params) == 0:
-        mako_template_path = (
-            TEMPLATES_DIR / "fetch_row_without_params.txt"
-        ).read_text()
-        rendered_code = Template(mako_template_path).render(  # type: ignore[misc] # Any expression because mako has not typing annotations
-            imports=imports,
-            model_name=formatted_type.type_,
+        rendered_code = render_template(
+            "fetch_row_without_params.txt",
+            imports=sort_imports(imports),
+            model_name=model_type.name,
             function_name=function_name.value,
-            models=formatted_type.models_code,
+            models=sort_models(row_model_code.models_code),
+            decoders=row_model_code.decoders_code,
+            decoder_name=row_model_code.decoder_name,
             query=query,
+            prepared_statements=prepared_statements,
             params=[],
         )
     else:
-        mako_template_path = (TEMPLATES_DIR / "fetch_row_with_params.txt").read_text()
         formatted_bind_params = []
-        models = formatted_type.models_code
+        models = set(row_model_code.models_code)
         for bind_param in bind_params:
             formatted_type = format_type(bind_param.type_)
             models |= formatted_type.models_code
@@ -80,29 +225,32 @@ async def generate_code_for_query_with_fetch_row_method(
                     type_str=formatted_type.type_,
                 )
             )
-        rendered_code = Template(mako_template_path).render(  # type: ignore[misc] # Any expression because mako has not typing annotations
-            imports=imports,
-            models=models,
+        rendered_code = render_template(
+            "fetch_row_with_params.txt",
+            imports=sort_imports(imports),
+            models=sort_models(models),
+            decoders=row_model_code.decoders_code,
+            decoder_name=row_model_code.decoder_name,
             function_name=function_name.value,
             model_name=model_type.name,
             query=query,
+            prepared_statements=prepared_statements,
             params=formatted_bind_params,
         )
 
-    try:
-        return await code_quality_improver.try_to_improve_code(code=rendered_code)
-    except CodeQualityImproverError as code_quality_improver_error:
-        raise GenerateCodeError(
-            f"Code quality improver failed: {format_exception(exception=code_quality_improver_error)}"
-        ) from code_quality_improver_error
+    return format_code_layout(code=rendered_code)
 
 
-async def generate_code_for_query_with_fetch_all_method(
+def render_code_for_query_with_fetch_all_method(
     query: str,
     result_schema: NotEmptyRowSchema,
     bind_params: BindParams,
     function_name: StringInSnakeLowerCase,
-    code_quality_improver: CodeFixer,
+    validation: RecordValidation = "validated",
+    model_backend: ModelBackend = "pydantic",
+    prepared_statements: PreparedStatements = "implicit",
+    shared_models_module: str | None = None,
+    defer_build: bool = False,
 ) -> str:
     query = prettify(query)
     model_type = ModelType(
@@ -110,33 +258,54 @@ async def generate_code_for_query_with_fetch_all_method(
         fields=result_schema.schema,
     )
 
-    formatted_type = format_type(
-        type=InnerModelType(model_type=model_type, is_optional=False),
-    )
     imports = {
         "from asyncpg import Connection",
         "from datetime import timedelta",
         "from collections.abc import Sequence",
-        "from strictql_postgres.api import convert_records_to_pydantic_models",
     }
-    imports |= formatted_type.imports
+    if prepared_statements == "registry":
+        imports.add("from asyncpg.exceptions import InvalidCachedStatementError")
+        imports.add("from strictql_postgres.api import PreparedStatementsRegistry")
+    row_model_code = generate_row_model_code(
+        model_type=model_type,
+        validation=validation,
+        model_backend=model_backend,
+        shared_models_module=shared_models_module,
+        defer_build=defer_build,
+    )
+    imports |= row_model_code.imports
+    decoders = row_model_code.decoders_code
+    # validated pydantic models of all rows are created by a single call of a type adapter,
+    # which is faster than validating each row separately
+    bulk_validation = model_backend == "pydantic" and validation == "validated"
+    if bulk_validation:
+        decoders = decoders[:-1]
+        imports.add("from pydantic import TypeAdapter")
+        if defer_build:
+            imports.add("from pydantic import ConfigDict")
+    # records are annotated only in decoders, decoders of inner models are kept by the bulk validation
+    if len(decoders) > 0:
+        imports.add("from asyncpg import Record")
     rendered_code: str
     if len(bind_params) == 0:
-        mako_template_path = (
-            TEMPLATES_DIR / "fetch_all_without_params.txt"
-        ).read_text()
-        rendered_code = Template(mako_template_path).render(  # type: ignore[misc] # Any expression because mako has not typing annotations
-            imports=imports,
-            model_name=formatted_type.type_,
+        rendered_code = render_template(
+            "fetch_all_without_params.txt",
+            imports=sort_imports(imports),
+            model_name=model_type.name,
             function_name=function_name.value,
-            models=formatted_type.models_code,
+            models=sort_models(row_model_code.models_code),
+            decoders=decoders,
+            decoder_name=row_model_code.decoder_name,
+            bulk_validation=bulk_validation,
+            fields=row_model_code.fields,
+            defer_build=defer_build,
             query=query,
+            prepared_statements=prepared_statements,
             params=[],
         )
     else:
-        mako_template_path = (TEMPLATES_DIR / "fetch_all_with_params.txt").read_text()
         formatted_bind_params = []
-        models = formatted_type.models_code
+        models = set(row_model_code.models_code)
         for bind_param in bind_params:
             formatted_type = format_type(bind_param.type_)
             models |= formatted_type.models_code
@@ -147,46 +316,301 @@ async def generate_code_for_query_with_fetch_all_method(
                     type_str=formatted_type.type_,
                 )
             )
-        rendered_code = Template(mako_template_path).render(  # type: ignore[misc] # Any expression because mako has not typing annotations
-            imports=imports,
-            models=models,
+        rendered_code = render_template(
+            "fetch_all_with_params.txt",
+            imports=sort_imports(imports),
+            models=sort_models(models),
+            decoders=decoders,
+            decoder_name=row_model_code.decoder_name,
+            bulk_validation=bulk_validation,
+            fields=row_model_code.fields,
+            defer_build=defer_build,
             function_name=function_name.value,
             model_name=model_type.name,
             query=query,
+            prepared_statements=prepared_statements,
             params=formatted_bind_params,
         )
 
-    try:
-        return await code_quality_improver.try_to_improve_code(code=rendered_code)
-    except CodeQualityImproverError as code_quality_improver_error:
-        raise GenerateCodeError(
-            f"Code quality improver failed: {format_exception(exception=code_quality_improver_error)}"
-        ) from code_quality_improver_error
+    return format_code_layout(code=rendered_code)
 
 
-async def generate_code_for_query_with_execute_method(
+def render_code_for_query_with_stream_method(
     query: str,
+    result_schema: NotEmptyRowSchema,
     bind_params: BindParams,
     function_name: StringInSnakeLowerCase,
-    code_quality_improver: CodeFixer,
+    validation: RecordValidation = "validated",
+    model_backend: ModelBackend = "pydantic",
+    prefetch: int = DEFAULT_STREAM_PREFETCH,
+    shared_models_module: str | None = None,
+    defer_build: bool = False,
 ) -> str:
     query = prettify(query)
-    rendered_code: str
+    model_type = ModelType(
+        name=generate_model_name_by_function_name(function_name=function_name),
+        fields=result_schema.schema,
+    )
+
     imports = {
         "from asyncpg import Connection",
         "from datetime import timedelta",
+        "from collections.abc import AsyncIterator",
+        "from asyncpg import Record",
     }
+    row_model_code = generate_row_model_code(
+        model_type=model_type,
+        validation=validation,
+        model_backend=model_backend,
+        shared_models_module=shared_models_module,
+        defer_build=defer_build,
+    )
+    imports |= row_model_code.imports
+    rendered_code: str
     if len(bind_params) == 0:
-        mako_template_path = (TEMPLATES_DIR / "execute_without_params.txt").read_text()
-        rendered_code = Template(mako_template_path).render(  # type: ignore[misc] # Any expression because mako has not typing annotations
+        rendered_code = render_template(
+            "stream_without_params.txt",
+            imports=sort_imports(imports),
+            model_name=model_type.name,
             function_name=function_name.value,
-            imports=imports,
+            models=sort_models(row_model_code.models_code),
+            decoders=row_model_code.decoders_code,
+            decoder_name=row_model_code.decoder_name,
             query=query,
+            prefetch=prefetch,
             params=[],
         )
     else:
-        mako_template_path = (TEMPLATES_DIR / "execute_with_params.txt").read_text()
+        formatted_bind_params = []
+        models = set(row_model_code.models_code)
+        for bind_param in bind_params:
+            formatted_type = format_type(bind_param.type_)
+            models |= formatted_type.models_code
+            imports |= formatted_type.imports
+            formatted_bind_params.append(
+                BindParamToTemplate(
+                    name_in_function=bind_param.name_in_function,
+                    type_str=formatted_type.type_,
+                )
+            )
+        rendered_code = render_template(
+            "stream_with_params.txt",
+            imports=sort_imports(imports),
+            models=sort_models(models),
+            decoders=row_model_code.decoders_code,
+            decoder_name=row_model_code.decoder_name,
+            function_name=function_name.value,
+            model_name=model_type.name,
+            query=query,
+            prefetch=prefetch,
+            params=formatted_bind_params,
+        )
+
+    return format_code_layout(code=rendered_code)
+
+
+def get_null_mask_name(column_name: str) -> str:
+    return f"{column_name}_is_null"
+
+
+def render_code_for_query_with_fetch_columns_method(
+    query: str,
+    result_schema: NotEmptyRowSchema,
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    prepared_statements: PreparedStatements = "implicit",
+) -> str:
+    """
+    Renders a function returning fetched rows by columns, without creating a model for each row.
+
+    Columns of numeric, boolean, date and interval types are returned as numpy arrays, nulls of optional columns
+    are replaced in arrays and marked by boolean arrays of null masks. Columns of other types are returned as lists.
+    """
+    query = prettify(query)
+    model_name = generate_columns_model_name_by_function_name(
+        function_name=function_name
+    )
+
+    imports = {
+        "from asyncpg import Connection",
+        "from datetime import timedelta",
+        "from collections.abc import Sequence",
+        "from asyncpg import Record",
+        get_model_import(model_backend="dataclass"),
+    }
+    if prepared_statements == "registry":
+        imports.add("from asyncpg.exceptions import InvalidCachedStatementError")
+        imports.add("from strictql_postgres.api import PreparedStatementsRegistry")
+    models: set[str] = set()
+    columns = []
+    fields = {}
+    for index, (column_name, type_) in enumerate(result_schema.schema.items()):
+        if isinstance(type_, InnerModelType):
+            raise GenerateCodeError(
+                f"Columns of composite types can not be fetched by columns: `{column_name}`"
+            )
+        numpy_column_type = get_numpy_column_type(type_=type_)
+        if numpy_column_type is not None:
+            imports.add("import numpy as np")
+            imports.add("from numpy.typing import NDArray")
+            fields[column_name] = f"NDArray[{numpy_column_type.dtype}]"
+            if type_.is_optional:
+                fields[get_null_mask_name(column_name=column_name)] = (
+                    "NDArray[np.bool_]"
+                )
+            type_str = fields[column_name]
+        else:
+            formatted_type = format_type(type_)
+            imports |= formatted_type.imports
+            models |= formatted_type.models_code
+            imports.add("from typing import cast")
+            type_str = formatted_type.type_
+            fields[column_name] = f"list[{type_str}]"
+        columns.append(
+            ColumnToTemplate(
+                name=column_name,
+                index=index,
+                type_str=type_str,
+                is_optional=type_.is_optional,
+                numpy_column_type=numpy_column_type,
+            )
+        )
+    models.add(
+        render_template(
+            "dataclass_model.txt", model_name=model_name, fields=fields
+        ).strip()
+    )
+    decoder_name = generate_record_decoder_name_by_model_name(model_name=model_name)
+    decoder_code = render_template(
+        "columns_decoder.txt",
+        decoder_name=decoder_name,
+        model_name=model_name,
+        columns=columns,
+        get_null_mask_name=get_null_mask_name,
+    ).strip()
+
+    formatted_bind_params = []
+    for bind_param in bind_params:
+        formatted_type = format_type(bind_param.type_)
+        models |= formatted_type.models_code
+        imports |= formatted_type.imports
+        formatted_bind_params.append(
+            BindParamToTemplate(
+                name_in_function=bind_param.name_in_function,
+                type_str=formatted_type.type_,
+            )
+        )
+    rendered_code = render_template(
+        "fetch_columns_with_params.txt"
+        if len(bind_params) > 0
+        else "fetch_columns_without_params.txt",
+        imports=sort_imports(imports),
+        models=sort_models(models),
+        decoders=[decoder_code],
+        decoder_name=decoder_name,
+        function_name=function_name.value,
+        model_name=model_name,
+        query=query,
+        prepared_statements=prepared_statements,
+        params=formatted_bind_params,
+    )
+
+    return format_code_layout(code=rendered_code)
+
+
+def render_code_for_query_with_copy_out_method(
+    query: str,
+    result_schema: NotEmptyRowSchema,
+    columns_postgres_types: Sequence[str],
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    validation: RecordValidation = "validated",
+    model_backend: ModelBackend = "pydantic",
+    defer_build: bool = False,
+) -> str:
+    """
+    Renders functions exporting rows of the query by `COPY ... TO STDOUT (FORMAT binary)`.
+
+    The first function decodes the binary output while it is received and passes models of rows to a callback by chunks,
+    the second one writes the binary output as is to a file.
+    """
+    query = prettify(query)
+    model_type = ModelType(
+        name=generate_model_name_by_function_name(function_name=function_name),
+        fields=result_schema.schema,
+    )
+
+    imports = {
+        "from asyncpg import Connection",
+        "from datetime import timedelta",
+        "from collections.abc import Awaitable, Callable, Sequence",
+        "from os import PathLike",
+        "from typing import BinaryIO",
+        "from strictql_postgres.api import BinaryCopyDecoder",
+    }
+    row_model_code = generate_row_model_code(
+        model_type=model_type,
+        validation=validation,
+        model_backend=model_backend,
+        defer_build=defer_build,
+        record_type="tuple[object, ...]",
+    )
+    imports |= row_model_code.imports
+    models = set(row_model_code.models_code)
+    formatted_bind_params = []
+    for bind_param in bind_params:
+        formatted_type = format_type(bind_param.type_)
+        models |= formatted_type.models_code
+        imports |= formatted_type.imports
+        formatted_bind_params.append(
+            BindParamToTemplate(
+                name_in_function=bind_param.name_in_function,
+                type_str=formatted_type.type_,
+            )
+        )
+    rendered_code = render_template(
+        "copy_out_with_params.txt"
+        if len(bind_params) > 0
+        else "copy_out_without_params.txt",
+        imports=sort_imports(imports),
+        models=sort_models(models),
+        decoders=row_model_code.decoders_code,
+        decoder_name=row_model_code.decoder_name,
+        columns_postgres_types=tuple(columns_postgres_types),
+        function_name=function_name.value,
+        model_name=model_type.name,
+        query=query,
+        params=formatted_bind_params,
+    )
+
+    return format_code_layout(code=rendered_code)
+
 
+def render_code_for_query_with_execute_method(
+    query: str,
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    prepared_statements: PreparedStatements = "implicit",
+) -> str:
+    query = prettify(query)
+    rendered_code: str
+    imports = {
+        "from asyncpg import Connection",
+        "from datetime import timedelta",
+    }
+    if prepared_statements == "registry":
+        imports.add("from asyncpg.exceptions import InvalidCachedStatementError")
+        imports.add("from strictql_postgres.api import PreparedStatementsRegistry")
+    if len(bind_params) == 0:
+        rendered_code = render_template(
+            "execute_without_params.txt",
+            function_name=function_name.value,
+            imports=sort_imports(imports),
+            query=query,
+            prepared_statements=prepared_statements,
+            params=[],
+        )
+    else:
         formatted_bind_params = []
         models = set()
         for bind_param in bind_params:
@@ -200,17 +624,235 @@ async def generate_code_for_query_with_execute_method(
                 )
             )
 
-        rendered_code = Template(mako_template_path).render(  # type: ignore[misc] # Any expression because mako has not typing annotations
+        rendered_code = render_template(
+            "execute_with_params.txt",
             function_name=function_name.value,
             query=query,
+            prepared_statements=prepared_statements,
             params=formatted_bind_params,
-            imports=imports,
-            models=models,
+            imports=sort_imports(imports),
+            models=sort_models(models),
         )
 
-    try:
-        return await code_quality_improver.try_to_improve_code(code=rendered_code)
-    except CodeQualityImproverError as code_quality_improver_error:
-        raise GenerateCodeError(
-            f"Code quality improver failed: {format_exception(exception=code_quality_improver_error)}"
-        ) from code_quality_improver_error
+    return format_code_layout(code=rendered_code)
+
+
+def render_code_for_query_with_execute_many_method(
+    query: str,
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    plain_insert: PlainInsert | None = None,
+) -> str:
+    """
+    Renders a function executing the query for each of passed rows of params.
+
+    If `plain_insert` is passed, rows are loaded into its table by `COPY` instead.
+    """
+    if len(bind_params) == 0:
+        raise GenerateCodeError("Query executed for many rows of params has no params")
+
+    query = prettify(query)
+    params_model_type = ModelType(
+        name=generate_params_model_name_by_function_name(function_name=function_name),
+        fields={
+            bind_param.name_in_function: bind_param.type_ for bind_param in bind_params
+        },
+    )
+    params_model = generate_code_for_model(
+        model_type=params_model_type, model_backend="namedtuple"
+    )
+    params_types = format_model_fields(
+        model_type=params_model_type, model_backend="namedtuple"
+    )
+    imports = {
+        "from asyncpg import Connection",
+        "from collections.abc import Iterable",
+        "from datetime import timedelta",
+        *params_model.imports,
+    }
+    # rows of params can be passed as instances of the generated named tuple or as plain tuples
+    params_type = f"tuple[{', '.join(params_types.fields.values())}]"
+
+    rendered_code: str
+    if plain_insert is None:
+        rendered_code = render_template(
+            "execute_many.txt",
+            function_name=function_name.value,
+            query=query,
+            params_type=params_type,
+            imports=sort_imports(imports),
+            models=sort_models(params_model.models_code),
+        )
+    else:
+        rendered_code = render_template(
+            "copy_records_to_table.txt",
+            function_name=function_name.value,
+            query=query,
+            params_type=params_type,
+            imports=sort_imports(imports),
+            models=sort_models(params_model.models_code),
+            table_name=plain_insert.table_name,
+            schema_name=plain_insert.schema_name,
+            columns=plain_insert.columns,
+        )
+
+    return format_code_layout(code=rendered_code)
+
+
+async def generate_code_for_query_with_fetch_row_method(
+    query: str,
+    result_schema: NotEmptyRowSchema,
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    code_quality_improver: CodeFixer,
+    validation: RecordValidation = "validated",
+    model_backend: ModelBackend = "pydantic",
+    prepared_statements: PreparedStatements = "implicit",
+) -> str:
+    rendered_code = render_code_for_query_with_fetch_row_method(
+        query=query,
+        result_schema=result_schema,
+        bind_params=bind_params,
+        function_name=function_name,
+        validation=validation,
+        model_backend=model_backend,
+        prepared_statements=prepared_statements,
+    )
+
+    return await improve_rendered_code(
+        rendered_code=rendered_code, code_quality_improver=code_quality_improver
+    )
+
+
+async def generate_code_for_query_with_fetch_all_method(
+    query: str,
+    result_schema: NotEmptyRowSchema,
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    code_quality_improver: CodeFixer,
+    validation: RecordValidation = "validated",
+    model_backend: ModelBackend = "pydantic",
+    prepared_statements: PreparedStatements = "implicit",
+) -> str:
+    rendered_code = render_code_for_query_with_fetch_all_method(
+        query=query,
+        result_schema=result_schema,
+        bind_params=bind_params,
+        function_name=function_name,
+        validation=validation,
+        model_backend=model_backend,
+        prepared_statements=prepared_statements,
+    )
+
+    return await improve_rendered_code(
+        rendered_code=rendered_code, code_quality_improver=code_quality_improver
+    )
+
+
+async def generate_code_for_query_with_stream_method(
+    query: str,
+    result_schema: NotEmptyRowSchema,
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    code_quality_improver: CodeFixer,
+    validation: RecordValidation = "validated",
+    model_backend: ModelBackend = "pydantic",
+    prefetch: int = DEFAULT_STREAM_PREFETCH,
+) -> str:
+    rendered_code = render_code_for_query_with_stream_method(
+        query=query,
+        result_schema=result_schema,
+        bind_params=bind_params,
+        function_name=function_name,
+        validation=validation,
+        model_backend=model_backend,
+        prefetch=prefetch,
+    )
+
+    return await improve_rendered_code(
+        rendered_code=rendered_code, code_quality_improver=code_quality_improver
+    )
+
+
+async def generate_code_for_query_with_fetch_columns_method(
+    query: str,
+    result_schema: NotEmptyRowSchema,
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    code_quality_improver: CodeFixer,
+    prepared_statements: PreparedStatements = "implicit",
+) -> str:
+    rendered_code = render_code_for_query_with_fetch_columns_method(
+        query=query,
+        result_schema=result_schema,
+        bind_params=bind_params,
+        function_name=function_name,
+        prepared_statements=prepared_statements,
+    )
+
+    return await improve_rendered_code(
+        rendered_code=rendered_code, code_quality_improver=code_quality_improver
+    )
+
+
+async def generate_code_for_query_with_copy_out_method(
+    query: str,
+    result_schema: NotEmptyRowSchema,
+    columns_postgres_types: Sequence[str],
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    code_quality_improver: CodeFixer,
+    validation: RecordValidation = "validated",
+    model_backend: ModelBackend = "pydantic",
+) -> str:
+    rendered_code = render_code_for_query_with_copy_out_method(
+        query=query,
+        result_schema=result_schema,
+        columns_postgres_types=columns_postgres_types,
+        bind_params=bind_params,
+        function_name=function_name,
+        validation=validation,
+        model_backend=model_backend,
+    )
+
+    return await improve_rendered_code(
+        rendered_code=rendered_code, code_quality_improver=code_quality_improver
+    )
+
+
+async def generate_code_for_query_with_execute_method(
+    query: str,
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    code_quality_improver: CodeFixer,
+    prepared_statements: PreparedStatements = "implicit",
+) -> str:
+    rendered_code = render_code_for_query_with_execute_method(
+        query=query,
+        bind_params=bind_params,
+        function_name=function_name,
+        prepared_statements=prepared_statements,
+    )
+
+    return await improve_rendered_code(
+        rendered_code=rendered_code, code_quality_improver=code_quality_improver
+    )
+
+
+async def generate_code_for_query_with_execute_many_method(
+    query: str,
+    bind_params: BindParams,
+    function_name: StringInSnakeLowerCase,
+    code_quality_improver: CodeFixer,
+    plain_insert: PlainInsert | None = None,
+) -> str:
+    rendered_code = render_code_for_query_with_execute_many_method(
+        query=query,
+        bind_params=bind_params,
+        function_name=function_name,
+        plain_insert=plain_insert,
+    )
+
+    return await improve_rendered_code(
+        rendered_code=rendered_code, code_quality_improver=code_quality_improver
+    )
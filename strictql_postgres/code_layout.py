@@ -0,0 +1,201 @@
+import io
+import re
+import sys
+import tokenize
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Literal
+
+TopLevelStatementKind = Literal["import", "decorator", "definition", "statement"]
+
+_NAME_PATTERN = re.compile(r"\b[A-Za-z_]\w*\b")
+
+
+def _get_import_section(module: str) -> int:
+    if module.startswith("."):
+        return 3
+    top_level_module = module.split(".")[0]
+    if top_level_module == "__future__":
+        return 0
+    if top_level_module in sys.stdlib_module_names:
+        return 1
+    return 2
+
+
+def _get_imported_name_sort_key(name: str) -> tuple[int, str]:
+    # constants, then classes, then functions, same as isort
+    if name.isupper() and len(name) > 1:
+        return 0, name
+    if name[0].isupper():
+        return 1, name
+    return 2, name.lower()
+
+
+def sort_imports(imports: Iterable[str]) -> list[str]:
+    """
+    Merges `from` imports of the same module and sorts imports by sections of the standard library, other modules
+    and relative imports.
+
+    Sections are separated by empty lines.
+    """
+    names_by_module: dict[str, set[str]] = defaultdict(set)
+    plain_imports: set[str] = set()
+    for import_ in imports:
+        if not import_.startswith("from "):
+            plain_imports.add(import_)
+            continue
+        module, _, names = import_.removeprefix("from ").partition(" import ")
+        names_by_module[module].update(name.strip() for name in names.split(","))
+
+    sections: dict[int, list[str]] = defaultdict(list)
+    for plain_import in sorted(plain_imports):
+        sections[_get_import_section(module=plain_import.split()[1])].append(
+            plain_import
+        )
+    for module, module_names in sorted(names_by_module.items()):
+        # names imported under aliases are imported by separate statements, same as by isort
+        not_aliased_names = sorted(
+            [name for name in module_names if " as " not in name],
+            key=_get_imported_name_sort_key,
+        )
+        section = sections[_get_import_section(module=module)]
+        if len(not_aliased_names) > 0:
+            section.append(f"from {module} import {', '.join(not_aliased_names)}")
+        section.extend(
+            f"from {module} import {name}"
+            for name in sorted(module_names)
+            if " as " in name
+        )
+
+    sorted_imports: list[str] = []
+    for _, section_imports in sorted(sections.items()):
+        if len(sorted_imports) > 0:
+            sorted_imports.append("")
+        sorted_imports.extend(section_imports)
+    return sorted_imports
+
+
+def _get_model_name(model: str) -> str:
+    for line in model.splitlines():
+        if line.startswith("class "):
+            return re.split(r"[(:]", line.removeprefix("class "), maxsplit=1)[0]
+    return model
+
+
+def _get_names(code: str) -> set[str]:
+    names: list[str] = _NAME_PATTERN.findall(code)
+    return set(names)
+
+
+def sort_models(models: Iterable[str]) -> list[str]:
+    """
+    Sorts code of models by names, a model is placed after models it refers to.
+
+    Each model is split to names once, so references are found by lookups in the set of names of models.
+    """
+    models_by_name: dict[str, str] = {}
+    for model in sorted(models):
+        models_by_name[_get_model_name(model=model)] = model
+
+    index_by_name = {name: index for index, name in enumerate(models_by_name)}
+    referred_names_by_name = {
+        name: sorted(
+            _get_names(code=model).intersection(index_by_name) - {name},
+            key=index_by_name.__getitem__,
+        )
+        for name, model in models_by_name.items()
+    }
+
+    sorted_models: list[str] = []
+    visited_names: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in visited_names:
+            return
+        visited_names.add(name)
+        for referred_name in referred_names_by_name[name]:
+            visit(name=referred_name)
+        sorted_models.append(models_by_name[name])
+
+    for name in models_by_name:
+        visit(name=name)
+    return sorted_models
+
+
+def _get_top_level_statement_kind(token: tokenize.TokenInfo) -> TopLevelStatementKind:
+    if token.string in ("import", "from"):
+        return "import"
+    if token.string == "@":
+        return "decorator"
+    if token.string in ("class", "def", "async"):
+        return "definition"
+    return "statement"
+
+
+def format_code_layout(code: str) -> str:
+    """
+    Normalizes whitespace between lines of the rendered code, so the code does not depend on ruff formatting.
+
+    Trailing whitespace is removed and blank lines are placed the same as by ruff:
+    two blank lines around top level classes and functions, one blank line after imports.
+    Lines inside multiline strings are not changed.
+    """
+    lines = code.splitlines()
+    lines_inside_strings: set[int] = set()
+    top_level_statements_kinds: dict[int, TopLevelStatementKind] = {}
+    is_logical_line_start = True
+    for token in tokenize.generate_tokens(io.StringIO(code).readline):
+        if token.type == tokenize.STRING:
+            lines_inside_strings.update(range(token.start[0], token.end[0]))
+        if token.type in (tokenize.NEWLINE, tokenize.NL):
+            is_logical_line_start = token.type == tokenize.NEWLINE or (
+                is_logical_line_start
+            )
+            continue
+        if token.type in (
+            tokenize.INDENT,
+            tokenize.DEDENT,
+            tokenize.COMMENT,
+            tokenize.ENDMARKER,
+        ):
+            continue
+        if is_logical_line_start and token.start[1] == 0:
+            top_level_statements_kinds[token.start[0] - 1] = (
+                _get_top_level_statement_kind(token=token)
+            )
+        is_logical_line_start = False
+
+    formatted_lines: list[str] = []
+    blank_lines_count = 0
+    previous_kind: TopLevelStatementKind | None = None
+    for index, line in enumerate(lines):
+        if index in lines_inside_strings:
+            formatted_lines.append(line)
+            continue
+        line = line.rstrip()
+        if line == "":
+            blank_lines_count += 1
+            continue
+
+        kind = top_level_statements_kinds.get(index)
+        if len(formatted_lines) == 0:
+            blank_lines_count = 0
+        elif kind is None:
+            blank_lines_count = min(blank_lines_count, 1)
+        elif previous_kind == "decorator":
+            blank_lines_count = 0
+        elif kind in ("decorator", "definition") or previous_kind == "definition":
+            blank_lines_count = 2
+        elif previous_kind == "import":
+            blank_lines_count = 1 if kind != "import" else min(blank_lines_count, 1)
+        else:
+            blank_lines_count = min(blank_lines_count, 2)
+        formatted_lines.extend([""] * blank_lines_count)
+        formatted_lines.append(line)
+        blank_lines_count = 0
+        if kind is not None:
+            previous_kind = kind
+
+    if len(formatted_lines) == 0:
+        return ""
+    return "\n".join(formatted_lines) + "\n"
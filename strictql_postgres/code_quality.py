@@ -1,8 +1,34 @@
 import asyncio
 import pathlib
 import sys
+import tempfile
+from typing import Sequence
+
+from ruff.__main__ import (  # type: ignore[import-untyped] # ruff has not typing annotations
+    find_ruff_bin,
+)
 
 from strictql_postgres.format_exception import format_exception
+from strictql_postgres.python_types import FilesContentByPath
+
+# runs ruff by the interpreter, which only finds the ruff binary and replaces itself with it
+RUFF_MODULE_COMMAND = (sys.executable, "-m", "ruff")
+
+_ruff_command: tuple[str, ...] | None = None
+
+
+def find_ruff_command() -> tuple[str, ...]:
+    """
+    Returns a command running the ruff binary directly, the binary is resolved once per process.
+
+    The binary is taken only from the installed `ruff` package, the same way as by `python -m ruff`,
+    so its version is the package version, which identifies the code generator.
+    """
+    global _ruff_command
+    if _ruff_command is None:
+        ruff_bin: str = find_ruff_bin()
+        _ruff_command = (ruff_bin,)
+    return _ruff_command
 
 
 class RuffCodeQualityError(Exception):
@@ -18,11 +44,11 @@ def decode_communication_result(
     return stdout, stderr
 
 
-async def run_ruff_lint_with_fix(code: str) -> str:
+async def run_ruff_lint_with_fix(
+    code: str, ruff_command: Sequence[str] | None = None
+) -> str:
     subprocess = await asyncio.create_subprocess_exec(
-        sys.executable,
-        "-m",
-        "ruff",
+        *(ruff_command if ruff_command is not None else find_ruff_command()),
         "check",
         "--extend-select",
         "I",
@@ -49,11 +75,9 @@ async def run_ruff_lint_with_fix(code: str) -> str:
     return communicate_result[0].decode()
 
 
-async def run_ruff_format(code: str) -> str:
+async def run_ruff_format(code: str, ruff_command: Sequence[str] | None = None) -> str:
     subprocess = await asyncio.create_subprocess_exec(
-        sys.executable,
-        "-m",
-        "ruff",
+        *(ruff_command if ruff_command is not None else find_ruff_command()),
         "format",
         "-",
         stdin=asyncio.subprocess.PIPE,
@@ -77,6 +101,60 @@ async def run_ruff_format(code: str) -> str:
     return communicate_result[0].decode()
 
 
+async def _run_ruff_for_files(
+    arguments: Sequence[str], name: str, ruff_command: Sequence[str] | None
+) -> None:
+    subprocess = await asyncio.create_subprocess_exec(
+        *(ruff_command if ruff_command is not None else find_ruff_command()),
+        *arguments,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    communicate_result = await subprocess.communicate()
+    if subprocess.returncode is None:
+        raise Exception("Subprocess return code is None, that is unexpected")
+    if subprocess.returncode != 0:
+        decoded_communicate_result = decode_communication_result(
+            communicate_result=communicate_result
+        )
+
+        raise RuffCodeQualityError(
+            f"{name} failed with exit code {subprocess.returncode},"
+            f" stdout: {decoded_communicate_result[0]} and stderr: {decoded_communicate_result[1]}"
+        )
+
+
+async def run_ruff_lint_with_fix_for_files(
+    paths: Sequence[pathlib.Path], ruff_command: Sequence[str] | None = None
+) -> None:
+    # Paths are passed explicitly, so ruff does not apply `exclude` settings
+    # and `.gitignore` rules to them, same as for the code passed through stdin.
+    await _run_ruff_for_files(
+        arguments=[
+            "check",
+            "--extend-select",
+            "I",
+            "--fix-only",
+            "--no-cache",
+            *[str(path) for path in paths],
+        ],
+        name="Ruff linter",
+        ruff_command=ruff_command,
+    )
+
+
+async def run_ruff_format_for_files(
+    paths: Sequence[pathlib.Path], ruff_command: Sequence[str] | None = None
+) -> None:
+    await _run_ruff_for_files(
+        arguments=["format", "--no-cache", *[str(path) for path in paths]],
+        name="Ruff format",
+        ruff_command=ruff_command,
+    )
+
+
 class MypyCodeQualityError(Exception):
     pass
 
@@ -119,14 +197,98 @@ class CodeQualityImproverError(Exception):
     pass
 
 
+MIN_FILES_PER_RUFF_RUN = 100
+
+
 class CodeFixer:
+    def __init__(
+        self, concurrency: int = 1, ruff_command: Sequence[str] | None = None
+    ) -> None:
+        """
+        Each call runs new ruff processes, ruff has no python API and no server formatting code on requests.
+
+        :param concurrency: Max count of ruff processes running at the same time
+        :param ruff_command: Command running the ruff CLI, the ruff binary found by `find_ruff_command` by default,
+            other formatters are not supported
+        """
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._concurrency = concurrency
+        self._ruff_command = (
+            ruff_command if ruff_command is not None else find_ruff_command()
+        )
+
     async def try_to_improve_code(self, code: str) -> str:
         try:
-            code = await run_ruff_format(code=code)
-            code = await run_ruff_lint_with_fix(code=code)
+            async with self._semaphore:
+                code = await run_ruff_format(code=code, ruff_command=self._ruff_command)
+                code = await run_ruff_lint_with_fix(
+                    code=code, ruff_command=self._ruff_command
+                )
         except RuffCodeQualityError as error:
             raise CodeQualityImproverError(
                 f"Code quality improvement failed: {format_exception(exception=error)}"
             ) from error
 
         return code
+
+    async def try_to_improve_files(
+        self, files: FilesContentByPath
+    ) -> FilesContentByPath:
+        """
+        Does the same as `try_to_improve_code` for each file, but runs ruff once for a batch of files,
+        `ruff format` and `ruff check` processes are started for each batch.
+
+        Files are written to a temporary directory under flat names, ruff resolves settings for them
+        the same way as for the code passed through stdin, so the result is equal to the per file result.
+        """
+        if len(files) == 0:
+            return {}
+
+        paths = list(files)
+        batches_count = max(
+            1, min(self._concurrency, len(paths) // MIN_FILES_PER_RUFF_RUN)
+        )
+        batches = [paths[index::batches_count] for index in range(batches_count)]
+        improved_batches = await asyncio.gather(
+            *[
+                self._try_to_improve_files_batch(
+                    files={path: files[path] for path in batch}
+                )
+                for batch in batches
+            ]
+        )
+
+        improved_files: dict[pathlib.Path, str] = {}
+        for improved_batch in improved_batches:
+            improved_files.update(improved_batch)
+        return {path: improved_files[path] for path in paths}
+
+    async def _try_to_improve_files_batch(
+        self, files: FilesContentByPath
+    ) -> FilesContentByPath:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_paths_by_path = {
+                path: pathlib.Path(tmp_dir) / f"{index}.py"
+                for index, path in enumerate(files)
+            }
+            for path, tmp_path in tmp_paths_by_path.items():
+                tmp_path.write_bytes(files[path].encode())
+
+            tmp_paths = list(tmp_paths_by_path.values())
+            try:
+                async with self._semaphore:
+                    await run_ruff_format_for_files(
+                        paths=tmp_paths, ruff_command=self._ruff_command
+                    )
+                    await run_ruff_lint_with_fix_for_files(
+                        paths=tmp_paths, ruff_command=self._ruff_command
+                    )
+            except RuffCodeQualityError as error:
+                raise CodeQualityImproverError(
+                    f"Code quality improvement failed: {format_exception(exception=error)}"
+                ) from error
+
+            return {
+                path: tmp_path.read_bytes().decode()
+                for path, tmp_path in tmp_paths_by_path.items()
+            }
@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Mapping
+from typing import Mapping, Sequence
 
 from strictql_postgres.python_types import ALL_TYPES
 
@@ -29,3 +29,16 @@ class NotEmptyRowSchema:
     def __post_init__(self) -> None:
         if len(self.schema) == 0:
             raise ValueError("Empty schema")
+
+
+@dataclasses.dataclass(frozen=True)
+class QueryIntrospection:
+    response_schema: Mapping[ColumnName, ALL_TYPES]
+    bind_params_types: Sequence[ALL_TYPES]
+    # columns of the result, which can not be null by constraints of tables they are selected from,
+    # `None` if nullability of columns was not inferred
+    not_null_columns: frozenset[ColumnName] | None = None
+    # names of postgres types of columns of the result, arrays are named by the `[]` suffix
+    columns_postgres_types: Mapping[ColumnName, str] = dataclasses.field(
+        default_factory=dict
+    )
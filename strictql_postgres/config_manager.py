@@ -5,16 +5,28 @@ from collections import defaultdict
 from typing import Literal, Mapping, TypeVar
 
 import pydantic
-from pydantic import BaseModel, SecretStr
+from pydantic import BaseModel, PositiveInt, SecretStr
 
 from strictql_postgres.dataclass_error import Error
+from strictql_postgres.lazy_package import PACKAGE_INIT_FILE_NAME
+from strictql_postgres.python_types import (
+    CodeFormat,
+    ModelBackend,
+    PreparedStatements,
+    RecordValidation,
+)
 from strictql_postgres.queries_to_generate import (
     DataBaseSettings,
     Parameter,
     QueryToGenerate,
     QueryToGenerateWithSourceInfo,
     StrictQLQueriesToGenerate,
+    get_default_formatter_concurrency,
+    get_default_introspection_concurrency,
+    get_default_render_concurrency,
 )
+from strictql_postgres.schema_snapshot import DEFAULT_SCHEMA_SNAPSHOT_PATH
+from strictql_postgres.shared_models import SHARED_MODELS_FILE_NAME
 from strictql_postgres.string_in_snake_case import (
     StringInSnakeLowerCase,
     StringNotInLowerSnakeCase,
@@ -29,18 +41,45 @@ class ParsedStrictqlSettings(pydantic.BaseModel):  # type: ignore[explicit-any]
     query_files_path: list[str]
     code_generate_dir: str
     databases: dict[str, ParsedDatabase]
+    introspection_concurrency: PositiveInt | None = None
+    formatter_concurrency: PositiveInt | None = None
+    render_concurrency: PositiveInt | None = None
+    cache_dir: str | None = None
+    validation: RecordValidation = "validated"
+    model_backend: ModelBackend = "pydantic"
+    prepared_statements: PreparedStatements = "implicit"
+    infer_nullability: bool = False
+    schema_snapshot_path: str = DEFAULT_SCHEMA_SNAPSHOT_PATH
+    format: CodeFormat = "ruff"
+    shared_models: bool = False
+    lazy_imports: bool = False
 
 
 class ParsedParameter(pydantic.BaseModel):  # type: ignore[explicit-any]
     is_optional: bool
+    array_dimensions: PositiveInt | None = None
 
 
 class ParsedQueryToGenerate(pydantic.BaseModel):  # type: ignore[explicit-any]
     query: str
     parameter_names: dict[str, ParsedParameter] = {}
     database: str
-    query_type: Literal["fetch", "execute", "fetch_row"]
+    query_type: Literal[
+        "fetch",
+        "execute",
+        "fetch_row",
+        "stream",
+        "execute_many",
+        "fetch_columns",
+        "copy_out",
+    ]
     relative_path: str
+    validation: RecordValidation | None = None
+    model_backend: ModelBackend | None = None
+    use_copy: bool = False
+    prepared_statements: PreparedStatements | None = None
+    array_dimensions: dict[str, PositiveInt] = {}
+    infer_nullability: bool | None = None
 
 
 class QueryFileContentModel(pydantic.BaseModel):  # type: ignore[explicit-any]
@@ -103,6 +142,19 @@ def get_strictql_queries_to_generate(
     code_generated_dir: str,
     parsed_databases: dict[str, ParsedDatabase],
     environment_variables: Mapping[str, str],
+    introspection_concurrency: int | None = None,
+    formatter_concurrency: int | None = None,
+    render_concurrency: int | None = None,
+    cache_dir: str | None = None,
+    require_connection_urls: bool = True,
+    validation: RecordValidation = "validated",
+    model_backend: ModelBackend = "pydantic",
+    prepared_statements: PreparedStatements = "implicit",
+    infer_nullability: bool = False,
+    schema_snapshot_path: str = DEFAULT_SCHEMA_SNAPSHOT_PATH,
+    code_format: CodeFormat = "ruff",
+    shared_models: bool = False,
+    lazy_imports: bool = False,
 ) -> StrictQLQueriesToGenerate:
     databases: dict[str, DataBaseSettings] = {}
     for database_name, database_settings in parsed_databases.items():
@@ -110,6 +162,12 @@ def get_strictql_queries_to_generate(
             database_settings.env_name_to_read_connection_url
             not in environment_variables
         ):
+            if not require_connection_urls:
+                # queries can be checked without connecting to databases, e.g. by `check --fast`
+                databases[database_name] = DataBaseSettings(
+                    connection_url=SecretStr("")
+                )
+                continue
             raise GetStrictQLQueriesToGenerateError(
                 error=f"Environment variable `{database_settings.env_name_to_read_connection_url}` with connection url to database: `{database_name}` not set"
             )
@@ -137,10 +195,31 @@ def get_strictql_queries_to_generate(
                     raise GetStrictQLQueriesToGenerateError(
                         error=f"Found special path symbol: `{special_path_symbol}` in a query to generate path: `{query_to_generate.relative_path}`, query_file: `{code_generation_dir_path / query_file_path}`"
                     )
+            if shared_models and pathlib.Path(
+                query_to_generate.relative_path
+            ) == pathlib.Path(SHARED_MODELS_FILE_NAME):
+                raise GetStrictQLQueriesToGenerateError(
+                    error=f"Path `{query_to_generate.relative_path}` of a query: `{query_file_path}::{query_name}` is reserved for the shared models module"
+                )
+            if (
+                lazy_imports
+                and pathlib.Path(query_to_generate.relative_path).name
+                == PACKAGE_INIT_FILE_NAME
+            ):
+                raise GetStrictQLQueriesToGenerateError(
+                    error=f"Path `{query_to_generate.relative_path}` of a query: `{query_file_path}::{query_name}` is reserved for the package init module"
+                )
             if query_to_generate.database not in databases:
                 raise GetStrictQLQueriesToGenerateError(
                     error=f"Database : `{query_to_generate.database}` in a query: `{query_file_path}::{query_name}` not exists in a strictql settings"
                 )
+            if (
+                query_to_generate.use_copy
+                and query_to_generate.query_type != "execute_many"
+            ):
+                raise GetStrictQLQueriesToGenerateError(
+                    error=f"`use_copy` is supported only by queries with `execute_many` type, query: `{query_file_path}::{query_name}`"
+                )
             try:
                 function_name = StringInSnakeLowerCase(value=query_name)
             except StringNotInLowerSnakeCase as error:
@@ -156,7 +235,10 @@ def get_strictql_queries_to_generate(
                         query=query_to_generate.query,
                         function_name=function_name,
                         parameters={
-                            key: Parameter(is_optional=value.is_optional)
+                            key: Parameter(
+                                is_optional=value.is_optional,
+                                array_dimensions=value.array_dimensions,
+                            )
                             for key, value in query_to_generate.parameter_names.items()
                         },
                         query_type=query_to_generate.query_type,
@@ -164,6 +246,22 @@ def get_strictql_queries_to_generate(
                         database_connection_url=databases[
                             query_to_generate.database
                         ].connection_url,
+                        validation=query_to_generate.validation
+                        if query_to_generate.validation is not None
+                        else validation,
+                        model_backend=query_to_generate.model_backend
+                        if query_to_generate.model_backend is not None
+                        else model_backend,
+                        use_copy=query_to_generate.use_copy,
+                        prepared_statements=query_to_generate.prepared_statements
+                        if query_to_generate.prepared_statements is not None
+                        else prepared_statements,
+                        array_dimensions=query_to_generate.array_dimensions,
+                        infer_nullability=query_to_generate.infer_nullability
+                        if query_to_generate.infer_nullability is not None
+                        else infer_nullability,
+                        shared_models=shared_models,
+                        lazy_imports=lazy_imports,
                     ),
                     query_file_path=query_file_path,
                     query_name=query_name,
@@ -192,4 +290,18 @@ def get_strictql_queries_to_generate(
         queries_to_generate=queries_to_generate_by_target_path,
         generated_code_path=pathlib.Path(code_generated_dir),
         databases=databases,
+        introspection_concurrency=introspection_concurrency
+        if introspection_concurrency is not None
+        else get_default_introspection_concurrency(),
+        formatter_concurrency=formatter_concurrency
+        if formatter_concurrency is not None
+        else get_default_formatter_concurrency(),
+        render_concurrency=render_concurrency
+        if render_concurrency is not None
+        else get_default_render_concurrency(),
+        cache_dir=pathlib.Path(cache_dir).resolve() if cache_dir is not None else None,
+        schema_snapshot_path=pathlib.Path(schema_snapshot_path),
+        code_format=code_format,
+        shared_models=shared_models,
+        lazy_imports=lazy_imports,
     )
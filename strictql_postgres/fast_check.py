@@ -0,0 +1,99 @@
+import dataclasses
+import pathlib
+
+from strictql_postgres.directory_reader import read_directory_python_files_recursive
+from strictql_postgres.generation_inputs import create_query_hash
+from strictql_postgres.lazy_package import get_package_init_files_paths
+from strictql_postgres.meta_file import (
+    FILE_EXTENSIONS_TO_EXCLUDE,
+    generate_meta_file,
+    parse_meta_file_content,
+)
+from strictql_postgres.queries_to_generate import StrictQLQueriesToGenerate
+from strictql_postgres.shared_models import SHARED_MODELS_FILE_NAME
+
+
+@dataclasses.dataclass(frozen=True)
+class FastCheckError(Exception):
+    error: str
+
+    def __str__(self) -> str:
+        return self.error
+
+
+@dataclasses.dataclass(frozen=True)
+class FastCheckResult:
+    missed_files: set[pathlib.Path]
+    extra_files: set[pathlib.Path]
+    # files with changed queries or settings, they can be checked only by generating the code again
+    stale_files: set[pathlib.Path]
+
+
+def check_generated_code_inputs(
+    queries_to_generate: StrictQLQueriesToGenerate, meta_file_name: str
+) -> FastCheckResult:
+    """
+    Checks generated code using hashes of queries inputs stored in the meta file, without connecting to databases.
+
+    Types introspected from databases are not checked, it is assumed that database schemas are not changed.
+    """
+    generated_code_path = queries_to_generate.generated_code_path
+    meta_file_path = generated_code_path / meta_file_name
+    if not generated_code_path.is_dir():
+        raise FastCheckError(
+            error=f"Generated code directory: `{generated_code_path.resolve()}` does not exist"
+        )
+    if not meta_file_path.is_file():
+        raise FastCheckError(
+            error=f"Meta file: {meta_file_path.resolve()} does not exist"
+        )
+
+    meta_file_content = parse_meta_file_content(meta_file_path.read_text())
+    if meta_file_content.checksum != generate_meta_file(
+        path=generated_code_path,
+        meta_file_name=meta_file_name,
+        exclude_file_extensions=FILE_EXTENSIONS_TO_EXCLUDE,
+    ):
+        raise FastCheckError(
+            error="Current meta file content not equals to expected content, looks like code was changed manually"
+        )
+
+    actual_files = read_directory_python_files_recursive(path=generated_code_path)
+    expected_files = {
+        file_path.resolve(): query_to_generate
+        for file_path, query_to_generate in queries_to_generate.queries_to_generate.items()
+    }
+    expected_files_paths = set(expected_files)
+    if queries_to_generate.shared_models:
+        # the shared models module depends only on types introspected from databases
+        expected_files_paths.add(
+            (generated_code_path / SHARED_MODELS_FILE_NAME).resolve()
+        )
+    if queries_to_generate.lazy_imports:
+        expected_files_paths.update(
+            get_package_init_files_paths(
+                files_paths=expected_files_paths,
+                generated_code_path=generated_code_path,
+            )
+        )
+    files_inputs_hashes = {
+        (generated_code_path / relative_path).resolve(): inputs_hashes
+        for relative_path, inputs_hashes in meta_file_content.files_inputs_hashes.items()
+    }
+
+    stale_files = set()
+    for file_path, query_to_generate in expected_files.items():
+        if file_path not in actual_files:
+            continue
+        inputs_hashes = files_inputs_hashes.get(file_path)
+        if inputs_hashes is None or inputs_hashes.query_hash != create_query_hash(
+            query_to_generate=query_to_generate,
+            code_format=queries_to_generate.code_format,
+        ):
+            stale_files.add(file_path)
+
+    return FastCheckResult(
+        missed_files=expected_files_paths - set(actual_files),
+        extra_files=set(actual_files) - expected_files_paths,
+        stale_files=stale_files,
+    )
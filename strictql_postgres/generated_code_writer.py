@@ -1,11 +1,15 @@
 import dataclasses
 import pathlib
 import shutil
+from typing import Mapping
 
 from strictql_postgres.meta_file import (
     FILE_EXTENSIONS_TO_EXCLUDE,
     STRICTQL_META_FILE_NAME,
+    GeneratedFileInputsHashes,
+    create_meta_file_content,
     generate_meta_file,
+    parse_meta_file_content,
 )
 from strictql_postgres.python_types import FilesContentByPath
 
@@ -18,9 +22,81 @@ class GeneratedCodeWriterError(Exception):
         return self.error
 
 
+@dataclasses.dataclass(frozen=True)
+class GeneratedFile:
+    content: str
+    inputs_hashes: GeneratedFileInputsHashes
+
+
+def read_generated_code(
+    target_directory: pathlib.Path, meta_file_name: str
+) -> Mapping[pathlib.Path, GeneratedFile]:
+    """
+    Reads files generated by the previous run with hashes of their inputs.
+
+    Returns nothing if the directory does not contain generated code or it has been changed manually.
+    """
+    meta_file_path = target_directory / meta_file_name
+    if not target_directory.is_dir() or not meta_file_path.is_file():
+        return {}
+
+    meta_file_content = parse_meta_file_content(meta_file_path.read_text())
+    if meta_file_content.checksum != generate_meta_file(
+        path=target_directory,
+        meta_file_name=meta_file_name,
+        exclude_file_extensions=FILE_EXTENSIONS_TO_EXCLUDE,
+    ):
+        return {}
+
+    generated_files = {}
+    for relative_path, inputs_hashes in meta_file_content.files_inputs_hashes.items():
+        file_path = (target_directory / relative_path).resolve()
+        if not file_path.is_file():
+            continue
+        generated_files[file_path] = GeneratedFile(
+            content=file_path.read_text(), inputs_hashes=inputs_hashes
+        )
+    return generated_files
+
+
+def _remove_files_not_in_generated_code(
+    target_directory: pathlib.Path, files: FilesContentByPath
+) -> None:
+    expected_paths = {file_path.resolve() for file_path in files}
+    for item in list(target_directory.rglob("*")):
+        if (
+            not item.is_file()
+            or item.name == STRICTQL_META_FILE_NAME
+            or item.suffix in FILE_EXTENSIONS_TO_EXCLUDE
+        ):
+            continue
+        if item.resolve() not in expected_paths:
+            item.unlink()
+
+    # directories without generated files, even with a bytecode cache, are not needed anymore
+    directories = [item for item in target_directory.rglob("*") if item.is_dir()]
+    for directory in sorted(directories, reverse=True):
+        if not directory.exists():
+            continue
+        if all(
+            item.is_dir() or item.suffix in FILE_EXTENSIONS_TO_EXCLUDE
+            for item in directory.rglob("*")
+        ):
+            shutil.rmtree(directory)
+
+
 def write_generated_code(
-    target_directory: pathlib.Path, files: FilesContentByPath, meta_file_name: str
+    target_directory: pathlib.Path,
+    files: FilesContentByPath,
+    meta_file_name: str,
+    files_inputs_hashes: Mapping[pathlib.Path, GeneratedFileInputsHashes] | None = None,
 ) -> None:
+    """
+    Writes generated code to the target directory and updates the meta file.
+
+    Only changed files are rewritten and files which are not generated anymore are removed,
+    so editors indexes and bytecode caches of unchanged modules are kept.
+    """
     if target_directory.exists():
         if not target_directory.is_dir():
             raise GeneratedCodeWriterError(
@@ -33,30 +109,35 @@ def write_generated_code(
                 error=f"Generated code directory: `{target_directory.resolve()}` already exists and does not contain a meta file {STRICTQL_META_FILE_NAME}."
                 f" You probably specified the wrong directory or deleted the meta file. If you deleted the meta file yourself, then you need to manually delete the directory and regenerate the code."
             )
-        meta_file_content = meta_file_content_path.read_text()
+        meta_file_content = parse_meta_file_content(meta_file_content_path.read_text())
         expected_meta_file = generate_meta_file(
             path=target_directory,
             meta_file_name=meta_file_name,
             exclude_file_extensions=FILE_EXTENSIONS_TO_EXCLUDE,
         )
-        if expected_meta_file != meta_file_content:
+        if expected_meta_file != meta_file_content.checksum:
             raise GeneratedCodeWriterError(
                 error=f"Generated code directory: `{target_directory.resolve()}` already exists and generated files in it are not equals to meta file content {STRICTQL_META_FILE_NAME}, looks like generated has been changed manually."
                 f" Delete the generated code directory and regenerate the code."
             )
 
-        shutil.rmtree(target_directory)
-
-    target_directory.mkdir()
+        _remove_files_not_in_generated_code(
+            target_directory=target_directory, files=files
+        )
+    else:
+        target_directory.mkdir()
 
     for file_path, file_content in files.items():
+        if file_path.is_file() and file_path.read_text() == file_content:
+            continue
         if file_path.parent != target_directory:
             file_path.parent.mkdir(parents=True, exist_ok=True)
         file_path.write_text(file_content)
-    meta_file_content = generate_meta_file(
+    meta_file_content_text = create_meta_file_content(
         path=target_directory,
         meta_file_name=meta_file_name,
         exclude_file_extensions=FILE_EXTENSIONS_TO_EXCLUDE,
+        files_inputs_hashes=files_inputs_hashes or {},
     )
 
-    (target_directory / STRICTQL_META_FILE_NAME).write_text(meta_file_content)
+    (target_directory / STRICTQL_META_FILE_NAME).write_text(meta_file_content_text)
@@ -0,0 +1,186 @@
+import hashlib
+import importlib.metadata
+import os
+import pathlib
+import tomllib
+from collections.abc import Iterable
+
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.introspection_cache import dump_query_introspection
+from strictql_postgres.python_types import CodeFormat
+from strictql_postgres.queries_to_generate import QueryToGenerate
+from strictql_postgres.templates import TEMPLATES_DIR
+
+_PACKAGE_DIR = pathlib.Path(__file__).parent
+
+# files of ruff settings by their priority in a directory
+_RUFF_CONFIG_FILE_NAMES = (".ruff.toml", "ruff.toml", "pyproject.toml")
+
+_code_generator_version: str | None = None
+_ruff_settings_version_by_directory: dict[pathlib.Path, str] = {}
+
+
+def get_code_generator_version() -> str:
+    """
+    Identifies everything except inputs of a query that affects the generated code.
+
+    Sources are hashed instead of using the package version, so the code generated by a development version
+    of the package is also regenerated after changes.
+    """
+    global _code_generator_version
+    if _code_generator_version is not None:
+        return _code_generator_version
+
+    sources_hash = hashlib.sha256()
+    source_paths = [*_PACKAGE_DIR.glob("*.py"), *TEMPLATES_DIR.glob("*.txt")]
+    for source_path in sorted(source_paths):
+        sources_hash.update(str(source_path.relative_to(_PACKAGE_DIR)).encode())
+        sources_hash.update(source_path.read_bytes())
+
+    try:
+        ruff_version = importlib.metadata.version("ruff")
+    except importlib.metadata.PackageNotFoundError:
+        ruff_version = "unknown"
+
+    _code_generator_version = f"{sources_hash.hexdigest()}-ruff-{ruff_version}"
+    return _code_generator_version
+
+
+def _read_toml(path: pathlib.Path) -> dict[str, object]:
+    try:
+        parsed_toml: dict[str, object] = tomllib.loads(path.read_text())
+    except (OSError, tomllib.TOMLDecodeError):
+        return {}
+    return parsed_toml
+
+
+def _get_ruff_settings(config_path: pathlib.Path) -> dict[str, object] | None:
+    parsed_toml = _read_toml(config_path)
+    if config_path.name != "pyproject.toml":
+        return parsed_toml
+    tool = parsed_toml.get("tool")
+    if not isinstance(tool, dict) or "ruff" not in tool:
+        return None
+    ruff_settings: dict[str, object] = {"tool.ruff": tool["ruff"]}
+    project = parsed_toml.get("project")
+    if isinstance(project, dict) and "requires-python" in project:
+        # ruff infers the target version from it
+        ruff_settings["project.requires-python"] = project["requires-python"]
+    return ruff_settings
+
+
+def _find_ruff_config_path(directory: pathlib.Path) -> pathlib.Path | None:
+    # ruff takes settings from the user configuration directory, if no project settings are found
+    user_config_directory = (
+        pathlib.Path(
+            os.environ.get("XDG_CONFIG_HOME") or pathlib.Path.home() / ".config"
+        )
+        / "ruff"
+    )
+    for config_directory in [directory, *directory.parents, user_config_directory]:
+        for config_file_name in _RUFF_CONFIG_FILE_NAMES:
+            config_path = config_directory / config_file_name
+            if config_path.is_file() and _get_ruff_settings(config_path) is not None:
+                return config_path
+    return None
+
+
+def get_ruff_settings_version(directory: pathlib.Path) -> str:
+    """
+    Identifies ruff settings used for the code formatted in the directory.
+
+    Ruff takes settings from the closest configuration file, generated code is formatted by ruff running
+    in the current directory. Settings are hashed instead of paths, so the version does not depend on the location
+    of the project. Files extended by the `extend` setting are hashed too.
+    """
+    directory = directory.resolve()
+    ruff_settings_version = _ruff_settings_version_by_directory.get(directory)
+    if ruff_settings_version is not None:
+        return ruff_settings_version
+
+    settings_hash = hashlib.sha256()
+    config_path = _find_ruff_config_path(directory=directory)
+    visited_config_paths = set()
+    while config_path is not None and config_path not in visited_config_paths:
+        visited_config_paths.add(config_path)
+        ruff_settings = _get_ruff_settings(config_path) or {}
+        settings_hash.update(repr(sorted(ruff_settings.items())).encode())
+
+        extend = ruff_settings.get("extend")
+        tool_ruff = ruff_settings.get("tool.ruff")
+        if isinstance(tool_ruff, dict):
+            extend = tool_ruff.get("extend")
+        config_path = (
+            (config_path.parent / os.path.expanduser(extend)).resolve()
+            if isinstance(extend, str)
+            else None
+        )
+
+    ruff_settings_version = settings_hash.hexdigest()
+    _ruff_settings_version_by_directory[directory] = ruff_settings_version
+    return ruff_settings_version
+
+
+def _get_code_format_version(code_format: CodeFormat) -> str:
+    if code_format == "ruff":
+        return (
+            f"{code_format}-{get_ruff_settings_version(directory=pathlib.Path.cwd())}"
+        )
+    return code_format
+
+
+def create_query_hash(
+    query_to_generate: QueryToGenerate, code_format: CodeFormat = "ruff"
+) -> str:
+    return hashlib.sha256(
+        "\n".join(
+            [
+                get_code_generator_version(),
+                _get_code_format_version(code_format=code_format),
+                query_to_generate.model_dump_json(exclude={"database_connection_url"}),
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+def create_rendered_module_hash(
+    rendered_code: str, code_format: CodeFormat = "ruff"
+) -> str:
+    return hashlib.sha256(
+        "\n".join(
+            [
+                get_code_generator_version(),
+                _get_code_format_version(code_format=code_format),
+                rendered_code,
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+def create_shared_models_module_hash(
+    queries_inputs_hashes: Iterable[tuple[str, str]],
+    defer_build: bool,
+    code_format: CodeFormat = "ruff",
+) -> str:
+    """
+    Hashes inputs of the shared models module: hashes of inputs of all queries and their introspections.
+    """
+    return hashlib.sha256(
+        "\n".join(
+            [
+                get_code_generator_version(),
+                _get_code_format_version(code_format=code_format),
+                f"defer_build={defer_build}",
+                *sorted(
+                    f"{query_hash} {introspection_hash}"
+                    for query_hash, introspection_hash in queries_inputs_hashes
+                ),
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+def create_introspection_hash(introspection: QueryIntrospection) -> str:
+    return hashlib.sha256(
+        dump_query_introspection(introspection=introspection).model_dump_json().encode()
+    ).hexdigest()
@@ -0,0 +1,292 @@
+import hashlib
+import pathlib
+from typing import Annotated, Literal
+
+import pydantic
+
+import asyncpg
+from pglast import prettify
+from pglast.parser import ParseError
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.python_types import (
+    ALL_TYPES,
+    RecursiveListSupportedTypes,
+    RecursiveListType,
+    SimpleTypes,
+    TypesWithImport,
+)
+from strictql_postgres.supported_postgres_types import (
+    PYTHON_TYPE_BY_POSTGRES_SIMPLE_TYPES,
+    PYTHON_TYPE_BY_POSTGRES_TYPE_WHEN_TYPE_REQUIRE_IMPORT,
+)
+
+# Must be increased on any change of the introspection result or of the cache file format
+INTROSPECTION_CACHE_VERSION = 3
+
+INTROSPECTION_CACHE_FILE_NAME = "introspection_cache.json"
+
+_TYPE_BY_NAME: dict[str, type[SimpleTypes] | type[TypesWithImport]] = {
+    type_.__name__: type_
+    for type_ in [
+        *PYTHON_TYPE_BY_POSTGRES_SIMPLE_TYPES.values(),
+        *PYTHON_TYPE_BY_POSTGRES_TYPE_WHEN_TYPE_REQUIRE_IMPORT.values(),
+    ]
+}
+
+# Everything that can change types of a query result or of query parameters:
+# server version, settings used to resolve names and objects from all non system schemas.
+_CATALOG_FINGERPRINT_QUERY = r"""
+WITH user_namespaces AS (
+    SELECT oid, nspname
+    FROM pg_catalog.pg_namespace
+    WHERE nspname NOT IN ('pg_catalog', 'information_schema')
+      AND nspname NOT LIKE 'pg\_toast%'
+      AND nspname NOT LIKE 'pg\_temp%'
+),
+catalog_rows AS (
+    SELECT format(
+        'settings %s %s %s',
+        current_setting('server_version_num'),
+        current_setting('search_path'),
+        current_user
+    ) AS catalog_row
+    UNION ALL
+    SELECT format('extension %s %s', extname, extversion)
+    FROM pg_catalog.pg_extension
+    UNION ALL
+    SELECT format('namespace %s %s', oid, nspname)
+    FROM user_namespaces
+    UNION ALL
+    SELECT format('relation %s %s %s %s', c.oid, n.nspname, c.relname, c.relkind)
+    FROM pg_catalog.pg_class c
+    JOIN user_namespaces n ON n.oid = c.relnamespace
+    UNION ALL
+    SELECT format(
+        'attribute %s %s %s %s %s %s %s',
+        a.attrelid, a.attnum, a.attname, a.atttypid, a.atttypmod, a.attndims, a.attnotnull
+    )
+    FROM pg_catalog.pg_attribute a
+    JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+    JOIN user_namespaces n ON n.oid = c.relnamespace
+    WHERE a.attnum > 0 AND NOT a.attisdropped
+    UNION ALL
+    SELECT format(
+        'type %s %s %s %s %s %s %s',
+        t.oid, n.nspname, t.typname, t.typtype, t.typbasetype, t.typelem, t.typrelid
+    )
+    FROM pg_catalog.pg_type t
+    JOIN user_namespaces n ON n.oid = t.typnamespace
+    UNION ALL
+    SELECT format(
+        'function %s %s %s %s %s %s %s %s',
+        p.oid, n.nspname, p.proname, p.proargtypes, p.proallargtypes,
+        p.proargmodes, p.prorettype, p.proretset
+    )
+    FROM pg_catalog.pg_proc p
+    JOIN user_namespaces n ON n.oid = p.pronamespace
+)
+SELECT md5(string_agg(catalog_row, E'\n' ORDER BY catalog_row)) AS fingerprint
+FROM catalog_rows
+"""
+
+
+class CachedType(pydantic.BaseModel):  # type: ignore[explicit-any]
+    kind: Literal["type"] = "type"
+    name: str
+    is_optional: bool
+
+
+class CachedRecursiveListType(pydantic.BaseModel):  # type: ignore[explicit-any]
+    kind: Literal["recursive_list"] = "recursive_list"
+    generic_type: CachedType
+    is_optional: bool
+
+
+CachedAnyType = Annotated[
+    CachedType | CachedRecursiveListType, pydantic.Field(discriminator="kind")
+]
+
+
+class CachedQueryIntrospection(pydantic.BaseModel):  # type: ignore[explicit-any]
+    response_schema: dict[str, CachedAnyType]
+    bind_params_types: list[CachedAnyType]
+    not_null_columns: list[str] | None = None
+    columns_postgres_types: dict[str, str] = {}
+
+
+class IntrospectionCacheFileModel(pydantic.BaseModel):  # type: ignore[explicit-any]
+    version: int
+    entries: dict[str, CachedQueryIntrospection]
+
+
+class IntrospectionCacheUnsupportedTypeError(Exception):
+    pass
+
+
+def _dump_type(type_: ALL_TYPES) -> CachedAnyType:
+    if isinstance(type_, RecursiveListType):
+        generic_type = _dump_type(type_=type_.generic_type)
+        if not isinstance(generic_type, CachedType):
+            raise IntrospectionCacheUnsupportedTypeError(type_)
+        return CachedRecursiveListType(
+            generic_type=generic_type, is_optional=type_.is_optional
+        )
+    if isinstance(type_, SimpleTypes) or isinstance(type_, TypesWithImport):
+        return CachedType(name=type(type_).__name__, is_optional=type_.is_optional)
+    raise IntrospectionCacheUnsupportedTypeError(type_)
+
+
+def _load_simple_type(type_: CachedType) -> RecursiveListSupportedTypes:
+    return _TYPE_BY_NAME[type_.name](is_optional=type_.is_optional)
+
+
+def _load_type(type_: CachedAnyType) -> ALL_TYPES:
+    if isinstance(type_, CachedRecursiveListType):
+        return RecursiveListType(
+            generic_type=_load_simple_type(type_.generic_type),
+            is_optional=type_.is_optional,
+        )
+    return _load_simple_type(type_)
+
+
+def dump_query_introspection(
+    introspection: QueryIntrospection,
+) -> CachedQueryIntrospection:
+    return CachedQueryIntrospection(
+        response_schema={
+            column_name: _dump_type(type_)
+            for column_name, type_ in introspection.response_schema.items()
+        },
+        bind_params_types=[
+            _dump_type(type_) for type_ in introspection.bind_params_types
+        ],
+        not_null_columns=sorted(introspection.not_null_columns)
+        if introspection.not_null_columns is not None
+        else None,
+        columns_postgres_types=dict(introspection.columns_postgres_types),
+    )
+
+
+def load_query_introspection(
+    cached_introspection: CachedQueryIntrospection,
+) -> QueryIntrospection:
+    return QueryIntrospection(
+        response_schema={
+            column_name: _load_type(type_)
+            for column_name, type_ in cached_introspection.response_schema.items()
+        },
+        bind_params_types=[
+            _load_type(type_) for type_ in cached_introspection.bind_params_types
+        ],
+        not_null_columns=frozenset(cached_introspection.not_null_columns)
+        if cached_introspection.not_null_columns is not None
+        else None,
+        columns_postgres_types=cached_introspection.columns_postgres_types,
+    )
+
+
+def normalize_query(query: str) -> str:
+    try:
+        return prettify(query)
+    except ParseError:
+        # invalid queries are not cached, but still need a key
+        return query.strip()
+
+
+def create_introspection_cache_key(query: str, catalog_fingerprint: str) -> str:
+    return hashlib.sha256(
+        "\n".join(
+            [
+                str(INTROSPECTION_CACHE_VERSION),
+                catalog_fingerprint,
+                normalize_query(query),
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+async def get_catalog_fingerprint(connection: asyncpg.Connection) -> str:
+    record = await connection.fetchrow(_CATALOG_FINGERPRINT_QUERY)
+    if record is None:
+        raise Exception(
+            "Catalog fingerprint query returned no rows, that is unexpected"
+        )
+    return str(record["fingerprint"])
+
+
+class IntrospectionCache:
+    """
+    Stores results of queries introspection between runs.
+
+    Only entries used during the run are saved, so entries for old queries and old database schemas are dropped.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self._path = path
+        self._loaded_entries: dict[str, CachedQueryIntrospection] = {}
+        self._used_entries: dict[str, CachedQueryIntrospection] = {}
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "IntrospectionCache":
+        cache = cls(path=path)
+        if not path.is_file():
+            return cache
+        try:
+            cache_file = IntrospectionCacheFileModel.model_validate_json(
+                path.read_bytes()
+            )
+        except pydantic.ValidationError:
+            # cache is disposable, broken file is ignored and rewritten on save
+            return cache
+        if cache_file.version == INTROSPECTION_CACHE_VERSION:
+            cache._loaded_entries = cache_file.entries
+        return cache
+
+    def get(self, key: str) -> QueryIntrospection | None:
+        cached_introspection = self._used_entries.get(
+            key, self._loaded_entries.get(key)
+        )
+        if cached_introspection is None:
+            return None
+        self._used_entries[key] = cached_introspection
+        return load_query_introspection(cached_introspection=cached_introspection)
+
+    def set(self, key: str, introspection: QueryIntrospection) -> None:
+        self._used_entries[key] = dump_query_introspection(introspection=introspection)
+
+    def save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(f"{self._path.name}.tmp")
+        tmp_path.write_text(
+            IntrospectionCacheFileModel(
+                version=INTROSPECTION_CACHE_VERSION,
+                entries=dict(sorted(self._used_entries.items())),
+            ).model_dump_json(indent=1)
+        )
+        tmp_path.replace(self._path)
+
+    def for_database(self, catalog_fingerprint: str) -> "DatabaseIntrospectionCache":
+        return DatabaseIntrospectionCache(
+            cache=self, catalog_fingerprint=catalog_fingerprint
+        )
+
+
+class DatabaseIntrospectionCache:
+    def __init__(self, cache: IntrospectionCache, catalog_fingerprint: str) -> None:
+        self._cache = cache
+        self._catalog_fingerprint = catalog_fingerprint
+
+    def get(self, query: str) -> QueryIntrospection | None:
+        return self._cache.get(
+            key=create_introspection_cache_key(
+                query=query, catalog_fingerprint=self._catalog_fingerprint
+            )
+        )
+
+    def set(self, query: str, introspection: QueryIntrospection) -> None:
+        self._cache.set(
+            key=create_introspection_cache_key(
+                query=query, catalog_fingerprint=self._catalog_fingerprint
+            ),
+            introspection=introspection,
+        )
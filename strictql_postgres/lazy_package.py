@@ -0,0 +1,129 @@
+import pathlib
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+
+from strictql_postgres.code_layout import format_code_layout, sort_imports
+from strictql_postgres.model_name_generator import (
+    generate_columns_model_name_by_function_name,
+    generate_model_name_by_function_name,
+    generate_params_model_name_by_function_name,
+)
+from strictql_postgres.queries_to_generate import QueryToGenerate
+from strictql_postgres.templates import render_template
+
+PACKAGE_INIT_FILE_NAME = "__init__.py"
+
+
+def get_exported_names(query_to_generate: QueryToGenerate) -> list[str]:
+    names = [query_to_generate.function_name.value]
+    match query_to_generate.query_type:
+        # shared models are imported by modules of queries under other names, so they are not exported from them
+        case "fetch" | "fetch_row" | "stream" if not query_to_generate.shared_models:
+            names.append(
+                generate_model_name_by_function_name(
+                    function_name=query_to_generate.function_name
+                )
+            )
+        case "copy_out":
+            names.append(f"{query_to_generate.function_name.value}_to_file")
+            names.append(
+                generate_model_name_by_function_name(
+                    function_name=query_to_generate.function_name
+                )
+            )
+        case "fetch_columns":
+            names.append(
+                generate_columns_model_name_by_function_name(
+                    function_name=query_to_generate.function_name
+                )
+            )
+        case "execute_many":
+            names.append(
+                generate_params_model_name_by_function_name(
+                    function_name=query_to_generate.function_name
+                )
+            )
+        case _:
+            pass
+    return names
+
+
+def get_package_init_files_paths(
+    files_paths: Iterable[pathlib.Path], generated_code_path: pathlib.Path
+) -> list[pathlib.Path]:
+    """
+    Returns paths of `__init__.py` files of all packages containing the generated files, including the generated code directory.
+    """
+    generated_code_path = generated_code_path.resolve()
+    packages_paths = set()
+    for file_path in files_paths:
+        package_path = file_path.resolve().parent
+        while package_path.is_relative_to(generated_code_path):
+            packages_paths.add(package_path)
+            package_path = package_path.parent
+    return [
+        package_path / PACKAGE_INIT_FILE_NAME for package_path in sorted(packages_paths)
+    ]
+
+
+def render_lazy_package_inits(
+    queries_to_generate: Mapping[pathlib.Path, QueryToGenerate],
+    generated_code_path: pathlib.Path,
+    private_files_paths: Iterable[pathlib.Path] = (),
+) -> dict[pathlib.Path, str]:
+    """
+    Renders `__init__.py` files of generated packages, importing submodules and generated functions and models on first access
+    by a module level `__getattr__`, so importing a package does not import all generated modules.
+
+    Names defined by several modules of the same package are not exported by the package,
+    they are still accessible through their modules.
+    """
+    init_files_paths = get_package_init_files_paths(
+        files_paths=[*queries_to_generate, *private_files_paths],
+        generated_code_path=generated_code_path,
+    )
+    submodules_by_package_path: dict[pathlib.Path, set[str]] = defaultdict(set)
+    for init_file_path in init_files_paths:
+        package_path = init_file_path.parent
+        if package_path != generated_code_path.resolve():
+            submodules_by_package_path[package_path.parent].add(package_path.name)
+
+    modules_by_attribute_by_package_path: dict[pathlib.Path, dict[str, set[str]]] = (
+        defaultdict(dict)
+    )
+    for file_path, query_to_generate in queries_to_generate.items():
+        file_path = file_path.resolve()
+        submodules_by_package_path[file_path.parent].add(file_path.stem)
+        for name in get_exported_names(query_to_generate=query_to_generate):
+            modules_by_attribute_by_package_path[file_path.parent].setdefault(
+                name, set()
+            ).add(file_path.stem)
+
+    rendered_files = {}
+    for init_file_path in init_files_paths:
+        package_path = init_file_path.parent
+        submodules = sorted(submodules_by_package_path[package_path])
+        modules_by_attribute = {
+            attribute: next(iter(modules))
+            for attribute, modules in sorted(
+                modules_by_attribute_by_package_path[package_path].items()
+            )
+            if len(modules) == 1 and attribute not in submodules
+        }
+        imports = [
+            *[f"from . import {submodule} as {submodule}" for submodule in submodules],
+            *[
+                f"from .{module} import {attribute} as {attribute}"
+                for attribute, module in modules_by_attribute.items()
+            ],
+        ]
+        rendered_files[init_file_path] = format_code_layout(
+            code=render_template(
+                "lazy_package_init.txt",
+                imports=sort_imports(imports),
+                submodules=submodules,
+                modules_by_attribute=modules_by_attribute,
+                all_names=sorted([*submodules, *modules_by_attribute]),
+            )
+        )
+    return rendered_files
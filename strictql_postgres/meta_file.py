@@ -2,6 +2,7 @@ import dataclasses
 import hashlib
 import os
 import pathlib
+from typing import Mapping
 
 import pydantic
 
@@ -10,6 +11,16 @@ class MetaFileModel(pydantic.BaseModel):  # type: ignore[explicit-any]
     files_checksums: dict[str, str]
 
 
+class GeneratedFileInputsHashes(pydantic.BaseModel):  # type: ignore[explicit-any]
+    query_hash: str
+    introspection_hash: str
+
+
+class MetaFileContent(pydantic.BaseModel):  # type: ignore[explicit-any]
+    checksum: str
+    files_inputs_hashes: dict[str, GeneratedFileInputsHashes] = {}
+
+
 @dataclasses.dataclass
 class GenerateMetaFileError(Exception):
     error: str
@@ -40,3 +51,30 @@ def generate_meta_file(
     return hashlib.sha256(
         MetaFileModel(files_checksums=res).model_dump_json().encode("utf-8")
     ).hexdigest()
+
+
+def create_meta_file_content(
+    path: pathlib.Path,
+    meta_file_name: str,
+    exclude_file_extensions: set[str],
+    files_inputs_hashes: Mapping[pathlib.Path, GeneratedFileInputsHashes],
+) -> str:
+    return MetaFileContent(
+        checksum=generate_meta_file(
+            path=path,
+            meta_file_name=meta_file_name,
+            exclude_file_extensions=exclude_file_extensions,
+        ),
+        files_inputs_hashes={
+            str(file_path.resolve().relative_to(path.resolve())): inputs_hashes
+            for file_path, inputs_hashes in sorted(files_inputs_hashes.items())
+        },
+    ).model_dump_json(indent=1)
+
+
+def parse_meta_file_content(meta_file_content: str) -> MetaFileContent:
+    try:
+        return MetaFileContent.model_validate_json(meta_file_content)
+    except pydantic.ValidationError:
+        # meta file of previous versions contains only the checksum
+        return MetaFileContent(checksum=meta_file_content)
@@ -1,11 +1,33 @@
+import re
+
 from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
 
 
-def generate_model_name_by_function_name(function_name: StringInSnakeLowerCase) -> str:
-    function_name_in_camel_case = "".join(
+def _convert_function_name_to_camel_case(function_name: StringInSnakeLowerCase) -> str:
+    return "".join(
         [
             snake_case_part.lower().capitalize()
             for snake_case_part in function_name.value.split("_")
         ]
     )
-    return f"{function_name_in_camel_case}Model"
+
+
+def generate_model_name_by_function_name(function_name: StringInSnakeLowerCase) -> str:
+    return f"{_convert_function_name_to_camel_case(function_name)}Model"
+
+
+def generate_params_model_name_by_function_name(
+    function_name: StringInSnakeLowerCase,
+) -> str:
+    return f"{_convert_function_name_to_camel_case(function_name)}Params"
+
+
+def generate_columns_model_name_by_function_name(
+    function_name: StringInSnakeLowerCase,
+) -> str:
+    return f"{_convert_function_name_to_camel_case(function_name)}Columns"
+
+
+def generate_record_decoder_name_by_model_name(model_name: str) -> str:
+    model_name_in_snake_case = re.sub(r"(?<!^)(?=[A-Z])", "_", model_name).lower()
+    return f"decode_{model_name_in_snake_case}"
@@ -0,0 +1,297 @@
+import dataclasses
+from collections.abc import Sequence
+
+import asyncpg
+from pglast import parse_sql
+from pglast.ast import (
+    A_Const,
+    A_Star,
+    ColumnRef,
+    DeleteStmt,
+    FuncCall,
+    GroupingSet,
+    InsertStmt,
+    JoinExpr,
+    Node,
+    RangeVar,
+    ResTarget,
+    SelectStmt,
+    String,
+    TypeCast,
+    UpdateStmt,
+)
+from pglast.enums.nodes import JoinType
+from pglast.enums.parsenodes import SetOperation
+from pglast.parser import ParseError
+
+_TABLE_COLUMNS_QUERY = """
+SELECT a.attname, a.attnotnull
+FROM pg_catalog.pg_attribute a
+WHERE a.attrelid = to_regclass($1) AND a.attnum > 0 AND NOT a.attisdropped
+ORDER BY a.attnum
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class _Table:
+    schema_name: str | None
+    table_name: str
+    # rows of tables on the outer side of outer joins can be replaced by nulls
+    is_nullable: bool
+
+
+@dataclasses.dataclass(frozen=True)
+class _FromItem:
+    name: str
+    # tables, which columns are unknown: subqueries, functions and common table expressions
+    table: _Table | None
+
+
+@dataclasses.dataclass(frozen=True)
+class _TableColumn:
+    name: str
+    is_not_null: bool
+
+
+class _UnsupportedQueryError(Exception):
+    pass
+
+
+def _get_from_items(
+    from_item: Node, is_nullable: bool, common_table_expressions_names: set[str]
+) -> list[_FromItem]:
+    if isinstance(from_item, RangeVar):
+        name = (
+            from_item.alias.aliasname
+            if from_item.alias is not None
+            else from_item.relname
+        )
+        if (
+            from_item.schemaname is None
+            and from_item.relname in common_table_expressions_names
+        ):
+            return [_FromItem(name=name, table=None)]
+        return [
+            _FromItem(
+                name=name,
+                table=_Table(
+                    schema_name=from_item.schemaname,
+                    table_name=from_item.relname,
+                    is_nullable=is_nullable,
+                ),
+            )
+        ]
+    if isinstance(from_item, JoinExpr):
+        if from_item.jointype not in (
+            JoinType.JOIN_INNER,
+            JoinType.JOIN_LEFT,
+            JoinType.JOIN_RIGHT,
+            JoinType.JOIN_FULL,
+        ):
+            raise _UnsupportedQueryError()
+        # columns of joined tables can not be referenced by names of tables, if the join has an alias
+        if from_item.alias is not None:
+            raise _UnsupportedQueryError()
+        return [
+            *_get_from_items(
+                from_item=from_item.larg,
+                is_nullable=is_nullable
+                or from_item.jointype in (JoinType.JOIN_RIGHT, JoinType.JOIN_FULL),
+                common_table_expressions_names=common_table_expressions_names,
+            ),
+            *_get_from_items(
+                from_item=from_item.rarg,
+                is_nullable=is_nullable
+                or from_item.jointype in (JoinType.JOIN_LEFT, JoinType.JOIN_FULL),
+                common_table_expressions_names=common_table_expressions_names,
+            ),
+        ]
+    raise _UnsupportedQueryError()
+
+
+def _parse_query(query: str) -> tuple[Sequence[ResTarget], list[_FromItem]]:
+    try:
+        statements = parse_sql(query)
+    except ParseError as error:
+        raise _UnsupportedQueryError() from error
+    if len(statements) != 1:
+        raise _UnsupportedQueryError()
+    statement = statements[0].stmt
+
+    if isinstance(statement, SelectStmt):
+        if (
+            statement.op != SetOperation.SETOP_NONE
+            or statement.targetList is None
+            # grouping sets replace grouped columns by nulls in rows of subtotals
+            or any(
+                isinstance(group, GroupingSet) for group in statement.groupClause or ()
+            )
+        ):
+            raise _UnsupportedQueryError()
+        common_table_expressions_names = (
+            {
+                common_table_expression.ctename
+                for common_table_expression in statement.withClause.ctes
+            }
+            if statement.withClause is not None
+            else set()
+        )
+        from_items = []
+        for from_item in statement.fromClause or ():
+            from_items.extend(
+                _get_from_items(
+                    from_item=from_item,
+                    is_nullable=False,
+                    common_table_expressions_names=common_table_expressions_names,
+                )
+            )
+        return statement.targetList, from_items
+
+    if isinstance(statement, (InsertStmt, UpdateStmt, DeleteStmt)):
+        if (
+            statement.returningList is None
+            or (isinstance(statement, UpdateStmt) and statement.fromClause is not None)
+            or (isinstance(statement, DeleteStmt) and statement.usingClause is not None)
+        ):
+            raise _UnsupportedQueryError()
+        return statement.returningList, _get_from_items(
+            from_item=statement.relation,
+            is_nullable=False,
+            common_table_expressions_names=set(),
+        )
+
+    raise _UnsupportedQueryError()
+
+
+async def _get_table_columns(
+    table: _Table, connection: asyncpg.Connection
+) -> list[_TableColumn]:
+    qualified_name = ".".join(
+        '"' + name.replace('"', '""') + '"'
+        for name in (table.schema_name, table.table_name)
+        if name is not None
+    )
+    records = await connection.fetch(_TABLE_COLUMNS_QUERY, qualified_name)
+    return [
+        _TableColumn(
+            name=str(record["attname"]),
+            is_not_null=record["attnotnull"] is True and not table.is_nullable,
+        )
+        for record in records
+    ]
+
+
+def _is_expression_not_null(
+    expression: Node, columns_by_from_item_name: dict[str, list[_TableColumn] | None]
+) -> bool:
+    if isinstance(expression, A_Const):
+        return not expression.isnull
+    if isinstance(expression, TypeCast):
+        return _is_expression_not_null(
+            expression=expression.arg,
+            columns_by_from_item_name=columns_by_from_item_name,
+        )
+    if isinstance(expression, FuncCall):
+        return [name.sval for name in expression.funcname][-1:] == ["count"]
+    if not isinstance(expression, ColumnRef) or not all(
+        isinstance(field, String) for field in expression.fields
+    ):
+        return False
+
+    names = [field.sval for field in expression.fields if isinstance(field, String)]
+    if len(names) == 2:
+        from_items_names = [names[0]]
+    elif len(names) == 1:
+        from_items_names = list(columns_by_from_item_name)
+    else:
+        return False
+    found_columns: list[_TableColumn] = []
+    for from_item_name in from_items_names:
+        if from_item_name not in columns_by_from_item_name:
+            return False
+        columns = columns_by_from_item_name[from_item_name]
+        # a column of an unknown table can have the same name
+        if columns is None:
+            return False
+        found_columns.extend(column for column in columns if column.name == names[-1])
+    return len(found_columns) == 1 and found_columns[0].is_not_null
+
+
+def _expand_target(
+    target: ResTarget,
+    columns_by_from_item_name: dict[str, list[_TableColumn] | None],
+) -> list[bool]:
+    """
+    Returns for each column of the result produced by the target whether it can not be null, stars are expanded to columns of tables.
+    """
+    expression = target.val
+    if not isinstance(expression, ColumnRef) or not isinstance(
+        expression.fields[-1], A_Star
+    ):
+        return [
+            _is_expression_not_null(
+                expression=expression,
+                columns_by_from_item_name=columns_by_from_item_name,
+            )
+        ]
+
+    if len(expression.fields) == 1:
+        from_items_names = list(columns_by_from_item_name)
+    else:
+        qualifier = expression.fields[-2]
+        if not isinstance(qualifier, String):
+            raise _UnsupportedQueryError()
+        from_items_names = [qualifier.sval]
+    expanded_columns: list[bool] = []
+    for from_item_name in from_items_names:
+        columns = columns_by_from_item_name.get(from_item_name)
+        if columns is None:
+            raise _UnsupportedQueryError()
+        expanded_columns.extend(column.is_not_null for column in columns)
+    return expanded_columns
+
+
+async def get_not_null_columns(
+    query: str, column_names: Sequence[str], connection: asyncpg.Connection
+) -> frozenset[str]:
+    """
+    Returns columns of the query result, which can not be null.
+
+    Columns referring directly to columns of tables with `NOT NULL` constraints, not on the outer side of outer joins,
+    constants and counts can not be null.
+    Columns of queries, which can not be analyzed, e.g. queries with set operations, are assumed to be nullable.
+    """
+    try:
+        targets, from_items = _parse_query(query=query)
+    except _UnsupportedQueryError:
+        return frozenset()
+
+    columns_by_from_item_name: dict[str, list[_TableColumn] | None] = {}
+    for from_item in from_items:
+        if from_item.name in columns_by_from_item_name:
+            return frozenset()
+        columns_by_from_item_name[from_item.name] = (
+            await _get_table_columns(table=from_item.table, connection=connection)
+            if from_item.table is not None
+            else None
+        )
+
+    are_columns_not_null = []
+    try:
+        for target in targets:
+            are_columns_not_null.extend(
+                _expand_target(
+                    target=target, columns_by_from_item_name=columns_by_from_item_name
+                )
+            )
+    except _UnsupportedQueryError:
+        return frozenset()
+    # columns of the result can not be matched with targets, if stars are expanded differently
+    if len(are_columns_not_null) != len(column_names):
+        return frozenset()
+
+    return frozenset(
+        column_name
+        for column_name, is_not_null in zip(column_names, are_columns_not_null)
+        if is_not_null
+    )
@@ -0,0 +1,63 @@
+import dataclasses
+
+from pglast import parse_sql
+from pglast.ast import InsertStmt, ParamRef, SelectStmt
+from pglast.parser import ParseError
+from strictql_postgres.dataclass_error import Error
+
+
+@dataclasses.dataclass(frozen=True)
+class PlainInsert:
+    schema_name: str | None
+    table_name: str
+    columns: list[str]
+
+
+class NotPlainInsertError(Error):
+    pass
+
+
+def parse_plain_insert(query: str) -> PlainInsert:
+    """
+    Parses `insert into table (columns) values ($1, ..., $n)` query, which rows can be loaded by `COPY` instead.
+    """
+    try:
+        statements = parse_sql(query)
+    except ParseError as error:
+        raise NotPlainInsertError(error=f"Invalid SQL query: `{query}`") from error
+
+    if len(statements) != 1 or not isinstance(statements[0].stmt, InsertStmt):
+        raise NotPlainInsertError(error="Query must be a single `insert` statement")
+    insert = statements[0].stmt
+
+    if (
+        insert.withClause is not None
+        or insert.onConflictClause is not None
+        or insert.returningList is not None
+    ):
+        raise NotPlainInsertError(
+            error="`with`, `on conflict` and `returning` clauses are not supported by `COPY`"
+        )
+    if insert.cols is None:
+        raise NotPlainInsertError(error="Columns to insert must be listed explicitly")
+    columns = [column.name for column in insert.cols if column.name is not None]
+
+    select = insert.selectStmt
+    if not isinstance(select, SelectStmt) or select.valuesLists is None:
+        raise NotPlainInsertError(error="Values must be inserted by a `values` clause")
+    if len(select.valuesLists) != 1:
+        raise NotPlainInsertError(error="`values` clause must contain a single row")
+    values = select.valuesLists[0]
+    expected_param_numbers = list(range(1, len(columns) + 1))
+    if [
+        value.number if isinstance(value, ParamRef) else None for value in values
+    ] != expected_param_numbers:
+        raise NotPlainInsertError(
+            error="Values must be bind params of the same order as columns: `$1, ..., $n`"
+        )
+
+    return PlainInsert(
+        schema_name=insert.relation.schemaname,
+        table_name=insert.relation.relname,
+        columns=columns,
+    )
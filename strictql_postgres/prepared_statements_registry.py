@@ -0,0 +1,61 @@
+from asyncpg import Connection
+from asyncpg.prepared_stmt import PreparedStatement
+from strictql_postgres.dataclass_error import Error
+
+
+class PreparedStatementsRegistryError(Error):
+    pass
+
+
+class PreparedStatementsRegistry:
+    """
+    Prepares each query once per connection and reuses prepared statements, regardless of the `asyncpg` statement cache size.
+
+    `asyncpg` invalidates prepared statements of a pool connection when it is released,
+    so only connections created by `asyncpg.connect` can be used, `PreparedStatementsRegistryError` is raised for pool connections.
+
+    Statements are invalidated by changes of result types of queries, for example by migrations, then `asyncpg` raises
+    `InvalidCachedStatementError` and the generated code evicts them and prepares queries again.
+    """
+
+    def __init__(self) -> None:
+        self._statements_by_connection: dict[
+            Connection, dict[str, PreparedStatement]
+        ] = {}
+
+    async def prepare(
+        self, connection: Connection, query: str, timeout: float | None = None
+    ) -> PreparedStatement:
+        statements = self._statements_by_connection.get(connection)
+        if statements is not None:
+            statement = statements.get(query)
+            if statement is not None:
+                return statement
+
+        if not isinstance(connection, Connection):
+            raise PreparedStatementsRegistryError(
+                error=f"Prepared statements can be registered only for connections created by `asyncpg.connect`, got: `{type(connection).__name__}`. "
+                "Pool connections are not supported, `asyncpg` invalidates their prepared statements when they are released, "
+                'use `prepared_statements = "implicit"` or `"unnamed"` for queries run on pool connections'
+            )
+
+        statement = await connection.prepare(query, timeout=timeout)
+        if statements is None:
+            # statements of closed connections are dropped only here to keep lookups cheap
+            for closed_connection in [
+                registered_connection
+                for registered_connection in self._statements_by_connection
+                if registered_connection.is_closed()
+            ]:
+                del self._statements_by_connection[closed_connection]
+            statements = self._statements_by_connection.setdefault(connection, {})
+        statements[query] = statement
+        return statement
+
+    def evict(self, connection: Connection, query: str) -> None:
+        """
+        Drops the prepared statement of the query, so the query is prepared again by the next call of `prepare`.
+        """
+        statements = self._statements_by_connection.get(connection)
+        if statements is not None:
+            statements.pop(query, None)
@@ -6,13 +6,20 @@ import typing
 from dataclasses import dataclass
 from typing import Literal, Mapping, Union
 
-from mako.template import (  # type: ignore[import-untyped] # mako has not typing annotations
-    Template,
+from strictql_postgres.model_name_generator import (
+    generate_record_decoder_name_by_model_name,
 )
-
-from strictql_postgres.templates import TEMPLATES_DIR
+from strictql_postgres.templates import render_template
 from strictql_postgres.type_str_creator import create_type_str
 
+RecordValidation = Literal["validated", "trusted"]
+
+ModelBackend = Literal["pydantic", "dataclass", "namedtuple", "msgspec"]
+
+PreparedStatements = Literal["implicit", "registry", "unnamed"]
+
+CodeFormat = Literal["ruff", "none"]
+
 ALL_TYPES = Union[
     "SimpleTypes",
     "InnerModelType",
@@ -164,10 +171,19 @@ def format_type_with_import(type_: TypesWithImport) -> FormattedTypeWithImport:
     )
 
 
-def generate_code_for_model_as_pydantic(
+@dataclass(frozen=True)
+class FormattedModelFields:
+    imports: set[str]
+    models_code: set[str]
+    fields: dict[str, str]
+
+
+def format_model_fields(
     model_type: ModelType,
-) -> GeneratedCodeWithModelDefinitions:
-    imports = {Import(from_="pydantic", name="BaseModel").format()}
+    model_backend: ModelBackend = "pydantic",
+    defer_build: bool = False,
+) -> FormattedModelFields:
+    imports = set()
     fields = {}
     models: set[str] = set()
     for name, type_ in model_type.fields.items():
@@ -179,8 +195,10 @@ def generate_code_for_model_as_pydantic(
         elif isinstance(type_, SimpleTypes):
             fields[name] = format_simple_type(type_=type_)
         elif isinstance(type_, InnerModelType):
-            generated_code = generate_code_for_model_as_pydantic(
-                model_type=type_.model_type
+            generated_code = generate_code_for_model(
+                model_type=type_.model_type,
+                model_backend=model_backend,
+                defer_build=defer_build,
             )
             imports.update(generated_code.imports)
             models.update(generated_code.models_code)
@@ -195,13 +213,50 @@ def generate_code_for_model_as_pydantic(
         else:
             raise NotImplementedError(type_)
 
-    mako_template = (TEMPLATES_DIR / "pydantic_model.txt").read_text()
-    model_code = (
-        Template(mako_template)  # type: ignore [misc]
-        .render(fields=fields, model_name=model_type.name)
-        .strip()
+    return FormattedModelFields(imports=imports, models_code=models, fields=fields)
+
+
+_MODEL_IMPORT_BY_MODEL_BACKEND: dict[ModelBackend, Import] = {
+    "pydantic": Import(from_="pydantic", name="BaseModel"),
+    "dataclass": Import(from_="dataclasses", name="dataclass"),
+    "namedtuple": Import(from_="typing", name="NamedTuple"),
+    "msgspec": Import(from_="msgspec", name="Struct"),
+}
+
+
+def get_model_import(model_backend: ModelBackend) -> str:
+    return _MODEL_IMPORT_BY_MODEL_BACKEND[model_backend].format()
+
+
+def generate_code_for_model(
+    model_type: ModelType,
+    model_backend: ModelBackend = "pydantic",
+    defer_build: bool = False,
+) -> GeneratedCodeWithModelDefinitions:
+    """
+    Generates code of the model and its inner models.
+
+    If `defer_build` is passed, validators of pydantic models are built on first use instead of the import of the module.
+    """
+    formatted_fields = format_model_fields(
+        model_type=model_type, model_backend=model_backend, defer_build=defer_build
     )
-    models.add(model_code)  # type: ignore [misc]
+    imports = {
+        get_model_import(model_backend=model_backend),
+        *formatted_fields.imports,
+    }
+    defer_build = defer_build and model_backend == "pydantic"
+    if defer_build:
+        imports.add(Import(from_="pydantic", name="ConfigDict").format())
+    models = set(formatted_fields.models_code)
+
+    model_code = render_template(
+        f"{model_backend}_model.txt",
+        fields=formatted_fields.fields,
+        model_name=model_type.name,
+        defer_build=defer_build,
+    ).strip()
+    models.add(model_code)
 
     return GeneratedCodeWithModelDefinitions(
         imports=imports,
@@ -210,7 +265,95 @@ def generate_code_for_model_as_pydantic(
     )
 
 
-def format_type(type: ALL_TYPES) -> FormattedType:
+def generate_code_for_model_as_pydantic(
+    model_type: ModelType,
+) -> GeneratedCodeWithModelDefinitions:
+    return generate_code_for_model(model_type=model_type, model_backend="pydantic")
+
+
+@dataclass(frozen=True)
+class GeneratedRecordDecoders:
+    imports: set[str]
+    decoders_code: list[str]
+    # names of fields of the model with expressions of their values over the `record` variable
+    fields: list[tuple[str, str]]
+
+
+def generate_record_decoders_code(
+    model_type: ModelType,
+    validation: RecordValidation,
+    model_backend: ModelBackend = "pydantic",
+    record_type: str = "Record",
+) -> GeneratedRecordDecoders:
+    """
+    Generates functions creating the model and its inner models from a record by positions of columns known at generation time.
+
+    Records of other types than `Record` of `asyncpg` must be indexed by positions of columns too.
+
+    In the `trusted` mode pydantic models are created without validation, types of values are already checked by Postgres and asyncpg.
+    Models of other backends are never validated and are created from positional arguments.
+    """
+    imports: set[str] = set()
+    decoders_code: list[str] = []
+    fields: list[tuple[str, str]] = []
+    formatted_fields = format_model_fields(
+        model_type=model_type, model_backend=model_backend
+    )
+    has_inner_models = False
+    for index, (name, type_) in enumerate(model_type.fields.items()):
+        value = f"record[{index}]"
+        if isinstance(type_, InnerModelType):
+            has_inner_models = True
+            inner_decoders = generate_record_decoders_code(
+                model_type=type_.model_type,
+                validation=validation,
+                model_backend=model_backend,
+                record_type=record_type,
+            )
+            imports |= inner_decoders.imports
+            imports.add(Import(from_="typing", name="cast").format())
+            for inner_decoder_code in inner_decoders.decoders_code:
+                if inner_decoder_code not in decoders_code:
+                    decoders_code.append(inner_decoder_code)
+            inner_decoder_name = generate_record_decoder_name_by_model_name(
+                model_name=type_.model_type.name
+            )
+            decoded_value = f"{inner_decoder_name}(cast({record_type}, {value}))"
+            if type_.is_optional:
+                decoded_value = f"{decoded_value} if {value} is not None else None"
+            value = decoded_value
+        elif model_backend != "pydantic":
+            # types are quoted, so they are not evaluated for each row
+            value = f'cast("{formatted_fields.fields[name]}", {value})'
+        fields.append((name, value))
+
+    if model_backend == "pydantic":
+        constructor = "construct" if validation == "trusted" else "validate"
+    else:
+        imports.add(Import(from_="typing", name="cast").format())
+        # values of a record are unpacked at once, if all of them are passed to the model as is
+        constructor = "positional" if has_inner_models else "unpack"
+
+    decoder_code = render_template(
+        "record_decoder.txt",
+        decoder_name=generate_record_decoder_name_by_model_name(
+            model_name=model_type.name
+        ),
+        model_name=model_type.name,
+        fields=fields,
+        fields_types=list(formatted_fields.fields.values()),
+        constructor=constructor,
+        record_type=record_type,
+    ).strip()
+    decoders_code.append(decoder_code)
+    return GeneratedRecordDecoders(
+        imports=imports, decoders_code=decoders_code, fields=fields
+    )
+
+
+def format_type(
+    type: ALL_TYPES, model_backend: ModelBackend = "pydantic", defer_build: bool = False
+) -> FormattedType:
     if isinstance(type, SimpleTypes):
         return FormattedType(
             imports=set(),
@@ -224,7 +367,11 @@ def format_type(type: ALL_TYPES) -> FormattedType:
             type_=create_type_str(type_=type.name, is_optional=type.is_optional),
         )
     if isinstance(type, InnerModelType):
-        generated_code = generate_code_for_model_as_pydantic(model_type=type.model_type)
+        generated_code = generate_code_for_model(
+            model_type=type.model_type,
+            model_backend=model_backend,
+            defer_build=defer_build,
+        )
         return FormattedType(
             imports=generated_code.imports,
             models_code=generated_code.models_code,
@@ -235,6 +382,35 @@ def format_type(type: ALL_TYPES) -> FormattedType:
     raise NotImplementedError(type)
 
 
+@dataclass(frozen=True)
+class NumpyColumnType:
+    dtype: str
+    # value replacing nulls in arrays, `None` is converted to `NaT` by numpy arrays of dates and intervals
+    null_value: str
+
+
+def get_numpy_column_type(type_: ALL_TYPES) -> NumpyColumnType | None:
+    """
+    Returns the numpy scalar type of arrays of columns of the type.
+
+    Values of other types, including timestamps, which can have time zones not supported by numpy,
+    are not stored by numpy more efficiently than by lists.
+    """
+    match type_:
+        case Integer():
+            return NumpyColumnType(dtype="np.int64", null_value="0")
+        case Float():
+            return NumpyColumnType(dtype="np.float64", null_value='float("nan")')
+        case Bool():
+            return NumpyColumnType(dtype="np.bool_", null_value="False")
+        case DateType():
+            return NumpyColumnType(dtype="np.datetime64", null_value="None")
+        case TimeDeltaType():
+            return NumpyColumnType(dtype="np.timedelta64", null_value="None")
+        case _:
+            return None
+
+
 FilesContentByPath = Mapping[pathlib.Path, str]
 
 
@@ -242,11 +418,25 @@ FilesContentByPath = Mapping[pathlib.Path, str]
 class RecursiveListType:
     generic_type: RecursiveListSupportedTypes
     is_optional: bool
+    # count of nested lists if it is known, Postgres does not check dimensions of arrays stored in columns
+    dimensions: int | None = None
 
 
 def generate_recursive_list_definition(t: RecursiveListType) -> FormattedType:
     formatted_inner_type = format_type(t.generic_type)
 
+    if t.dimensions is not None:
+        type_name = formatted_inner_type.type_
+        for _ in range(t.dimensions):
+            type_name = f"list[{type_name}]"
+        if t.is_optional:
+            type_name += " | None"
+        return FormattedType(
+            imports=formatted_inner_type.imports,
+            models_code=formatted_inner_type.models_code,
+            type_=type_name,
+        )
+
     type_name = f"list[{formatted_inner_type.type_} | list[{formatted_inner_type.type_} | list[{formatted_inner_type.type_} | object]]]"
 
     if t.is_optional:
@@ -2,13 +2,34 @@ import asyncio
 import dataclasses
 import pathlib
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import AsyncIterator, Collection, Iterator, Mapping
 
 from pydantic import SecretStr
 
 import asyncpg
+from strictql_postgres.code_generator import improve_rendered_files
+from strictql_postgres.code_quality import CodeFixer
+from strictql_postgres.common_types import QueryIntrospection
 from strictql_postgres.format_exception import format_exception
-from strictql_postgres.python_types import FilesContentByPath
+from strictql_postgres.generated_code_writer import GeneratedFile
+from strictql_postgres.generation_inputs import (
+    create_introspection_hash,
+    create_query_hash,
+    create_rendered_module_hash,
+    create_shared_models_module_hash,
+)
+from strictql_postgres.introspection_cache import (
+    INTROSPECTION_CACHE_FILE_NAME,
+    DatabaseIntrospectionCache,
+    IntrospectionCache,
+    get_catalog_fingerprint,
+    normalize_query,
+)
+from strictql_postgres.lazy_package import render_lazy_package_inits
+from strictql_postgres.meta_file import GeneratedFileInputsHashes
+from strictql_postgres.model_name_generator import generate_model_name_by_function_name
+from strictql_postgres.python_types import ModelBackend, ModelType
+from strictql_postgres.queries_renderer import QueryToRender, render_queries
 from strictql_postgres.queries_to_generate import (
     QueryToGenerate,
     StrictQLQueriesToGenerate,
@@ -16,8 +37,18 @@ from strictql_postgres.queries_to_generate import (
 from strictql_postgres.query_generator import (
     QueryPythonCodeGeneratorError,
     QueryToGenerateInfo,
-    generate_query_python_code,
+    get_query_introspection,
+    get_response_schema,
+    remove_not_required_nullability,
 )
+from strictql_postgres.schema_snapshot import SchemaSnapshot
+from strictql_postgres.shared_models import (
+    SHARED_MODELS_FILE_NAME,
+    create_shared_model_type,
+    get_shared_models_module,
+    render_shared_models_module,
+)
+from strictql_postgres.templates import TEMPLATES_MODULES_DIR_NAME
 
 
 @dataclasses.dataclass(frozen=True)
@@ -38,86 +69,436 @@ class PostgresConnectionError(Exception):
     database: str
 
 
+IntrospectionTable = dict[
+    pathlib.Path, QueryIntrospection | QueryPythonCodeGeneratorError
+]
+
+
 @asynccontextmanager
-async def _create_pools(
+async def _connect_to_databases(
     connection_strings_by_db_name: dict[str, SecretStr],
-) -> AsyncIterator[dict[str, asyncpg.Pool]]:
-    pools = {}
-    for db_name, connection_url_secret in connection_strings_by_db_name.items():
-        try:
-            pools[db_name] = await asyncpg.create_pool(
-                connection_url_secret.get_secret_value()
-            ).__aenter__()
-        except Exception as postgres_error:
-            raise PostgresConnectionError(
-                error=format_exception(postgres_error),
-                database=db_name,
-            ) from postgres_error
-
+    connections_count_by_db_name: Mapping[str, int],
+) -> AsyncIterator[dict[str, list[asyncpg.Connection]]]:
+    connections: dict[str, list[asyncpg.Connection]] = {}
     try:
-        yield pools
+        for db_name, connection_url_secret in connection_strings_by_db_name.items():
+            connections[db_name] = []
+            for _ in range(connections_count_by_db_name[db_name]):
+                try:
+                    connection = await asyncpg.connect(
+                        connection_url_secret.get_secret_value()
+                    )
+                except Exception as postgres_error:
+                    raise PostgresConnectionError(
+                        error=format_exception(postgres_error),
+                        database=db_name,
+                    ) from postgres_error
+                connections[db_name].append(connection)
+
+        yield connections
     finally:
-        for db_name, pool in pools.items():
-            await pool.__aexit__(None, None, None)
+        for database_connections in connections.values():
+            for connection in database_connections:
+                await connection.close()
 
 
-async def generate_queries(
+async def _introspect_queries_on_connection(
+    queries: Iterator[tuple[pathlib.Path, QueryToGenerate]],
+    connection: asyncpg.Connection,
+    introspection_cache: DatabaseIntrospectionCache | None,
+    introspection_table: IntrospectionTable,
+) -> None:
+    # the iterator is shared by all connections to the database, so each connection
+    # takes the next query as soon as the previous one is prepared
+    for file_path, query_to_generate in queries:
+        try:
+            introspection_table[file_path] = await get_query_introspection(
+                query=query_to_generate.query,
+                connection=connection,
+                introspection_cache=introspection_cache,
+                infer_nullability=query_to_generate.infer_nullability,
+            )
+        except QueryPythonCodeGeneratorError as error:
+            introspection_table[file_path] = error
+
+
+async def introspect_queries(
     queries_to_generate: StrictQLQueriesToGenerate,
-) -> FilesContentByPath:
-    dbs_connection_urls = {
-        database_name: database.connection_url
-        for database_name, database in queries_to_generate.databases.items()
+    introspection_cache: IntrospectionCache | None = None,
+) -> IntrospectionTable:
+    """
+    Introspects all queries before code generation.
+
+    Each database gets a fixed count of connections, at most `introspection_concurrency`,
+    queries are prepared on them one after another.
+    """
+    queries_by_database: dict[str, list[tuple[pathlib.Path, QueryToGenerate]]] = {
+        database_name: [] for database_name in queries_to_generate.databases
     }
-    async with _create_pools(dbs_connection_urls) as pools:
+    for file_path, query_to_generate in queries_to_generate.queries_to_generate.items():
+        queries_by_database[query_to_generate.database_name].append(
+            (file_path, query_to_generate)
+        )
+
+    introspection_table: IntrospectionTable = {}
+    async with _connect_to_databases(
+        connection_strings_by_db_name={
+            database_name: database.connection_url
+            for database_name, database in queries_to_generate.databases.items()
+        },
+        connections_count_by_db_name={
+            database_name: max(
+                1, min(queries_to_generate.introspection_concurrency, len(queries))
+            )
+            for database_name, queries in queries_by_database.items()
+        },
+    ) as connections:
         tasks = []
+        for database_name, database_connections in connections.items():
+            database_introspection_cache = None
+            if introspection_cache is not None:
+                database_introspection_cache = introspection_cache.for_database(
+                    catalog_fingerprint=await get_catalog_fingerprint(
+                        connection=database_connections[0]
+                    )
+                )
+
+            queries = iter(queries_by_database[database_name])
+            for connection in database_connections:
+                tasks.append(
+                    asyncio.create_task(
+                        _introspect_queries_on_connection(
+                            queries=queries,
+                            connection=connection,
+                            introspection_cache=database_introspection_cache,
+                            introspection_table=introspection_table,
+                        ),
+                        name=f"introspect queries to {database_name}",
+                    )
+                )
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    if introspection_cache is not None:
+        introspection_cache.save()
+
+    return introspection_table
+
+
+def introspect_queries_from_schema_snapshot(
+    queries_to_generate: StrictQLQueriesToGenerate, schema_snapshot: SchemaSnapshot
+) -> IntrospectionTable:
+    introspection_table: IntrospectionTable = {}
+    for file_path, query_to_generate in queries_to_generate.queries_to_generate.items():
+        introspection = schema_snapshot.get(
+            database_name=query_to_generate.database_name,
+            query=query_to_generate.query,
+        )
+        if introspection is None:
+            introspection_table[file_path] = QueryPythonCodeGeneratorError(
+                error="Query not found in the schema snapshot, update the snapshot by the `snapshot` command"
+            )
+        elif (
+            query_to_generate.infer_nullability
+            and introspection.not_null_columns is None
+        ):
+            introspection_table[file_path] = QueryPythonCodeGeneratorError(
+                error="Nullability of columns of the query not found in the schema snapshot, update the snapshot by the `snapshot` command"
+            )
+        else:
+            introspection_table[file_path] = remove_not_required_nullability(
+                introspection=introspection,
+                infer_nullability=query_to_generate.infer_nullability,
+            )
+
+    return introspection_table
+
+
+async def create_schema_snapshot(
+    queries_to_generate: StrictQLQueriesToGenerate,
+) -> SchemaSnapshot:
+    introspection_table = await introspect_queries(
+        queries_to_generate=queries_to_generate
+    )
+
+    errors = []
+    introspections: dict[str, dict[str, QueryIntrospection]] = {
+        database_name: {} for database_name in queries_to_generate.databases
+    }
+    for file_path, query_to_generate in queries_to_generate.queries_to_generate.items():
+        result = introspection_table[file_path]
+        if isinstance(result, QueryPythonCodeGeneratorError):
+            errors.append(
+                QueryGeneratorError(
+                    query_to_generate=query_to_generate,
+                    query_to_generate_path=file_path.resolve(),
+                    error=result.error,
+                )
+            )
+            continue
+        database_introspections = introspections[query_to_generate.database_name]
+        query = normalize_query(query_to_generate.query)
+        # queries with the same text share the entry, it keeps nullability, if any of them infers it
+        if query not in database_introspections or result.not_null_columns is not None:
+            database_introspections[query] = result
+
+    if len(errors) > 0:
+        raise QueriesGeneratorErrors(
+            errors=errors,
+        )
+
+    return SchemaSnapshot.create(introspections=introspections)
+
 
-        for (
-            file_path,
-            query_to_generate,
-        ) in queries_to_generate.queries_to_generate.items():
-            task = asyncio.create_task(
-                generate_query_python_code(
-                    query_to_generate=QueryToGenerateInfo(
-                        query=query_to_generate.query,
-                        function_name=query_to_generate.function_name,
-                        params=query_to_generate.parameters,
-                        query_type=query_to_generate.query_type,
-                    ),
-                    connection_pool=pools[query_to_generate.database_name],
+def _render_shared_models_module(
+    queries_to_generate: StrictQLQueriesToGenerate,
+    introspection_table: IntrospectionTable,
+) -> str:
+    model_types: list[tuple[ModelType, ModelBackend]] = []
+    for file_path, query_to_generate in queries_to_generate.queries_to_generate.items():
+        introspection = introspection_table[file_path]
+        if (
+            isinstance(introspection, QueryPythonCodeGeneratorError)
+            or query_to_generate.query_type not in ("fetch", "fetch_row", "stream")
+            or len(introspection.response_schema) == 0
+        ):
+            continue
+        model_type = ModelType(
+            name=generate_model_name_by_function_name(
+                function_name=query_to_generate.function_name
+            ),
+            fields=get_response_schema(
+                introspection=introspection,
+                array_dimensions=query_to_generate.array_dimensions,
+                infer_nullability=query_to_generate.infer_nullability,
+            ),
+        )
+        model_types.append(
+            (
+                create_shared_model_type(
+                    model_type=model_type, model_backend=query_to_generate.model_backend
                 ),
-                name=f"generate_code_for_query {query_to_generate.function_name} to {file_path}",
+                query_to_generate.model_backend,
             )
+        )
+    return render_shared_models_module(
+        model_types=model_types, defer_build=queries_to_generate.lazy_imports
+    )
 
-            tasks.append(task)
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        errors = []
-        success = []
-        for (file_path, query_to_generate), result in zip(
-            queries_to_generate.queries_to_generate.items(), results
+async def generate_queries(
+    queries_to_generate: StrictQLQueriesToGenerate,
+    previously_generated_files: Mapping[pathlib.Path, GeneratedFile] | None = None,
+    schema_snapshot: SchemaSnapshot | None = None,
+    files_to_generate: Collection[pathlib.Path] | None = None,
+) -> dict[pathlib.Path, GeneratedFile]:
+    """
+    Generates code for queries.
+
+    Files from `previously_generated_files` are reused without rendering and formatting,
+    if inputs of their queries, including the introspected types, are not changed.
+    If `schema_snapshot` is passed, queries are introspected from it without connecting to databases.
+    If shared models are enabled, models of rows are generated to the shared models module, which is returned after queries.
+    If lazy imports are enabled, `__init__.py` files of generated packages are returned last.
+    If `files_to_generate` is passed, only files of these queries are generated, modules not generated from a single query
+    are still generated from all queries. Other queries are introspected only if shared models are enabled.
+    """
+    previously_generated_files = previously_generated_files or {}
+    queries_to_introspect = queries_to_generate
+    if files_to_generate is not None and not queries_to_generate.shared_models:
+        queries_to_introspect = queries_to_generate.model_copy()
+        queries_to_introspect.queries_to_generate = {
+            file_path: query_to_generate
+            for file_path, query_to_generate in queries_to_generate.queries_to_generate.items()
+            if file_path in files_to_generate
+        }
+    if schema_snapshot is not None:
+        introspection_table = introspect_queries_from_schema_snapshot(
+            queries_to_generate=queries_to_introspect, schema_snapshot=schema_snapshot
+        )
+    else:
+        introspection_cache = None
+        if queries_to_generate.cache_dir is not None:
+            introspection_cache = IntrospectionCache.load(
+                path=queries_to_generate.cache_dir / INTROSPECTION_CACHE_FILE_NAME
+            )
+        introspection_table = await introspect_queries(
+            queries_to_generate=queries_to_introspect,
+            introspection_cache=introspection_cache,
+        )
+
+    errors_by_path: dict[pathlib.Path, str] = {}
+    generated_files = {}
+    queries_to_render = []
+    rendered_files_inputs_hashes = {}
+    queries_inputs_hashes = {}
+    for (
+        file_path,
+        query_to_generate,
+    ) in queries_to_introspect.queries_to_generate.items():
+        result = introspection_table[file_path]
+        if isinstance(result, QueryPythonCodeGeneratorError):
+            errors_by_path[file_path] = result.error
+            continue
+
+        inputs_hashes = GeneratedFileInputsHashes(
+            query_hash=create_query_hash(
+                query_to_generate=query_to_generate,
+                code_format=queries_to_generate.code_format,
+            ),
+            introspection_hash=create_introspection_hash(introspection=result),
+        )
+        queries_inputs_hashes[file_path] = inputs_hashes
+        if files_to_generate is not None and file_path not in files_to_generate:
+            continue
+
+        previously_generated_file = previously_generated_files.get(file_path)
+        if (
+            previously_generated_file is not None
+            and previously_generated_file.inputs_hashes == inputs_hashes
         ):
-            if isinstance(result, QueryPythonCodeGeneratorError):
-                errors.append(
-                    QueryGeneratorError(
-                        query_to_generate=query_to_generate,
-                        query_to_generate_path=file_path.resolve(),
-                        error=result.error,
+            generated_files[file_path] = previously_generated_file
+            continue
+
+        queries_to_render.append(
+            QueryToRender(
+                file_path=file_path,
+                query_to_generate=QueryToGenerateInfo(
+                    query=query_to_generate.query,
+                    function_name=query_to_generate.function_name,
+                    params=query_to_generate.parameters,
+                    query_type=query_to_generate.query_type,
+                    validation=query_to_generate.validation,
+                    model_backend=query_to_generate.model_backend,
+                    use_copy=query_to_generate.use_copy,
+                    prepared_statements=query_to_generate.prepared_statements,
+                    array_dimensions=query_to_generate.array_dimensions,
+                    infer_nullability=query_to_generate.infer_nullability,
+                    shared_models_module=get_shared_models_module(
+                        file_path=file_path,
+                        generated_code_path=queries_to_generate.generated_code_path,
                     )
-                )
-                continue
-            if isinstance(result, BaseException):
-                raise result
-            success.append(result)
-
-        if len(errors) > 0:
-            raise QueriesGeneratorErrors(
-                errors=errors,
+                    if queries_to_generate.shared_models
+                    else None,
+                    defer_build=query_to_generate.lazy_imports,
+                ),
+                introspection=result,
             )
+        )
+        rendered_files_inputs_hashes[file_path] = inputs_hashes
 
-        files = {}
-        for code, file_path in zip(
-            success, queries_to_generate.queries_to_generate.keys()
+    render_result = await render_queries(
+        queries_to_render=queries_to_render,
+        concurrency=queries_to_generate.render_concurrency,
+        templates_module_directory=queries_to_generate.cache_dir
+        / TEMPLATES_MODULES_DIR_NAME
+        if queries_to_generate.cache_dir is not None
+        else None,
+    )
+    errors_by_path.update(render_result.errors)
+    if len(errors_by_path) > 0:
+        raise QueriesGeneratorErrors(
+            errors=[
+                QueryGeneratorError(
+                    query_to_generate=query_to_generate,
+                    query_to_generate_path=file_path.resolve(),
+                    error=errors_by_path[file_path],
+                )
+                for file_path, query_to_generate in queries_to_generate.queries_to_generate.items()
+                if file_path in errors_by_path
+            ],
+        )
+
+    rendered_files = dict(render_result.rendered_files)
+    # modules not generated from a single query
+    modules_paths: list[pathlib.Path] = []
+    if queries_to_generate.shared_models:
+        shared_models_path = (
+            queries_to_generate.generated_code_path.resolve() / SHARED_MODELS_FILE_NAME
+        )
+        modules_paths.append(shared_models_path)
+        # the module is generated from all queries, so it is rendered again only if inputs of any query changed
+        inputs_hashes = GeneratedFileInputsHashes(
+            query_hash=create_shared_models_module_hash(
+                queries_inputs_hashes=[
+                    (
+                        query_inputs_hashes.query_hash,
+                        query_inputs_hashes.introspection_hash,
+                    )
+                    for query_inputs_hashes in queries_inputs_hashes.values()
+                ],
+                defer_build=queries_to_generate.lazy_imports,
+                code_format=queries_to_generate.code_format,
+            ),
+            introspection_hash="",
+        )
+        previously_generated_file = previously_generated_files.get(shared_models_path)
+        if (
+            previously_generated_file is not None
+            and previously_generated_file.inputs_hashes == inputs_hashes
         ):
-            files[file_path] = code
+            generated_files[shared_models_path] = previously_generated_file
+        else:
+            rendered_files[shared_models_path] = _render_shared_models_module(
+                queries_to_generate=queries_to_generate,
+                introspection_table=introspection_table,
+            )
+            rendered_files_inputs_hashes[shared_models_path] = inputs_hashes
+    # `__init__.py` files only import names, they are cheap to render
+    rendered_modules: dict[pathlib.Path, str] = {}
+    if queries_to_generate.lazy_imports:
+        rendered_modules = render_lazy_package_inits(
+            queries_to_generate=queries_to_generate.queries_to_generate,
+            generated_code_path=queries_to_generate.generated_code_path,
+            private_files_paths=modules_paths,
+        )
+        modules_paths.extend(rendered_modules)
+    for file_path, rendered_code in rendered_modules.items():
+        inputs_hashes = GeneratedFileInputsHashes(
+            query_hash=create_rendered_module_hash(
+                rendered_code=rendered_code,
+                code_format=queries_to_generate.code_format,
+            ),
+            introspection_hash="",
+        )
+        previously_generated_file = previously_generated_files.get(file_path)
+        if (
+            previously_generated_file is not None
+            and previously_generated_file.inputs_hashes == inputs_hashes
+        ):
+            generated_files[file_path] = previously_generated_file
+        else:
+            rendered_files[file_path] = rendered_code
+            rendered_files_inputs_hashes[file_path] = inputs_hashes
+
+    # rendered code is already laid out canonically, ruff only wraps long lines and adjusts sorting of imports
+    improved_files = (
+        await improve_rendered_files(
+            rendered_files=rendered_files,
+            code_quality_improver=CodeFixer(
+                concurrency=queries_to_generate.formatter_concurrency
+            ),
+        )
+        if queries_to_generate.code_format == "ruff"
+        else rendered_files
+    )
+    for file_path, code in improved_files.items():
+        generated_files[file_path] = GeneratedFile(
+            content=code, inputs_hashes=rendered_files_inputs_hashes[file_path]
+        )
 
-        return files
+    generated_files_paths = [
+        *(
+            file_path
+            for file_path in queries_to_generate.queries_to_generate
+            if files_to_generate is None or file_path in files_to_generate
+        ),
+        *modules_paths,
+    ]
+    return {
+        file_path: generated_files[file_path] for file_path in generated_files_paths
+    }
@@ -0,0 +1,99 @@
+import asyncio
+import dataclasses
+import multiprocessing
+import pathlib
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.query_generator import (
+    QueryPythonCodeGeneratorError,
+    QueryToGenerateInfo,
+    render_query_python_code_from_introspection,
+)
+from strictql_postgres.templates import set_templates_module_directory
+
+# Starting a process and importing the package takes much more time than rendering a few queries,
+# so smaller query sets are rendered in the current process.
+MIN_QUERIES_COUNT_PER_RENDER_PROCESS = 200
+
+
+@dataclasses.dataclass(frozen=True)
+class QueryToRender:
+    file_path: pathlib.Path
+    query_to_generate: QueryToGenerateInfo
+    introspection: QueryIntrospection
+
+
+@dataclasses.dataclass(frozen=True)
+class RenderQueriesResult:
+    rendered_files: dict[pathlib.Path, str]
+    errors: dict[pathlib.Path, str]
+
+
+def render_queries_in_current_process(
+    queries_to_render: Sequence[QueryToRender],
+) -> RenderQueriesResult:
+    # errors are returned instead of raising, because exceptions with keyword fields can not be pickled
+    result = RenderQueriesResult(rendered_files={}, errors={})
+    for query_to_render in queries_to_render:
+        try:
+            result.rendered_files[query_to_render.file_path] = (
+                render_query_python_code_from_introspection(
+                    query_to_generate=query_to_render.query_to_generate,
+                    introspection=query_to_render.introspection,
+                )
+            )
+        except QueryPythonCodeGeneratorError as error:
+            result.errors[query_to_render.file_path] = error.error
+    return result
+
+
+def get_render_processes_count(queries_count: int, concurrency: int) -> int:
+    return max(
+        1, min(concurrency, queries_count // MIN_QUERIES_COUNT_PER_RENDER_PROCESS)
+    )
+
+
+async def render_queries(
+    queries_to_render: Sequence[QueryToRender],
+    concurrency: int,
+    templates_module_directory: pathlib.Path | None = None,
+) -> RenderQueriesResult:
+    """
+    Renders code of queries, large query sets are split into contiguous shards rendered by a pool of processes.
+
+    Results do not depend on the count of processes.
+    """
+    set_templates_module_directory(module_directory=templates_module_directory)
+    processes_count = get_render_processes_count(
+        queries_count=len(queries_to_render), concurrency=concurrency
+    )
+    if processes_count == 1:
+        return render_queries_in_current_process(queries_to_render=queries_to_render)
+
+    shard_size = -(-len(queries_to_render) // processes_count)
+    shards = [
+        queries_to_render[shard_start : shard_start + shard_size]
+        for shard_start in range(0, len(queries_to_render), shard_size)
+    ]
+    loop = asyncio.get_running_loop()
+    # `spawn` does not copy the state of the running event loop into workers, unlike `fork`
+    with ProcessPoolExecutor(
+        max_workers=processes_count,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=set_templates_module_directory,
+        initargs=(templates_module_directory,),
+    ) as executor:
+        shards_results = await asyncio.gather(
+            *[
+                loop.run_in_executor(executor, render_queries_in_current_process, shard)
+                for shard in shards
+            ]
+        )
+
+    result = RenderQueriesResult(rendered_files={}, errors={})
+    for shard_result in shards_results:
+        result.rendered_files.update(shard_result.rendered_files)
+        result.errors.update(shard_result.errors)
+    return result
@@ -1,17 +1,40 @@
+import os
 import pathlib
 from typing import Literal
 
-from pydantic import BaseModel, SecretStr
+from pydantic import BaseModel, Field, SecretStr
 
+from strictql_postgres.python_types import (
+    CodeFormat,
+    ModelBackend,
+    PreparedStatements,
+    RecordValidation,
+)
+from strictql_postgres.schema_snapshot import DEFAULT_SCHEMA_SNAPSHOT_PATH
 from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
 
 
+def get_default_introspection_concurrency() -> int:
+    return min(2 * (os.cpu_count() or 1), 10)
+
+
+def get_default_formatter_concurrency() -> int:
+    # ruff already checks and formats files of one run in parallel,
+    # so only a few ruff processes are required to load all cores.
+    return max(1, min((os.cpu_count() or 1) // 2, 4))
+
+
+def get_default_render_concurrency() -> int:
+    return os.cpu_count() or 1
+
+
 class DataBaseSettings(BaseModel):  # type: ignore[explicit-any]
     connection_url: SecretStr
 
 
 class Parameter(BaseModel):  # type: ignore[explicit-any]
     is_optional: bool
+    array_dimensions: int | None = None
 
 
 class QueryToGenerate(BaseModel):  # type: ignore[explicit-any]
@@ -19,8 +42,24 @@ class QueryToGenerate(BaseModel):  # type: ignore[explicit-any]
     parameters: dict[str, Parameter]
     database_name: str
     database_connection_url: SecretStr
-    query_type: Literal["fetch", "execute", "fetch_row"]
+    query_type: Literal[
+        "fetch",
+        "execute",
+        "fetch_row",
+        "stream",
+        "execute_many",
+        "fetch_columns",
+        "copy_out",
+    ]
     function_name: StringInSnakeLowerCase
+    validation: RecordValidation = "validated"
+    model_backend: ModelBackend = "pydantic"
+    use_copy: bool = False
+    prepared_statements: PreparedStatements = "implicit"
+    array_dimensions: dict[str, int] = {}
+    infer_nullability: bool = False
+    shared_models: bool = False
+    lazy_imports: bool = False
 
 
 class QueryToGenerateWithSourceInfo(BaseModel):  # type: ignore[explicit-any]
@@ -33,3 +72,15 @@ class StrictQLQueriesToGenerate(BaseModel):  # type: ignore[explicit-any]
     queries_to_generate: dict[pathlib.Path, QueryToGenerate]
     databases: dict[str, DataBaseSettings]
     generated_code_path: pathlib.Path
+    introspection_concurrency: int = Field(
+        default_factory=get_default_introspection_concurrency
+    )
+    formatter_concurrency: int = Field(
+        default_factory=get_default_formatter_concurrency
+    )
+    render_concurrency: int = Field(default_factory=get_default_render_concurrency)
+    cache_dir: pathlib.Path | None = None
+    schema_snapshot_path: pathlib.Path = pathlib.Path(DEFAULT_SCHEMA_SNAPSHOT_PATH)
+    code_format: CodeFormat = "ruff"
+    shared_models: bool = False
+    lazy_imports: bool = False
@@ -1,19 +1,32 @@
 import dataclasses
 import typing
-from typing import Literal, assert_never
+from typing import Literal, Mapping, assert_never
 
 from pydantic import BaseModel
 
 import asyncpg
 from asyncpg.exceptions import PostgresError
+from strictql_postgres.binary_copy import get_value_decoder
 from strictql_postgres.code_generator import (
-    generate_code_for_query_with_execute_method,
-    generate_code_for_query_with_fetch_all_method,
-    generate_code_for_query_with_fetch_row_method,
+    get_null_mask_name,
+    improve_rendered_code,
+    render_code_for_query_with_copy_out_method,
+    render_code_for_query_with_execute_many_method,
+    render_code_for_query_with_execute_method,
+    render_code_for_query_with_fetch_all_method,
+    render_code_for_query_with_fetch_columns_method,
+    render_code_for_query_with_fetch_row_method,
+    render_code_for_query_with_stream_method,
 )
 from strictql_postgres.code_quality import CodeFixer
-from strictql_postgres.common_types import BindParam, NotEmptyRowSchema
+from strictql_postgres.common_types import (
+    BindParam,
+    NotEmptyRowSchema,
+    QueryIntrospection,
+)
 from strictql_postgres.format_exception import format_exception
+from strictql_postgres.introspection_cache import DatabaseIntrospectionCache
+from strictql_postgres.nullability import get_not_null_columns
 from strictql_postgres.pg_bind_params_type_getter import get_bind_params_python_types
 from strictql_postgres.pg_response_schema_getter import (
     PgResponseSchemaContainsColumnsWithInvalidNames,
@@ -22,6 +35,15 @@ from strictql_postgres.pg_response_schema_getter import (
     PgResponseSchemaTypeNotSupported,
     get_pg_response_schema_from_prepared_statement,
 )
+from strictql_postgres.plain_insert import NotPlainInsertError, parse_plain_insert
+from strictql_postgres.python_types import (
+    ALL_TYPES,
+    InnerModelType,
+    ModelBackend,
+    PreparedStatements,
+    RecordValidation,
+    RecursiveListType,
+)
 from strictql_postgres.queries_to_generate import Parameter
 from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
 
@@ -51,87 +73,343 @@ class QueryToGenerateInfo(BaseModel):  # type: ignore[explicit-any]
     query: str
     function_name: StringInSnakeLowerCase
     params: dict[str, Parameter]
-    query_type: Literal["fetch", "execute", "fetch_row"]
+    query_type: Literal[
+        "fetch",
+        "execute",
+        "fetch_row",
+        "stream",
+        "execute_many",
+        "fetch_columns",
+        "copy_out",
+    ]
+    validation: RecordValidation = "validated"
+    model_backend: ModelBackend = "pydantic"
+    use_copy: bool = False
+    prepared_statements: PreparedStatements = "implicit"
+    array_dimensions: dict[str, int] = {}
+    infer_nullability: bool = False
+    shared_models_module: str | None = None
+    defer_build: bool = False
 
 
 async def generate_query_python_code(
     query_to_generate: QueryToGenerateInfo, connection_pool: asyncpg.Pool
+) -> str:
+    rendered_code = await render_query_python_code(
+        query_to_generate=query_to_generate, connection_pool=connection_pool
+    )
+    return await improve_rendered_code(
+        rendered_code=rendered_code, code_quality_improver=CodeFixer()
+    )
+
+
+async def render_query_python_code(
+    query_to_generate: QueryToGenerateInfo,
+    connection_pool: asyncpg.Pool,
+    introspection_cache: DatabaseIntrospectionCache | None = None,
 ) -> str:
     async with connection_pool.acquire() as connection:
+        introspection = await get_query_introspection(
+            query=query_to_generate.query,
+            connection=connection,
+            introspection_cache=introspection_cache,
+            infer_nullability=query_to_generate.infer_nullability,
+        )
+
+    return render_query_python_code_from_introspection(
+        query_to_generate=query_to_generate, introspection=introspection
+    )
+
+
+async def get_query_introspection(
+    query: str,
+    connection: asyncpg.Connection,
+    introspection_cache: DatabaseIntrospectionCache | None = None,
+    infer_nullability: bool = False,
+) -> QueryIntrospection:
+    """
+    Introspects the query or takes its introspection from the cache.
+
+    Nullability of columns is inferred only if `infer_nullability` is passed, it requires additional queries to the database.
+    """
+    if introspection_cache is not None:
+        introspection = introspection_cache.get(query=query)
+        # cached introspections without nullability are introspected again, if nullability is required
+        if introspection is not None and (
+            not infer_nullability or introspection.not_null_columns is not None
+        ):
+            return remove_not_required_nullability(
+                introspection=introspection, infer_nullability=infer_nullability
+            )
+
+    introspection = await introspect_query(
+        query=query, connection=connection, infer_nullability=infer_nullability
+    )
+    if introspection_cache is not None:
+        introspection_cache.set(query=query, introspection=introspection)
+
+    return introspection
+
+
+def remove_not_required_nullability(
+    introspection: QueryIntrospection, infer_nullability: bool
+) -> QueryIntrospection:
+    """
+    Drops inferred nullability from introspections of queries not inferring it,
+    so the introspection of a query does not depend on other queries sharing its cache or snapshot entry.
+    """
+    if infer_nullability or introspection.not_null_columns is None:
+        return introspection
+    return dataclasses.replace(introspection, not_null_columns=None)
+
+
+async def introspect_query(
+    query: str, connection: asyncpg.Connection, infer_nullability: bool = False
+) -> QueryIntrospection:
+    try:
+        prepared_statement = await connection.prepare(query=query)
+    except PostgresError as error:
+        raise QueryPythonCodeGeneratorError(
+            error=f"Invalid SQL query: {query}, postgres_error: {format_exception(error)}"
+        )
+
+    try:
+        schema = get_pg_response_schema_from_prepared_statement(
+            prepared_stmt=prepared_statement,
+        )
+    except PgResponseSchemaGetterError as schema_getter_error:
+        match schema_getter_error.error:
+            case PgResponseSchemaTypeNotSupported():
+                raise QueryPythonCodeGeneratorError(
+                    error=f"Postgres type: `{schema_getter_error.error.postgres_type}` in column: `{schema_getter_error.error.column_name}` not supported yet"
+                )
+            case PgResponseSchemaContainsColumnsWithInvalidNames():
+                raise QueryPythonCodeGeneratorError(
+                    error=f"Invalid column names exists in response schema, column names: `{schema_getter_error.error.invalid_column_names}`"
+                )
+            case PgResponseSchemaContainsColumnsWithNotUniqueNames():
+                raise QueryPythonCodeGeneratorError(
+                    error=f"Column names in response schema not unique, column_names {schema_getter_error.error.not_unique_column_names}"
+                )
+            case _:
+                typing.assert_never(schema_getter_error.error)
+
+    pg_param_types = await get_bind_params_python_types(
+        prepared_statement=prepared_statement,
+    )
+
+    not_null_columns = None
+    if infer_nullability:
         try:
-            prepared_statement = await connection.prepare(query=query_to_generate.query)
+            not_null_columns = await get_not_null_columns(
+                query=query, column_names=list(schema), connection=connection
+            )
         except PostgresError as error:
             raise QueryPythonCodeGeneratorError(
-                error=f"Invalid SQL query: {query_to_generate.query}, postgres_error: {format_exception(error)}"
+                error=f"Failed to infer nullability of columns of the query: {query}, postgres_error: {format_exception(error)}"
             )
 
-        try:
-            schema = get_pg_response_schema_from_prepared_statement(
-                prepared_stmt=prepared_statement,
-            )
-        except PgResponseSchemaGetterError as schema_getter_error:
-            match schema_getter_error.error:
-                case PgResponseSchemaTypeNotSupported():
-                    raise QueryPythonCodeGeneratorError(
-                        error=f"Postgres type: `{schema_getter_error.error.postgres_type}` in column: `{schema_getter_error.error.column_name}` not supported yet"
-                    )
-                case PgResponseSchemaContainsColumnsWithInvalidNames():
-                    raise QueryPythonCodeGeneratorError(
-                        error=f"Invalid column names exists in response schema, column names: `{schema_getter_error.error.invalid_column_names}`"
-                    )
-                case PgResponseSchemaContainsColumnsWithNotUniqueNames():
-                    raise QueryPythonCodeGeneratorError(
-                        error=f"Column names in response schema not unique, column_names {schema_getter_error.error.not_unique_column_names}"
-                    )
-                case _:
-                    typing.assert_never(schema_getter_error.error)
+    return QueryIntrospection(
+        response_schema=schema,
+        bind_params_types=pg_param_types,
+        not_null_columns=not_null_columns,
+        columns_postgres_types={
+            attribute.name: attribute.type.name
+            for attribute in prepared_statement.get_attributes()
+        },
+    )
 
-        pg_param_types = await get_bind_params_python_types(
-            prepared_statement=prepared_statement,
+
+def _set_array_dimensions(
+    type_: ALL_TYPES, array_dimensions: int | None, name: str
+) -> ALL_TYPES:
+    if array_dimensions is None:
+        return type_
+    if not isinstance(type_, RecursiveListType):
+        raise QueryPythonCodeGeneratorError(
+            error=f"Array dimensions are set for `{name}`, which is not an array"
         )
+    return dataclasses.replace(type_, dimensions=array_dimensions)
 
-        if len(pg_param_types) != len(query_to_generate.params):
-            raise QueryPythonCodeGeneratorError(
-                error=f"Query contains invalid param names count, expected param names count: `{len(pg_param_types)}`, actual_params_count: `{len(query_to_generate.params)}`"
-            )
 
-        params = []
-        if query_to_generate.params:
-            for parameter_from_pg, (user_parameter_name, user_parameter) in zip(
-                pg_param_types, query_to_generate.params.items()
-            ):
-                parameter_from_pg.is_optional = user_parameter.is_optional
-                params.append(
-                    BindParam(
-                        name_in_function=user_parameter_name,
-                        type_=parameter_from_pg,
-                    )
+def get_response_schema(
+    introspection: QueryIntrospection,
+    array_dimensions: Mapping[str, int],
+    infer_nullability: bool = False,
+) -> dict[str, ALL_TYPES]:
+    """
+    Returns types of columns of the query result with arrays of known dimensions.
+
+    If `infer_nullability` is passed, columns, which can not be null by the introspection, are not optional.
+    """
+    not_found_columns = set(array_dimensions) - set(introspection.response_schema)
+    if len(not_found_columns) > 0:
+        raise QueryPythonCodeGeneratorError(
+            error=f"Array dimensions are set for columns not found in the query result: `{sorted(not_found_columns)}`"
+        )
+    response_schema = {}
+    for column_name, type_ in introspection.response_schema.items():
+        type_ = _set_array_dimensions(
+            type_=type_,
+            array_dimensions=array_dimensions.get(column_name),
+            name=f"column: {column_name}",
+        )
+        if (
+            infer_nullability
+            and introspection.not_null_columns is not None
+            and column_name in introspection.not_null_columns
+        ):
+            type_ = dataclasses.replace(type_, is_optional=False)
+        response_schema[column_name] = type_
+    return response_schema
+
+
+def render_query_python_code_from_introspection(
+    query_to_generate: QueryToGenerateInfo, introspection: QueryIntrospection
+) -> str:
+    pg_param_types = introspection.bind_params_types
+    schema = get_response_schema(
+        introspection=introspection,
+        array_dimensions=query_to_generate.array_dimensions,
+        infer_nullability=query_to_generate.infer_nullability,
+    )
+    if len(pg_param_types) != len(query_to_generate.params):
+        raise QueryPythonCodeGeneratorError(
+            error=f"Query contains invalid param names count, expected param names count: `{len(pg_param_types)}`, actual_params_count: `{len(query_to_generate.params)}`"
+        )
+
+    params = []
+    if query_to_generate.params:
+        for parameter_from_pg, (user_parameter_name, user_parameter) in zip(
+            pg_param_types, query_to_generate.params.items()
+        ):
+            params.append(
+                BindParam(
+                    name_in_function=user_parameter_name,
+                    type_=dataclasses.replace(
+                        _set_array_dimensions(
+                            type_=parameter_from_pg,
+                            array_dimensions=user_parameter.array_dimensions,
+                            name=f"parameter: {user_parameter_name}",
+                        ),
+                        is_optional=user_parameter.is_optional,
+                    ),
                 )
-    improver = CodeFixer()
+            )
     match query_to_generate.query_type:
         case "fetch":
-            return await generate_code_for_query_with_fetch_all_method(
+            return render_code_for_query_with_fetch_all_method(
                 query=query_to_generate.query,
                 result_schema=NotEmptyRowSchema(schema=schema),
                 bind_params=params,
                 function_name=query_to_generate.function_name,
-                code_quality_improver=improver,
+                validation=query_to_generate.validation,
+                model_backend=query_to_generate.model_backend,
+                prepared_statements=query_to_generate.prepared_statements,
+                shared_models_module=query_to_generate.shared_models_module,
+                defer_build=query_to_generate.defer_build,
             )
         case "execute":
-            return await generate_code_for_query_with_execute_method(
+            return render_code_for_query_with_execute_method(
                 query=query_to_generate.query,
                 bind_params=params,
                 function_name=query_to_generate.function_name,
-                code_quality_improver=improver,
+                prepared_statements=query_to_generate.prepared_statements,
             )
         case "fetch_row":
-            return await generate_code_for_query_with_fetch_row_method(
+            return render_code_for_query_with_fetch_row_method(
                 query=query_to_generate.query,
                 result_schema=NotEmptyRowSchema(schema=schema),
                 bind_params=params,
                 function_name=query_to_generate.function_name,
-                code_quality_improver=improver,
+                validation=query_to_generate.validation,
+                model_backend=query_to_generate.model_backend,
+                prepared_statements=query_to_generate.prepared_statements,
+                shared_models_module=query_to_generate.shared_models_module,
+                defer_build=query_to_generate.defer_build,
+            )
+        case "stream":
+            return render_code_for_query_with_stream_method(
+                query=query_to_generate.query,
+                result_schema=NotEmptyRowSchema(schema=schema),
+                bind_params=params,
+                function_name=query_to_generate.function_name,
+                validation=query_to_generate.validation,
+                model_backend=query_to_generate.model_backend,
+                shared_models_module=query_to_generate.shared_models_module,
+                defer_build=query_to_generate.defer_build,
+            )
+        case "fetch_columns":
+            composite_columns = [
+                column_name
+                for column_name, type_ in schema.items()
+                if isinstance(type_, InnerModelType)
+            ]
+            if len(composite_columns) > 0:
+                raise QueryPythonCodeGeneratorError(
+                    error=f"Query with `fetch_columns` type can not return columns of composite types: `{composite_columns}`"
+                )
+            null_masks_columns = [
+                column_name
+                for column_name in schema
+                if get_null_mask_name(column_name=column_name) in schema
+            ]
+            if len(null_masks_columns) > 0:
+                raise QueryPythonCodeGeneratorError(
+                    error=f"Query with `fetch_columns` type has columns with names of null masks of other columns: `{[get_null_mask_name(column_name=column_name) for column_name in null_masks_columns]}`"
+                )
+            return render_code_for_query_with_fetch_columns_method(
+                query=query_to_generate.query,
+                result_schema=NotEmptyRowSchema(schema=schema),
+                bind_params=params,
+                function_name=query_to_generate.function_name,
+                prepared_statements=query_to_generate.prepared_statements,
+            )
+        case "copy_out":
+            unsupported_columns = [
+                column_name
+                for column_name in schema
+                if column_name not in introspection.columns_postgres_types
+                or get_value_decoder(
+                    postgres_type=introspection.columns_postgres_types[column_name]
+                )
+                is None
+            ]
+            if len(unsupported_columns) > 0:
+                raise QueryPythonCodeGeneratorError(
+                    error=f"Query with `copy_out` type has columns of types not supported by the binary copy decoder: `{unsupported_columns}`"
+                )
+            return render_code_for_query_with_copy_out_method(
+                query=query_to_generate.query,
+                result_schema=NotEmptyRowSchema(schema=schema),
+                columns_postgres_types=[
+                    introspection.columns_postgres_types[column_name]
+                    for column_name in schema
+                ],
+                bind_params=params,
+                function_name=query_to_generate.function_name,
+                validation=query_to_generate.validation,
+                model_backend=query_to_generate.model_backend,
+                defer_build=query_to_generate.defer_build,
+            )
+        case "execute_many":
+            if len(params) == 0:
+                raise QueryPythonCodeGeneratorError(
+                    error="Query with `execute_many` type must have bind params"
+                )
+            plain_insert = None
+            if query_to_generate.use_copy:
+                try:
+                    plain_insert = parse_plain_insert(query=query_to_generate.query)
+                except NotPlainInsertError as error:
+                    raise QueryPythonCodeGeneratorError(
+                        error=f"Query with `use_copy` must be a plain insert: {error.error}"
+                    ) from error
+            return render_code_for_query_with_execute_many_method(
+                query=query_to_generate.query,
+                bind_params=params,
+                function_name=query_to_generate.function_name,
+                plain_insert=plain_insert,
             )
-
         case "_":
             assert_never(query_to_generate.query_type)
@@ -0,0 +1,94 @@
+import pathlib
+
+import pydantic
+
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.dataclass_error import Error
+from strictql_postgres.introspection_cache import (
+    INTROSPECTION_CACHE_VERSION,
+    CachedQueryIntrospection,
+    dump_query_introspection,
+    load_query_introspection,
+    normalize_query,
+)
+
+DEFAULT_SCHEMA_SNAPSHOT_PATH = "strictql_snapshot.json"
+
+
+class SchemaSnapshotFileModel(pydantic.BaseModel):  # type: ignore[explicit-any]
+    version: int
+    databases: dict[str, dict[str, CachedQueryIntrospection]]
+
+
+class SchemaSnapshotError(Error):
+    pass
+
+
+class SchemaSnapshot:
+    """
+    Introspection results of all queries by databases, which allows generating code without connecting to databases.
+
+    Unlike the introspection cache, the snapshot is supposed to be committed, so it is stored in a stable order.
+    """
+
+    def __init__(
+        self, databases: dict[str, dict[str, CachedQueryIntrospection]]
+    ) -> None:
+        self._databases = databases
+
+    @classmethod
+    def create(
+        cls, introspections: dict[str, dict[str, QueryIntrospection]]
+    ) -> "SchemaSnapshot":
+        return cls(
+            databases={
+                database_name: {
+                    normalize_query(query): dump_query_introspection(
+                        introspection=introspection
+                    )
+                    for query, introspection in database_introspections.items()
+                }
+                for database_name, database_introspections in introspections.items()
+            }
+        )
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "SchemaSnapshot":
+        if not path.is_file():
+            raise SchemaSnapshotError(
+                error=f"Schema snapshot `{path.resolve()}` not found, create it by the `snapshot` command"
+            )
+        try:
+            snapshot_file = SchemaSnapshotFileModel.model_validate_json(
+                path.read_bytes()
+            )
+        except pydantic.ValidationError as error:
+            raise SchemaSnapshotError(
+                error=f"Schema snapshot `{path.resolve()}` is broken, create it again by the `snapshot` command"
+            ) from error
+        if snapshot_file.version != INTROSPECTION_CACHE_VERSION:
+            raise SchemaSnapshotError(
+                error=f"Schema snapshot `{path.resolve()}` was created by another version of strictql, create it again by the `snapshot` command"
+            )
+        return cls(databases=snapshot_file.databases)
+
+    def save(self, path: pathlib.Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            SchemaSnapshotFileModel(
+                version=INTROSPECTION_CACHE_VERSION,
+                databases={
+                    database_name: dict(sorted(queries.items()))
+                    for database_name, queries in sorted(self._databases.items())
+                },
+            ).model_dump_json(indent=1)
+            + "\n"
+        )
+
+    def get(self, database_name: str, query: str) -> QueryIntrospection | None:
+        cached_introspection = self._databases.get(database_name, {}).get(
+            normalize_query(query)
+        )
+        if cached_introspection is None:
+            return None
+        return load_query_introspection(cached_introspection=cached_introspection)
@@ -0,0 +1,93 @@
+import hashlib
+import pathlib
+from collections.abc import Iterable
+
+from strictql_postgres.code_layout import format_code_layout, sort_imports, sort_models
+from strictql_postgres.python_types import (
+    ALL_TYPES,
+    InnerModelType,
+    ModelBackend,
+    ModelType,
+    format_model_fields,
+    generate_code_for_model,
+)
+from strictql_postgres.templates import render_template
+
+SHARED_MODELS_MODULE_NAME = "_shared_models"
+
+SHARED_MODELS_FILE_NAME = f"{SHARED_MODELS_MODULE_NAME}.py"
+
+
+def get_shared_models_module(
+    file_path: pathlib.Path, generated_code_path: pathlib.Path
+) -> str:
+    """
+    Returns a relative import path of the shared models module for a generated file,
+    so the generated code does not depend on the package it is placed in.
+    """
+    depth = len(file_path.resolve().relative_to(generated_code_path.resolve()).parts)
+    return f"{'.' * depth}{SHARED_MODELS_MODULE_NAME}"
+
+
+def create_shared_model_type(
+    model_type: ModelType, model_backend: ModelBackend
+) -> ModelType:
+    """
+    Renames the model and its inner models by hashes of their fields, so models of the same structure get the same name.
+    """
+    fields: dict[str, ALL_TYPES] = {}
+    for name, type_ in model_type.fields.items():
+        if isinstance(type_, InnerModelType):
+            type_ = InnerModelType(
+                model_type=create_shared_model_type(
+                    model_type=type_.model_type, model_backend=model_backend
+                ),
+                is_optional=type_.is_optional,
+            )
+        fields[name] = type_
+
+    formatted_fields = format_model_fields(
+        model_type=ModelType(name="", fields=fields), model_backend=model_backend
+    )
+    fields_hash = hashlib.sha256(
+        "\n".join(
+            [
+                model_backend,
+                *[
+                    f"{name}: {type_str}"
+                    for name, type_str in formatted_fields.fields.items()
+                ],
+            ]
+        ).encode()
+    ).hexdigest()
+    return ModelType(name=f"SharedModel{fields_hash[:16]}", fields=fields)
+
+
+def get_shared_model_names(model_type: ModelType) -> set[str]:
+    names = {model_type.name}
+    for type_ in model_type.fields.values():
+        if isinstance(type_, InnerModelType):
+            names |= get_shared_model_names(model_type=type_.model_type)
+    return names
+
+
+def render_shared_models_module(
+    model_types: Iterable[tuple[ModelType, ModelBackend]],
+    defer_build: bool = False,
+) -> str:
+    imports: set[str] = set()
+    models: set[str] = set()
+    for model_type, model_backend in model_types:
+        generated_code = generate_code_for_model(
+            model_type=model_type, model_backend=model_backend, defer_build=defer_build
+        )
+        imports |= generated_code.imports
+        models |= generated_code.models_code
+
+    return format_code_layout(
+        code=render_template(
+            "shared_models.txt",
+            imports=sort_imports(imports),
+            models=sort_models(models),
+        )
+    )
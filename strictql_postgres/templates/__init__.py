@@ -1,3 +1,54 @@
 import pathlib
+from typing import Protocol
+
+from mako.template import (  # type: ignore[import-untyped] # mako has not typing annotations
+    Template,
+)
 
 TEMPLATES_DIR = pathlib.Path(__file__).parent
+
+# name of a directory in the cache dir with python modules of compiled templates
+TEMPLATES_MODULES_DIR_NAME = "templates"
+
+_templates_module_directory: pathlib.Path | None = None
+
+
+class _CompiledTemplate(Protocol):
+    def render(self, **kwargs: object) -> str: ...
+
+
+_compiled_templates: dict[str, _CompiledTemplate] = {}
+
+
+def set_templates_module_directory(module_directory: pathlib.Path | None) -> None:
+    """
+    Sets a directory where mako stores compiled templates as python modules, so templates are not compiled again by next runs.
+
+    Templates are compiled in memory, if the directory is not set.
+    """
+    global _templates_module_directory
+    if module_directory != _templates_module_directory:
+        _templates_module_directory = module_directory
+        _compiled_templates.clear()
+
+
+def _get_template(template_name: str) -> _CompiledTemplate:
+    if template_name in _compiled_templates:
+        return _compiled_templates[template_name]
+    template: _CompiledTemplate = Template(
+        filename=str(TEMPLATES_DIR / template_name),
+        uri=template_name,
+        input_encoding="utf-8",
+        module_directory=str(_templates_module_directory)
+        if _templates_module_directory is not None
+        else None,
+    )
+    _compiled_templates[template_name] = template
+    return template
+
+
+def render_template(template_name: str, **kwargs: object) -> str:
+    """
+    Renders a template from the templates directory, each template is loaded and compiled once per process.
+    """
+    return _get_template(template_name).render(**kwargs)
@@ -0,0 +1,81 @@
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import timedelta
+from os import PathLike
+from typing import BinaryIO
+
+from pydantic import BaseModel
+
+from asyncpg import Connection
+from strictql_postgres.api import BinaryCopyDecoder
+
+
+class ExportUsersModel(BaseModel):  # type: ignore[explicit-any]
+    id: int | None
+    name: str | None
+
+
+def decode_export_users_model(record: tuple[object, ...]) -> ExportUsersModel:
+    fields: dict[str, object] = {
+        "id": record[0],
+        "name": record[1],
+    }
+    return ExportUsersModel.model_validate(fields)
+
+
+_COLUMNS_POSTGRES_TYPES = ("int4", "text")
+
+
+async def export_users(
+    connection: Connection,
+    id: int | None,
+    name: str | None,
+    handle_rows: Callable[[Sequence[ExportUsersModel]], Awaitable[None]],
+    timeout: timedelta | None = None,
+) -> int:
+    query = """
+    SELECT *
+FROM users
+WHERE id > $1
+  AND name <> $2
+"""
+    decoder = BinaryCopyDecoder(columns_types=_COLUMNS_POSTGRES_TYPES)
+
+    async def handle_chunk(chunk: bytes) -> None:
+        records = decoder.feed(chunk)
+        if len(records) > 0:
+            await handle_rows([decode_export_users_model(record) for record in records])
+
+    status = await connection.copy_from_query(
+        query,
+        id,
+        name,
+        output=handle_chunk,
+        format="binary",
+        timeout=timeout.total_seconds() if timeout is not None else None,
+    )
+    decoder.finish()
+    return int(status.split()[-1])
+
+
+async def export_users_to_file(
+    connection: Connection,
+    id: int | None,
+    name: str | None,
+    output: str | PathLike[str] | BinaryIO,
+    timeout: timedelta | None = None,
+) -> int:
+    query = """
+    SELECT *
+FROM users
+WHERE id > $1
+  AND name <> $2
+"""
+    status = await connection.copy_from_query(
+        query,
+        id,
+        name,
+        output=output,
+        format="binary",
+        timeout=timeout.total_seconds() if timeout is not None else None,
+    )
+    return int(status.split()[-1])
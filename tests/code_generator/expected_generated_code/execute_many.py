@@ -0,0 +1,26 @@
+from collections.abc import Iterable
+from datetime import timedelta
+from typing import NamedTuple
+
+from asyncpg import Connection
+
+
+class InsertUsersParams(NamedTuple):
+    id: int | None
+    name: str | None
+
+
+async def insert_users(
+    connection: Connection,
+    params: Iterable[tuple[int | None, str | None]],
+    timeout: timedelta | None = None,
+) -> None:
+    query = """
+    INSERT INTO users (id
+                 , name)
+VALUES ($1
+      , $2)
+"""
+    await connection.executemany(
+        query, params, timeout=timeout.total_seconds() if timeout is not None else None
+    )
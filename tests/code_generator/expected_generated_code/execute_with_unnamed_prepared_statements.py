@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from asyncpg import Connection
+
+
+async def delete_users(
+    connection: Connection,
+    id: int | None,
+    name: str | None,
+    timeout: timedelta | None = None,
+) -> str:
+    query = """
+    DELETE FROM users
+WHERE id = $1
+  AND name = $2
+"""
+    statement = await connection.prepare(
+        query, name="", timeout=timeout.total_seconds() if timeout is not None else None
+    )
+    await statement.fetch(
+        id, name, timeout=timeout.total_seconds() if timeout is not None else None
+    )
+    return statement.get_statusmsg()
@@ -1,10 +1,9 @@
 from collections.abc import Sequence
 from datetime import timedelta
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from asyncpg import Connection
-from strictql_postgres.api import convert_records_to_pydantic_models
 
 
 class FetchAllUsersModel(BaseModel):  # type: ignore[explicit-any]
@@ -12,6 +11,9 @@ class FetchAllUsersModel(BaseModel):  # type: ignore[explicit-any]
     name: str | None
 
 
+_rows_adapter = TypeAdapter(list[FetchAllUsersModel])
+
+
 async def fetch_all_users(
     connection: Connection,
     id: int | None,
@@ -30,6 +32,11 @@ WHERE id = $1
         name,
         timeout=timeout.total_seconds() if timeout is not None else None,
     )
-    return convert_records_to_pydantic_models(
-        records=records, pydantic_model_type=FetchAllUsersModel
-    )
+    rows: list[dict[str, object]] = [
+        {
+            "id": record[0],
+            "name": record[1],
+        }
+        for record in records
+    ]
+    return _rows_adapter.validate_python(rows)
@@ -0,0 +1,29 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import cast
+
+from asyncpg import Connection, Record
+
+
+@dataclass(frozen=True, slots=True)
+class FetchAllUsersModel:
+    id: int | None
+    name: str | None
+
+
+def decode_fetch_all_users_model(record: Record) -> FetchAllUsersModel:
+    return FetchAllUsersModel(*cast("tuple[int | None, str | None]", record))
+
+
+async def fetch_all_users(
+    connection: Connection, timeout: timedelta | None = None
+) -> Sequence[FetchAllUsersModel]:
+    query = """
+    SELECT *
+FROM users
+"""
+    records = await connection.fetch(
+        query, timeout=timeout.total_seconds() if timeout is not None else None
+    )
+    return [decode_fetch_all_users_model(record) for record in records]
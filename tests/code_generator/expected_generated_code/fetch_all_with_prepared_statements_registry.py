@@ -0,0 +1,62 @@
+from collections.abc import Sequence
+from datetime import timedelta
+
+from pydantic import BaseModel, TypeAdapter
+
+from asyncpg import Connection
+from asyncpg.exceptions import InvalidCachedStatementError
+from strictql_postgres.api import PreparedStatementsRegistry
+
+
+class FetchAllUsersModel(BaseModel):  # type: ignore[explicit-any]
+    id: int | None
+    name: str | None
+
+
+_rows_adapter = TypeAdapter(list[FetchAllUsersModel])
+
+_prepared_statements = PreparedStatementsRegistry()
+
+
+async def fetch_all_users(
+    connection: Connection,
+    id: int | None,
+    name: str | None,
+    timeout: timedelta | None = None,
+) -> Sequence[FetchAllUsersModel]:
+    query = """
+    SELECT *
+FROM users
+WHERE id = $1
+  AND name = $2
+"""
+    statement = await _prepared_statements.prepare(
+        connection,
+        query,
+        timeout=timeout.total_seconds() if timeout is not None else None,
+    )
+    try:
+        records = await statement.fetch(
+            id, name, timeout=timeout.total_seconds() if timeout is not None else None
+        )
+    except InvalidCachedStatementError:
+        # the result type of the query changed after the statement was prepared, for example by a migration
+        _prepared_statements.evict(connection, query)
+        if connection.is_in_transaction():
+            raise
+        statement = await _prepared_statements.prepare(
+            connection,
+            query,
+            timeout=timeout.total_seconds() if timeout is not None else None,
+        )
+        records = await statement.fetch(
+            id, name, timeout=timeout.total_seconds() if timeout is not None else None
+        )
+    rows: list[dict[str, object]] = [
+        {
+            "id": record[0],
+            "name": record[1],
+        }
+        for record in records
+    ]
+    return _rows_adapter.validate_python(rows)
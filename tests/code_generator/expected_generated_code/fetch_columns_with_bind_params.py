@@ -0,0 +1,55 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import cast
+
+import numpy as np
+from numpy.typing import NDArray
+
+from asyncpg import Connection, Record
+
+
+@dataclass(frozen=True, slots=True)
+class FetchUsersColumns:
+    id: NDArray[np.int64]
+    id_is_null: NDArray[np.bool_]
+    name: list[str | None]
+    score: NDArray[np.float64]
+    score_is_null: NDArray[np.bool_]
+
+
+def decode_fetch_users_columns(records: Sequence[Record]) -> FetchUsersColumns:
+    id_values: list[object] = [record[0] for record in records]
+    id_nulls: list[bool] = [value is None for value in id_values]
+    id_values = [0 if value is None else value for value in id_values]
+    score_values: list[object] = [record[2] for record in records]
+    score_nulls: list[bool] = [value is None for value in score_values]
+    score_values = [float("nan") if value is None else value for value in score_values]
+    return FetchUsersColumns(
+        id=np.array(id_values, dtype=np.int64),
+        id_is_null=np.array(id_nulls, dtype=np.bool_),
+        name=cast("list[str | None]", [record[1] for record in records]),
+        score=np.array(score_values, dtype=np.float64),
+        score_is_null=np.array(score_nulls, dtype=np.bool_),
+    )
+
+
+async def fetch_users(
+    connection: Connection,
+    id: int | None,
+    name: str | None,
+    timeout: timedelta | None = None,
+) -> FetchUsersColumns:
+    query = """
+    SELECT *
+FROM users
+WHERE id > $1
+  AND name <> $2
+"""
+    records = await connection.fetch(
+        query,
+        id,
+        name,
+        timeout=timeout.total_seconds() if timeout is not None else None,
+    )
+    return decode_fetch_users_columns(records)
@@ -2,8 +2,7 @@ from datetime import timedelta
 
 from pydantic import BaseModel
 
-from asyncpg import Connection
-from strictql_postgres.api import convert_record_to_pydantic_model
+from asyncpg import Connection, Record
 
 
 class FetchUserModel(BaseModel):  # type: ignore[explicit-any]
@@ -11,6 +10,14 @@ class FetchUserModel(BaseModel):  # type: ignore[explicit-any]
     name: str | None
 
 
+def decode_fetch_user_model(record: Record) -> FetchUserModel:
+    fields: dict[str, object] = {
+        "id": record[0],
+        "name": record[1],
+    }
+    return FetchUserModel.model_validate(fields)
+
+
 async def fetch_user(
     connection: Connection, timeout: timedelta | None = None
 ) -> FetchUserModel | None:
@@ -24,6 +31,4 @@ LIMIT 1
     )
     if record is None:
         return None
-    return convert_record_to_pydantic_model(
-        record=record, pydantic_model_type=FetchUserModel
-    )
+    return decode_fetch_user_model(record)
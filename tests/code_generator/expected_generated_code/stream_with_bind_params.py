@@ -0,0 +1,42 @@
+from collections.abc import AsyncIterator
+from datetime import timedelta
+
+from pydantic import BaseModel
+
+from asyncpg import Connection, Record
+
+
+class StreamUsersModel(BaseModel):  # type: ignore[explicit-any]
+    id: int | None
+    name: str | None
+
+
+def decode_stream_users_model(record: Record) -> StreamUsersModel:
+    fields: dict[str, object] = {
+        "id": record[0],
+        "name": record[1],
+    }
+    return StreamUsersModel.model_validate(fields)
+
+
+async def stream_users(
+    connection: Connection,
+    id: int | None,
+    name: str | None,
+    prefetch: int = 1000,
+    timeout: timedelta | None = None,
+) -> AsyncIterator[StreamUsersModel]:
+    query = """
+    SELECT *
+FROM users
+WHERE id = $1
+  AND name = $2
+"""
+    async for record in connection.cursor(
+        query,
+        id,
+        name,
+        prefetch=prefetch,
+        timeout=timeout.total_seconds() if timeout is not None else None,
+    ):
+        yield decode_stream_users_model(record)
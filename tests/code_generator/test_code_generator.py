@@ -1,18 +1,28 @@
+import io
 import pathlib
+from collections.abc import Sequence
 
-from asyncpg import Pool
+import numpy as np
+
+from asyncpg import Connection, Pool
 from pglast import prettify
 from strictql_postgres.code_generator import (
+    generate_code_for_query_with_copy_out_method,
+    generate_code_for_query_with_execute_many_method,
     generate_code_for_query_with_execute_method,
     generate_code_for_query_with_fetch_all_method,
+    generate_code_for_query_with_fetch_columns_method,
     generate_code_for_query_with_fetch_row_method,
+    generate_code_for_query_with_stream_method,
 )
 from strictql_postgres.code_quality import CodeFixer
 from strictql_postgres.common_types import (
     BindParam,
     NotEmptyRowSchema,
 )
+from strictql_postgres.plain_insert import parse_plain_insert
 from strictql_postgres.python_types import (
+    Float,
     Integer,
     SimpleTypes,
     String,
@@ -76,6 +86,196 @@ async def test_code_generator_fetch_all_without_bind_params(
     assert actual_generated_code == expected_generated_code
 
 
+async def test_code_generator_fetch_all_with_dataclass_model_backend(
+    asyncpg_connection_pool_to_test_db: Pool, code_quality_improver: CodeFixer
+) -> None:
+    await asyncpg_connection_pool_to_test_db.execute(
+        "create table users (id serial not null, name text)"
+    )
+
+    query = prettify("SELECT * FROM users;")
+
+    from tests.code_generator.expected_generated_code.fetch_all_with_dataclass_model_backend import (
+        FetchAllUsersModel,
+        fetch_all_users,
+    )
+
+    await asyncpg_connection_pool_to_test_db.execute(
+        "insert into users (id, name) values ($1, $2)",
+        1,
+        "kek",
+    )
+    async with asyncpg_connection_pool_to_test_db.acquire() as conn:
+        users = await fetch_all_users(conn)
+        assert list(users) == [FetchAllUsersModel(id=1, name="kek")]
+
+    with (
+        EXPECTED_GENERATED_CODE_DIR / "fetch_all_with_dataclass_model_backend.py"
+    ).open() as file:
+        expected_generated_code = file.read()
+
+    db_row_model: dict[str, SimpleTypes] = {
+        "id": Integer(is_optional=True),
+        "name": String(is_optional=True),
+    }
+
+    actual_generated_code = await generate_code_for_query_with_fetch_all_method(
+        query=query,
+        result_schema=NotEmptyRowSchema(db_row_model),
+        bind_params=[],
+        function_name=StringInSnakeLowerCase("fetch_all_users"),
+        code_quality_improver=code_quality_improver,
+        model_backend="dataclass",
+    )
+    assert actual_generated_code == expected_generated_code
+
+
+async def test_code_generator_stream_with_bind_params(
+    asyncpg_connection_pool_to_test_db: Pool, code_quality_improver: CodeFixer
+) -> None:
+    await asyncpg_connection_pool_to_test_db.execute(
+        "create table users (id serial not null, name text)"
+    )
+
+    query = prettify("SELECT * FROM users where id = $1 and name = $2;")
+
+    from tests.code_generator.expected_generated_code.stream_with_bind_params import (
+        StreamUsersModel,
+        stream_users,
+    )
+
+    await asyncpg_connection_pool_to_test_db.execute(
+        "insert into users (id, name) values ($1, $2), ($3, $4)", 1, "kek", 2, "kek2"
+    )
+    async with asyncpg_connection_pool_to_test_db.acquire() as conn:
+        async with conn.transaction():
+            users = [user async for user in stream_users(conn, id=1, name="kek")]
+        assert users == [StreamUsersModel(id=1, name="kek")]
+
+    with (EXPECTED_GENERATED_CODE_DIR / "stream_with_bind_params.py").open() as file:
+        expected_generated_code = file.read()
+
+    db_row_model: dict[str, SimpleTypes] = {
+        "id": Integer(is_optional=True),
+        "name": String(is_optional=True),
+    }
+
+    actual_generated_code = await generate_code_for_query_with_stream_method(
+        query=query,
+        result_schema=NotEmptyRowSchema(db_row_model),
+        bind_params=[
+            BindParam(name_in_function="id", type_=Integer(is_optional=True)),
+            BindParam(name_in_function="name", type_=String(is_optional=True)),
+        ],
+        function_name=StringInSnakeLowerCase("stream_users"),
+        code_quality_improver=code_quality_improver,
+    )
+    assert actual_generated_code == expected_generated_code
+
+
+async def test_code_generator_fetch_columns_with_bind_params(
+    asyncpg_connection_pool_to_test_db: Pool, code_quality_improver: CodeFixer
+) -> None:
+    await asyncpg_connection_pool_to_test_db.execute(
+        "create table users (id serial not null, name text, score double precision)"
+    )
+
+    query = prettify("SELECT * FROM users where id > $1 and name <> $2;")
+
+    from tests.code_generator.expected_generated_code.fetch_columns_with_bind_params import (
+        fetch_users,
+    )
+
+    await asyncpg_connection_pool_to_test_db.execute(
+        "insert into users (id, name, score) values (1, 'kek', 1.5), (2, 'kek2', null), (3, 'kek3', 2.5)"
+    )
+    async with asyncpg_connection_pool_to_test_db.acquire() as conn:
+        columns = await fetch_users(conn, id=1, name="kek3")
+
+    expected_ids: list[int] = [2]
+    assert np.array_equal(columns.id, expected_ids)
+    assert not columns.id_is_null.any()
+    assert columns.name == ["kek2"]
+    assert columns.score_is_null.all()
+
+    with (
+        EXPECTED_GENERATED_CODE_DIR / "fetch_columns_with_bind_params.py"
+    ).open() as file:
+        expected_generated_code = file.read()
+
+    actual_generated_code = await generate_code_for_query_with_fetch_columns_method(
+        query=query,
+        result_schema=NotEmptyRowSchema(
+            {
+                "id": Integer(is_optional=True),
+                "name": String(is_optional=True),
+                "score": Float(is_optional=True),
+            }
+        ),
+        bind_params=[
+            BindParam(name_in_function="id", type_=Integer(is_optional=True)),
+            BindParam(name_in_function="name", type_=String(is_optional=True)),
+        ],
+        function_name=StringInSnakeLowerCase("fetch_users"),
+        code_quality_improver=code_quality_improver,
+    )
+    assert actual_generated_code == expected_generated_code
+
+
+async def test_code_generator_copy_out_with_bind_params(
+    asyncpg_connection_pool_to_test_db: Pool, code_quality_improver: CodeFixer
+) -> None:
+    await asyncpg_connection_pool_to_test_db.execute(
+        "create table users (id serial not null, name text)"
+    )
+
+    query = prettify("SELECT * FROM users where id > $1 and name <> $2;")
+
+    from tests.code_generator.expected_generated_code.copy_out_with_bind_params import (
+        ExportUsersModel,
+        export_users,
+        export_users_to_file,
+    )
+
+    await asyncpg_connection_pool_to_test_db.execute(
+        "insert into users (id, name) values (1, 'kek'), (2, null), (3, 'kek3')"
+    )
+    users: list[ExportUsersModel] = []
+
+    async def handle_rows(rows: Sequence[ExportUsersModel]) -> None:
+        users.extend(rows)
+
+    output = io.BytesIO()
+    async with asyncpg_connection_pool_to_test_db.acquire() as conn:
+        rows_count = await export_users(conn, id=1, name="kek", handle_rows=handle_rows)
+        assert await export_users_to_file(conn, id=1, name="kek", output=output) == 1
+
+    assert rows_count == 1
+    assert users == [ExportUsersModel(id=3, name="kek3")]
+    assert output.getvalue().startswith(b"PGCOPY")
+
+    with (EXPECTED_GENERATED_CODE_DIR / "copy_out_with_bind_params.py").open() as file:
+        expected_generated_code = file.read()
+
+    db_row_model: dict[str, SimpleTypes] = {
+        "id": Integer(is_optional=True),
+        "name": String(is_optional=True),
+    }
+
+    actual_generated_code = await generate_code_for_query_with_copy_out_method(
+        query=query,
+        result_schema=NotEmptyRowSchema(db_row_model),
+        columns_postgres_types=["int4", "text"],
+        bind_params=[
+            BindParam(name_in_function="id", type_=Integer(is_optional=True)),
+            BindParam(name_in_function="name", type_=String(is_optional=True)),
+        ],
+        function_name=StringInSnakeLowerCase("export_users"),
+        code_quality_improver=code_quality_improver,
+    )
+    assert actual_generated_code == expected_generated_code
+
+
 async def test_code_generator_pydantic_with_bind_params(
     asyncpg_connection_pool_to_test_db: Pool, code_quality_improver: CodeFixer
 ) -> None:
@@ -253,6 +453,160 @@ async def test_code_generator_execute_with_bind_params(
     assert actual_generated_code == expected_generated_code
 
 
+async def test_code_generator_execute_many(
+    asyncpg_connection_pool_to_test_db: Pool, code_quality_improver: CodeFixer
+) -> None:
+    await asyncpg_connection_pool_to_test_db.execute(
+        "create table users (id serial not null, name text)"
+    )
+
+    query = "insert into users (id, name) values ($1, $2);"
+
+    from tests.code_generator.expected_generated_code.execute_many import (
+        InsertUsersParams,
+        insert_users,
+    )
+
+    async with asyncpg_connection_pool_to_test_db.acquire() as conn:
+        await insert_users(conn, [InsertUsersParams(id=1, name="kek"), (2, None)])
+
+    records = await asyncpg_connection_pool_to_test_db.fetch(
+        "select id, name from users order by id"
+    )
+    assert [tuple(record) for record in records] == [(1, "kek"), (2, None)]
+
+    with (EXPECTED_GENERATED_CODE_DIR / "execute_many.py").open() as file:
+        expected_generated_code = file.read()
+
+    actual_generated_code = await generate_code_for_query_with_execute_many_method(
+        query=query,
+        bind_params=[
+            BindParam(name_in_function="id", type_=Integer(is_optional=True)),
+            BindParam(name_in_function="name", type_=String(is_optional=True)),
+        ],
+        function_name=StringInSnakeLowerCase("insert_users"),
+        code_quality_improver=code_quality_improver,
+    )
+    assert actual_generated_code == expected_generated_code
+
+
+async def test_code_generator_execute_many_with_copy(
+    asyncpg_connection_pool_to_test_db: Pool, code_quality_improver: CodeFixer
+) -> None:
+    await asyncpg_connection_pool_to_test_db.execute(
+        "create table users (id serial not null, name text)"
+    )
+
+    query = "insert into users (id, name) values ($1, $2);"
+
+    from tests.code_generator.expected_generated_code.execute_many_with_copy import (
+        InsertUsersParams,
+        insert_users,
+    )
+
+    async with asyncpg_connection_pool_to_test_db.acquire() as conn:
+        await insert_users(conn, [InsertUsersParams(id=1, name="kek"), (2, None)])
+
+    records = await asyncpg_connection_pool_to_test_db.fetch(
+        "select id, name from users order by id"
+    )
+    assert [tuple(record) for record in records] == [(1, "kek"), (2, None)]
+
+    with (EXPECTED_GENERATED_CODE_DIR / "execute_many_with_copy.py").open() as file:
+        expected_generated_code = file.read()
+
+    actual_generated_code = await generate_code_for_query_with_execute_many_method(
+        query=query,
+        bind_params=[
+            BindParam(name_in_function="id", type_=Integer(is_optional=True)),
+            BindParam(name_in_function="name", type_=String(is_optional=True)),
+        ],
+        function_name=StringInSnakeLowerCase("insert_users"),
+        code_quality_improver=code_quality_improver,
+        plain_insert=parse_plain_insert(query=query),
+    )
+    assert actual_generated_code == expected_generated_code
+
+
+async def test_code_generator_fetch_all_with_prepared_statements_registry(
+    asyncpg_connection_to_test_db: Connection, code_quality_improver: CodeFixer
+) -> None:
+    await asyncpg_connection_to_test_db.execute(
+        "create table users (id serial not null, name text)"
+    )
+
+    query = prettify("SELECT * FROM users where id = $1 and name = $2;")
+
+    from tests.code_generator.expected_generated_code.fetch_all_with_prepared_statements_registry import (
+        FetchAllUsersModel,
+        fetch_all_users,
+    )
+
+    await asyncpg_connection_to_test_db.execute(
+        "insert into users (id, name) values ($1, $2), ($3, $4)", 1, "kek", 2, "kek2"
+    )
+    for _ in range(2):
+        users = await fetch_all_users(asyncpg_connection_to_test_db, id=1, name="kek")
+        assert list(users) == [FetchAllUsersModel(id=1, name="kek")]
+
+    with (
+        EXPECTED_GENERATED_CODE_DIR / "fetch_all_with_prepared_statements_registry.py"
+    ).open() as file:
+        expected_generated_code = file.read()
+
+    actual_generated_code = await generate_code_for_query_with_fetch_all_method(
+        query=query,
+        result_schema=NotEmptyRowSchema(
+            {"id": Integer(is_optional=True), "name": String(is_optional=True)}
+        ),
+        bind_params=[
+            BindParam(name_in_function="id", type_=Integer(is_optional=True)),
+            BindParam(name_in_function="name", type_=String(is_optional=True)),
+        ],
+        function_name=StringInSnakeLowerCase("fetch_all_users"),
+        code_quality_improver=code_quality_improver,
+        prepared_statements="registry",
+    )
+    assert actual_generated_code == expected_generated_code
+
+
+async def test_code_generator_execute_with_unnamed_prepared_statements(
+    asyncpg_connection_pool_to_test_db: Pool, code_quality_improver: CodeFixer
+) -> None:
+    await asyncpg_connection_pool_to_test_db.execute(
+        "create table users (id serial not null, name text)"
+    )
+
+    query = "delete from users where id = $1 and name = $2;"
+
+    await asyncpg_connection_pool_to_test_db.execute(
+        "insert into users (id, name) values ($1, $2), ($3, $4)", 1, "kek", 2, "kek2"
+    )
+    from tests.code_generator.expected_generated_code.execute_with_unnamed_prepared_statements import (
+        delete_users,
+    )
+
+    async with asyncpg_connection_pool_to_test_db.acquire() as conn:
+        assert await delete_users(conn, id=1, name="kek") == "DELETE 1"
+
+    with (
+        EXPECTED_GENERATED_CODE_DIR / "execute_with_unnamed_prepared_statements.py"
+    ).open() as file:
+        expected_generated_code = file.read()
+
+    actual_generated_code = await generate_code_for_query_with_execute_method(
+        query=query,
+        bind_params=[
+            BindParam(name_in_function="id", type_=Integer(is_optional=True)),
+            BindParam(name_in_function="name", type_=String(is_optional=True)),
+        ],
+        function_name=StringInSnakeLowerCase("delete_users"),
+        code_quality_improver=code_quality_improver,
+        prepared_statements="unnamed",
+    )
+    assert actual_generated_code == expected_generated_code
+
+
 async def test_code_generator_execute_without_bind_params(
     asyncpg_connection_pool_to_test_db: Pool, code_quality_improver: CodeFixer
 ) -> None:
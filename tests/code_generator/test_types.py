@@ -16,7 +16,9 @@ from strictql_postgres.python_types import (
     InnerModelType,
     Integer,
     Json,
+    ModelBackend,
     ModelType,
+    RecordValidation,
     RecursiveListSupportedTypes,
     RecursiveListType,
     SimpleTypes,
@@ -27,7 +29,9 @@ from strictql_postgres.python_types import (
     format_simple_type,
     format_type,
     format_type_with_import,
+    generate_code_for_model,
     generate_code_for_model_as_pydantic,
+    generate_record_decoders_code,
     generate_recursive_list_definition,
 )
 
@@ -178,12 +182,12 @@ def test_format_model_as_pydantic_model() -> None:
     )
     inner_model_code = """
 
-class InnerModel(BaseModel): # type: ignore[explicit-any]
+class InnerModel(BaseModel):  # type: ignore[explicit-any]
     field: str | None
     with_import: date | None
     recursive_list: list[bool | None | list[bool | None | list[bool | None | object]]] | None"""
     test_model_code = """
-class TestModel(BaseModel): # type: ignore[explicit-any]
+class TestModel(BaseModel):  # type: ignore[explicit-any]
     text_field: str | None
     with_import: time | None
     recursive_list: list[int | None | list[int | None | list[int | None | object]]] | None
@@ -206,6 +210,114 @@ class TestModel(BaseModel): # type: ignore[explicit-any]
     )
 
 
+@pytest.mark.parametrize(
+    ("validation", "model_backend"),
+    [
+        ("validated", "pydantic"),
+        ("trusted", "pydantic"),
+        ("validated", "dataclass"),
+        ("validated", "namedtuple"),
+    ],
+)
+def test_generate_record_decoders_code(
+    validation: RecordValidation, model_backend: ModelBackend
+) -> None:
+    inner_model_type = ModelType(
+        name="InnerModel",
+        fields={"field": String(is_optional=True)},
+    )
+    model_type = ModelType(
+        name="TestModel",
+        fields={
+            "text_field": String(is_optional=True),
+            "recursive_list": RecursiveListType(
+                generic_type=Integer(is_optional=True),
+                is_optional=True,
+            ),
+            "inner_optional": InnerModelType(
+                model_type=inner_model_type,
+                is_optional=True,
+            ),
+            "inner": InnerModelType(
+                model_type=inner_model_type,
+                is_optional=False,
+            ),
+        },
+    )
+    generated_models = generate_code_for_model(
+        model_type=model_type, model_backend=model_backend
+    )
+    record_decoders = generate_record_decoders_code(
+        model_type=model_type, validation=validation, model_backend=model_backend
+    )
+
+    assert record_decoders.imports == {"from typing import cast"}
+    assert len(record_decoders.decoders_code) == 2
+
+    # records are indexed by positions of columns, so tuples can be used instead of them
+    namespace: dict[str, object] = {"Record": tuple}
+    code = "\n\n".join(
+        [
+            # TypeAliasType is not available in python 3.11, it is removed by ruff from generated code
+            *sorted(
+                import_
+                for import_ in generated_models.imports
+                if "TypeAliasType" not in import_
+            ),
+            *record_decoders.imports,
+            *sorted(generated_models.models_code),
+            *record_decoders.decoders_code,
+        ]
+    )
+    exec(code, namespace)
+    decode_test_model = namespace["decode_test_model"]
+    assert callable(decode_test_model)
+
+    model = decode_test_model(("text", [1, [2, None]], None, ("inner",)))  # type: ignore[misc]
+
+    assert model == namespace["TestModel"](  # type: ignore[misc,operator]
+        text_field="text",
+        recursive_list=[1, [2, None]],
+        inner_optional=None,
+        inner=namespace["InnerModel"](field="inner"),  # type: ignore[misc,operator]
+    )
+
+
+@pytest.mark.parametrize(
+    ("model_backend", "expected_import", "expected_model_code"),
+    [
+        (
+            "dataclass",
+            "from dataclasses import dataclass",
+            "@dataclass(frozen=True, slots=True)\nclass TestModel:\n    field: int | None",
+        ),
+        (
+            "namedtuple",
+            "from typing import NamedTuple",
+            "class TestModel(NamedTuple):\n    field: int | None",
+        ),
+        (
+            "msgspec",
+            "from msgspec import Struct",
+            "class TestModel(Struct, frozen=True):\n    field: int | None",
+        ),
+    ],
+)
+def test_generate_code_for_model_with_model_backend(
+    model_backend: ModelBackend, expected_import: str, expected_model_code: str
+) -> None:
+    assert generate_code_for_model(
+        model_type=ModelType(
+            name="TestModel", fields={"field": Integer(is_optional=True)}
+        ),
+        model_backend=model_backend,
+    ) == GeneratedCodeWithModelDefinitions(
+        imports={expected_import},
+        main_model_name="TestModel",
+        models_code={expected_model_code},
+    )
+
+
 RECURSIVE_LIST_TYPE_IMPORTS = {
     "from typing import Union",
     "from typing import TypeAliasType",
@@ -292,3 +404,27 @@ def test_generate_code_for_recursive_list(
     )
 
     assert actual == expected_type
+
+
+@pytest.mark.parametrize(
+    ("dimensions", "is_optional", "expected_type"),
+    [
+        (1, False, "list[int | None]"),
+        (1, True, "list[int | None] | None"),
+        (3, False, "list[list[list[int | None]]]"),
+    ],
+)
+def test_generate_code_for_list_with_known_dimensions(
+    dimensions: int, is_optional: bool, expected_type: str
+) -> None:
+    actual = generate_recursive_list_definition(
+        t=RecursiveListType(
+            generic_type=Integer(is_optional=True),
+            is_optional=is_optional,
+            dimensions=dimensions,
+        )
+    )
+
+    assert actual == FormattedType(
+        imports=set(), models_code=set(), type_=expected_type
+    )
@@ -8,15 +8,25 @@ import pytest
 
 import asyncpg
 from strictql_postgres.code_quality import CodeFixer
+from strictql_postgres.common_types import QueryIntrospection
 from strictql_postgres.pg_response_schema_getter import (
     PgResponseSchemaGetterError,
     PgResponseSchemaTypeNotSupported,
 )
+from strictql_postgres.python_types import (
+    Float,
+    InnerModelType,
+    Integer,
+    ModelType,
+    RecursiveListType,
+    String,
+)
 from strictql_postgres.queries_to_generate import Parameter
 from strictql_postgres.query_generator import (
     QueryPythonCodeGeneratorError,
     QueryToGenerateInfo,
     generate_query_python_code,
+    render_query_python_code_from_introspection,
 )
 from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
 
@@ -180,3 +190,207 @@ async def test_generate_code_with_params_when_some_params_not_optional(
         "timeout": datetime.timedelta | None,
         "return": Sequence[generated_module.FetchAllTestModel],  # type: ignore [name-defined]
     }
+
+
+def test_render_code_with_array_dimensions() -> None:
+    introspection = QueryIntrospection(
+        response_schema={
+            "id": Integer(is_optional=True),
+            "tags": RecursiveListType(
+                generic_type=String(is_optional=True), is_optional=True
+            ),
+        },
+        bind_params_types=[
+            RecursiveListType(generic_type=Integer(is_optional=True), is_optional=True)
+        ],
+    )
+
+    code = render_query_python_code_from_introspection(
+        query_to_generate=QueryToGenerateInfo(
+            query="select id, tags from users where id = any($1)",
+            function_name=StringInSnakeLowerCase("fetch_users"),
+            params={"ids": Parameter(is_optional=False, array_dimensions=1)},
+            query_type="fetch",
+            array_dimensions={"tags": 2},
+        ),
+        introspection=introspection,
+    )
+
+    assert "tags: list[list[str | None]] | None" in code
+    assert "ids: list[int | None]," in code
+
+
+@pytest.mark.parametrize(
+    ("array_dimensions", "expected_error"),
+    [
+        (
+            {"id": 1},
+            "Array dimensions are set for `column: id`, which is not an array",
+        ),
+        (
+            {"name": 1},
+            "Array dimensions are set for columns not found in the query result: `['name']`",
+        ),
+    ],
+)
+def test_render_code_with_invalid_array_dimensions(
+    array_dimensions: dict[str, int], expected_error: str
+) -> None:
+    with pytest.raises(QueryPythonCodeGeneratorError) as error:
+        render_query_python_code_from_introspection(
+            query_to_generate=QueryToGenerateInfo(
+                query="select id from users",
+                function_name=StringInSnakeLowerCase("fetch_users"),
+                params={},
+                query_type="fetch",
+                array_dimensions=array_dimensions,
+            ),
+            introspection=QueryIntrospection(
+                response_schema={"id": Integer(is_optional=True)},
+                bind_params_types=[],
+            ),
+        )
+
+    assert error.value.error == expected_error
+
+
+@pytest.mark.parametrize(
+    ("infer_nullability", "expected_field"),
+    [(True, "id: int\n"), (False, "id: int | None\n")],
+)
+def test_render_code_with_inferred_nullability(
+    infer_nullability: bool, expected_field: str
+) -> None:
+    code = render_query_python_code_from_introspection(
+        query_to_generate=QueryToGenerateInfo(
+            query="select id from users",
+            function_name=StringInSnakeLowerCase("fetch_users"),
+            params={},
+            query_type="fetch",
+            infer_nullability=infer_nullability,
+        ),
+        introspection=QueryIntrospection(
+            response_schema={"id": Integer(is_optional=True)},
+            bind_params_types=[],
+            not_null_columns=frozenset({"id"}),
+        ),
+    )
+
+    assert expected_field in code
+
+
+def test_render_code_with_fetch_columns() -> None:
+    code = render_query_python_code_from_introspection(
+        query_to_generate=QueryToGenerateInfo(
+            query="select id, score, name from users",
+            function_name=StringInSnakeLowerCase("fetch_users"),
+            params={},
+            query_type="fetch_columns",
+        ),
+        introspection=QueryIntrospection(
+            response_schema={
+                "id": Integer(is_optional=False),
+                "score": Float(is_optional=True),
+                "name": String(is_optional=True),
+            },
+            bind_params_types=[],
+        ),
+    )
+
+    assert "id: NDArray[np.int64]\n" in code
+    assert "id_is_null" not in code
+    assert "score: NDArray[np.float64]\n    score_is_null: NDArray[np.bool_]\n" in code
+    assert "name: list[str | None]\n" in code
+
+
+@pytest.mark.parametrize(
+    ("response_schema", "expected_error"),
+    [
+        (
+            {
+                "id": Integer(is_optional=True),
+                "user": InnerModelType(
+                    model_type=ModelType(
+                        name="User", fields={"id": Integer(is_optional=True)}
+                    ),
+                    is_optional=True,
+                ),
+            },
+            "Query with `fetch_columns` type can not return columns of composite types: `['user']`",
+        ),
+        (
+            {"id": Integer(is_optional=True), "id_is_null": String(is_optional=True)},
+            "Query with `fetch_columns` type has columns with names of null masks of other columns: `['id_is_null']`",
+        ),
+    ],
+)
+def test_render_code_with_invalid_fetch_columns(
+    response_schema: dict[str, Integer | String | InnerModelType],
+    expected_error: str,
+) -> None:
+    with pytest.raises(QueryPythonCodeGeneratorError) as error:
+        render_query_python_code_from_introspection(
+            query_to_generate=QueryToGenerateInfo(
+                query="select * from users",
+                function_name=StringInSnakeLowerCase("fetch_users"),
+                params={},
+                query_type="fetch_columns",
+            ),
+            introspection=QueryIntrospection(
+                response_schema=response_schema, bind_params_types=[]
+            ),
+        )
+
+    assert error.value.error == expected_error
+
+
+def test_render_code_with_copy_out() -> None:
+    code = render_query_python_code_from_introspection(
+        query_to_generate=QueryToGenerateInfo(
+            query="select id, name from users",
+            function_name=StringInSnakeLowerCase("export_users"),
+            params={},
+            query_type="copy_out",
+        ),
+        introspection=QueryIntrospection(
+            response_schema={
+                "id": Integer(is_optional=True),
+                "name": String(is_optional=True),
+            },
+            bind_params_types=[],
+            columns_postgres_types={"id": "int8", "name": "varchar"},
+        ),
+    )
+
+    assert "_COLUMNS_POSTGRES_TYPES = ('int8', 'varchar')\n" in code
+    assert "async def export_users_to_file(" in code
+
+
+def test_render_code_with_copy_out_of_unsupported_types() -> None:
+    with pytest.raises(QueryPythonCodeGeneratorError) as error:
+        render_query_python_code_from_introspection(
+            query_to_generate=QueryToGenerateInfo(
+                query="select id, location from users",
+                function_name=StringInSnakeLowerCase("export_users"),
+                params={},
+                query_type="copy_out",
+            ),
+            introspection=QueryIntrospection(
+                response_schema={
+                    "id": Integer(is_optional=True),
+                    "location": InnerModelType(
+                        model_type=ModelType(
+                            name="Location", fields={"x": Float(is_optional=True)}
+                        ),
+                        is_optional=True,
+                    ),
+                },
+                bind_params_types=[],
+                columns_postgres_types={"id": "int4", "location": "location"},
+            ),
+        )
+
+    assert (
+        error.value.error
+        == "Query with `copy_out` type has columns of types not supported by the binary copy decoder: `['location']`"
+    )
@@ -0,0 +1,111 @@
+import datetime
+import decimal
+import struct
+
+import pytest
+
+from strictql_postgres.binary_copy import BinaryCopyDecodeError, BinaryCopyDecoder
+
+HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+TRAILER = struct.pack(">h", -1)
+
+
+def encode_row(*values: bytes | None) -> bytes:
+    row = struct.pack(">h", len(values))
+    for value in values:
+        if value is None:
+            row += struct.pack(">i", -1)
+        else:
+            row += struct.pack(">i", len(value)) + value
+    return row
+
+
+ROWS = [
+    encode_row(
+        struct.pack(">i", 1),
+        "name".encode(),
+        struct.pack(">d", 1.5),
+        # 12345.670
+        struct.pack(">hhHHhhh", 3, 1, 0, 3, 1, 2345, 6700),
+        struct.pack(">q", 86_400_000_001),
+        # array of 2 x 2 elements with a null
+        struct.pack(">iiiiiii", 2, 1, 23, 2, 1, 2, 1)
+        + struct.pack(">ii", 4, 1)
+        + struct.pack(">i", -1)
+        + struct.pack(">ii", 4, 3)
+        + struct.pack(">ii", 4, 4),
+    ),
+    encode_row(
+        struct.pack(">i", -2),
+        None,
+        None,
+        # -0.05
+        struct.pack(">hhHHh", 1, -1, 0x4000, 2, 500),
+        None,
+        struct.pack(">iii", 0, 0, 23),
+    ),
+]
+
+COLUMNS_TYPES = ["int4", "text", "float8", "numeric", "timestamptz", "int4[]"]
+
+EXPECTED_ROWS = [
+    (
+        1,
+        "name",
+        1.5,
+        decimal.Decimal("12345.670"),
+        datetime.datetime(2000, 1, 2, 0, 0, 0, 1, tzinfo=datetime.UTC),
+        [[1, None], [3, 4]],
+    ),
+    (-2, None, None, decimal.Decimal("-0.05"), None, []),
+]
+
+
+def test_binary_copy_decoder() -> None:
+    decoder = BinaryCopyDecoder(columns_types=COLUMNS_TYPES)
+
+    rows = decoder.feed(HEADER + b"".join(ROWS) + TRAILER)
+    decoder.finish()
+
+    assert rows == EXPECTED_ROWS
+
+
+def test_binary_copy_decoder_with_rows_split_by_chunks() -> None:
+    decoder = BinaryCopyDecoder(columns_types=COLUMNS_TYPES)
+    data = HEADER + b"".join(ROWS) + TRAILER
+
+    rows = []
+    for index in range(len(data)):
+        rows.extend(decoder.feed(data[index : index + 1]))
+    decoder.finish()
+
+    assert rows == EXPECTED_ROWS
+
+
+@pytest.mark.parametrize(
+    ("data", "expected_error"),
+    [
+        (HEADER + ROWS[0], "Copy output ended in the middle"),
+        (HEADER + TRAILER + ROWS[0], "Data after the end of the copy output"),
+        (b"id,name\n" * 3, "Copy output is not in the binary format"),
+        (HEADER + encode_row(None), "Row has `1` columns, expected `6`"),
+    ],
+)
+def test_binary_copy_decoder_invalid_data(data: bytes, expected_error: str) -> None:
+    decoder = BinaryCopyDecoder(columns_types=COLUMNS_TYPES)
+
+    with pytest.raises(BinaryCopyDecodeError) as error:
+        decoder.feed(data)
+        decoder.finish()
+
+    assert error.value.error == expected_error
+
+
+def test_binary_copy_decoder_unsupported_type() -> None:
+    with pytest.raises(BinaryCopyDecodeError) as error:
+        BinaryCopyDecoder(columns_types=["int4", "point"])
+
+    assert (
+        error.value.error
+        == "Postgres type `point` is not supported by the binary copy decoder"
+    )
@@ -0,0 +1,124 @@
+import pathlib
+import time
+
+import pytest
+
+from strictql_postgres.code_layout import (
+    format_code_layout,
+    sort_imports,
+    sort_models,
+)
+from tests.conftest import PROJECT_ROOT
+
+EXPECTED_GENERATED_CODE_DIR = (
+    PROJECT_ROOT / "tests" / "code_generator" / "expected_generated_code"
+)
+
+
+def test_sort_imports_merges_imports_by_module_and_sorts_sections() -> None:
+    assert sort_imports(
+        [
+            "from pydantic import BaseModel",
+            "from typing import cast",
+            "from asyncpg import Record",
+            "from typing import TypeAliasType",
+            "from asyncpg import Connection",
+            "from collections.abc import Sequence",
+            "from typing import Union",
+        ]
+    ) == [
+        "from collections.abc import Sequence",
+        "from typing import TypeAliasType, Union, cast",
+        "",
+        "from asyncpg import Connection, Record",
+        "from pydantic import BaseModel",
+    ]
+
+
+def test_sort_models_places_inner_models_before_models_referring_to_them() -> None:
+    outer_model = "class Outer(BaseModel):\n    inner: Inner | None"
+    inner_model = "class Inner(BaseModel):\n    a: str"
+    other_model = "class Another(BaseModel):\n    a: str"
+
+    assert sort_models({outer_model, inner_model, other_model}) == [
+        other_model,
+        inner_model,
+        outer_model,
+    ]
+
+
+def test_sort_models_sorts_thousands_of_models_fast() -> None:
+    models_count = 3000
+    models = [
+        f"class Model{index}(BaseModel):\n    a: str\n    inner: Model{index // 2} | None"
+        for index in range(1, models_count + 1)
+    ]
+
+    started_at = time.perf_counter()
+    sorted_models = sort_models(models)
+    duration = time.perf_counter() - started_at
+
+    assert duration < 2
+    positions = {model: position for position, model in enumerate(sorted_models)}
+    for index in range(2, models_count + 1):
+        assert positions[models[index // 2 - 1]] < positions[models[index - 1]]
+
+
+def test_format_code_layout_places_blank_lines() -> None:
+    code = """from typing import cast
+from asyncpg import Record
+_registry = object()
+@decorator
+class Model:
+    a: int
+
+
+    b: int
+def decode(record: Record) -> Model:
+    query = \"\"\"
+    SELECT *
+
+FROM users
+\"\"\"
+    return cast(Model, record)
+
+
+"""
+
+    assert (
+        format_code_layout(code=code)
+        == """from typing import cast
+from asyncpg import Record
+
+_registry = object()
+
+
+@decorator
+class Model:
+    a: int
+
+    b: int
+
+
+def decode(record: Record) -> Model:
+    query = \"\"\"
+    SELECT *
+
+FROM users
+\"\"\"
+    return cast(Model, record)
+"""
+    )
+
+
+@pytest.mark.parametrize(
+    "expected_file_path",
+    sorted(EXPECTED_GENERATED_CODE_DIR.glob("*.py")),
+    ids=str,
+)
+def test_format_code_layout_does_not_change_code_formatted_by_ruff(
+    expected_file_path: pathlib.Path,
+) -> None:
+    code = expected_file_path.read_text()
+
+    assert format_code_layout(code=code) == code
@@ -5,8 +5,12 @@ import tempfile
 import pytest
 
 from strictql_postgres.code_quality import (
+    MIN_FILES_PER_RUFF_RUN,
+    RUFF_MODULE_COMMAND,
+    CodeFixer,
     MypyCodeQualityError,
     MypyRunner,
+    find_ruff_command,
     run_ruff_format,
     run_ruff_lint_with_fix,
 )
@@ -31,6 +35,54 @@ async def test_ruff_format() -> None:
     assert fixed_code == "a = 1\n"
 
 
+async def test_ruff_binary_formats_same_as_ruff_module() -> None:
+    code = "import sys\nimport asyncio\nprint(f'123', sys, asyncio)"
+
+    assert find_ruff_command() != RUFF_MODULE_COMMAND
+    assert await CodeFixer(ruff_command=find_ruff_command()).try_to_improve_code(
+        code=code
+    ) == await CodeFixer(ruff_command=RUFF_MODULE_COMMAND).try_to_improve_code(
+        code=code
+    )
+
+
+async def test_code_fixer_improves_files_same_as_single_code() -> None:
+    code_fixer = CodeFixer()
+    files = {
+        pathlib.Path("file.py"): "a=1",
+        pathlib.Path("build/file.py"): 'f"123"',
+        pathlib.Path(
+            "dir/file.py"
+        ): "import sys\nimport asyncio\n\nprint(sys, asyncio)",
+        pathlib.Path("empty.py"): "",
+    }
+
+    improved_files = await code_fixer.try_to_improve_files(files=files)
+
+    assert improved_files == {
+        path: await code_fixer.try_to_improve_code(code=code)
+        for path, code in files.items()
+    }
+
+
+async def test_code_fixer_improves_files_in_multiple_batches() -> None:
+    code_fixer = CodeFixer(concurrency=3)
+    files = {
+        pathlib.Path(f"file_{index}.py"): f"a={index}"
+        for index in range(3 * MIN_FILES_PER_RUFF_RUN)
+    }
+
+    improved_files = await code_fixer.try_to_improve_files(files=files)
+
+    assert list(improved_files.items()) == [
+        (path, f"a = {index}\n") for index, path in enumerate(files)
+    ]
+
+
+async def test_code_fixer_improves_no_files() -> None:
+    assert await CodeFixer().try_to_improve_files(files={}) == {}
+
+
 def test_project_root_is_actual() -> None:
     directories_at_project_root = [
         directory.name for directory in PROJECT_ROOT.iterdir()
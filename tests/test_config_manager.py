@@ -20,6 +20,9 @@ from strictql_postgres.queries_to_generate import (
     Parameter,
     QueryToGenerate,
     StrictQLQueriesToGenerate,
+    get_default_formatter_concurrency,
+    get_default_introspection_concurrency,
+    get_default_render_concurrency,
 )
 from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
 
@@ -285,6 +288,157 @@ def test_get_queries_to_generate_raises_error_if_database_connection_url_env_not
     )
 
 
+def test_get_queries_to_generate_without_required_connection_urls() -> None:
+    queries_to_generate = get_strictql_queries_to_generate(
+        parsed_queries_to_generate_by_query_file_path={
+            pathlib.Path("query_file"): {
+                "select_all": ParsedQueryToGenerate(
+                    query="select * from table",
+                    database="db1",
+                    query_type="fetch",
+                    relative_path="kek",
+                ),
+            }
+        },
+        code_generated_dir="generated_code",
+        parsed_databases={
+            "db1": ParsedDatabase(env_name_to_read_connection_url="DB1"),
+        },
+        environment_variables={},
+        require_connection_urls=False,
+    )
+
+    assert list(queries_to_generate.queries_to_generate) == [
+        pathlib.Path("generated_code/kek").resolve()
+    ]
+
+
+def test_get_queries_to_generate_with_validation() -> None:
+    queries_to_generate = get_strictql_queries_to_generate(
+        parsed_queries_to_generate_by_query_file_path={
+            pathlib.Path("query_file"): {
+                "trusted_by_default": ParsedQueryToGenerate(
+                    query="select * from table",
+                    database="db1",
+                    query_type="fetch",
+                    relative_path="trusted_by_default.py",
+                ),
+                "validated": ParsedQueryToGenerate(
+                    query="select * from table",
+                    database="db1",
+                    query_type="fetch",
+                    relative_path="validated.py",
+                    validation="validated",
+                ),
+            }
+        },
+        code_generated_dir="generated_code",
+        parsed_databases={
+            "db1": ParsedDatabase(env_name_to_read_connection_url="DB1"),
+        },
+        environment_variables={"DB1": "connect_to_postgres1"},
+        validation="trusted",
+    )
+
+    assert {
+        file_path.name: query_to_generate.validation
+        for file_path, query_to_generate in queries_to_generate.queries_to_generate.items()
+    } == {"trusted_by_default.py": "trusted", "validated.py": "validated"}
+
+
+def test_get_queries_to_generate_raises_error_if_use_copy_set_not_for_execute_many() -> (
+    None
+):
+    with pytest.raises(GetStrictQLQueriesToGenerateError) as error:
+        get_strictql_queries_to_generate(
+            parsed_queries_to_generate_by_query_file_path={
+                pathlib.Path("query_file"): {
+                    "insert_user": ParsedQueryToGenerate(
+                        query="insert into users (id) values ($1)",
+                        parameter_names={
+                            "id": ParsedParameter(is_optional=False),
+                        },
+                        database="db1",
+                        query_type="execute",
+                        relative_path="kek",
+                        use_copy=True,
+                    ),
+                }
+            },
+            code_generated_dir="generated_code",
+            parsed_databases={
+                "db1": ParsedDatabase(env_name_to_read_connection_url="DB1"),
+            },
+            environment_variables={
+                "DB1": "connect_to_postgres1",
+            },
+        )
+    assert (
+        error.value.error
+        == "`use_copy` is supported only by queries with `execute_many` type, query: `query_file::insert_user`"
+    )
+
+
+def test_get_queries_to_generate_raises_error_if_query_path_is_shared_models_module() -> (
+    None
+):
+    with pytest.raises(GetStrictQLQueriesToGenerateError) as error:
+        get_strictql_queries_to_generate(
+            parsed_queries_to_generate_by_query_file_path={
+                pathlib.Path("query_file"): {
+                    "fetch_users": ParsedQueryToGenerate(
+                        query="select id from users",
+                        database="db1",
+                        query_type="fetch",
+                        relative_path="_shared_models.py",
+                    ),
+                }
+            },
+            code_generated_dir="generated_code",
+            parsed_databases={
+                "db1": ParsedDatabase(env_name_to_read_connection_url="DB1"),
+            },
+            environment_variables={
+                "DB1": "connect_to_postgres1",
+            },
+            shared_models=True,
+        )
+    assert (
+        error.value.error
+        == "Path `_shared_models.py` of a query: `query_file::fetch_users` is reserved for the shared models module"
+    )
+
+
+def test_get_queries_to_generate_raises_error_if_query_path_is_package_init_module() -> (
+    None
+):
+    with pytest.raises(GetStrictQLQueriesToGenerateError) as error:
+        get_strictql_queries_to_generate(
+            parsed_queries_to_generate_by_query_file_path={
+                pathlib.Path("query_file"): {
+                    "fetch_users": ParsedQueryToGenerate(
+                        query="select id from users",
+                        database="db1",
+                        query_type="fetch",
+                        relative_path="users/__init__.py",
+                    ),
+                }
+            },
+            code_generated_dir="generated_code",
+            parsed_databases={
+                "db1": ParsedDatabase(env_name_to_read_connection_url="DB1"),
+            },
+            environment_variables={
+                "DB1": "connect_to_postgres1",
+            },
+            lazy_imports=True,
+        )
+    assert (
+        error.value.error
+        == "Path `users/__init__.py` of a query: `query_file::fetch_users` is reserved for the package init module"
+    )
+
+
 def test_parse_toml_as_model_works() -> None:
     with tempfile.NamedTemporaryFile(mode="r+") as file:
 
@@ -410,3 +564,37 @@ def test_get_quiries_to_generate_raises_error_if_query_name_not_lower_snake_case
         error.value.error
         == f"Query name not in lower case snake string, query identifier: `{query_file_path.resolve()}::selectAll`"
     )
+
+
+def test_get_queries_to_generate_uses_concurrency_settings() -> None:
+    queries_to_generate = get_strictql_queries_to_generate(
+        parsed_queries_to_generate_by_query_file_path={},
+        code_generated_dir="generated_code",
+        parsed_databases={},
+        environment_variables={},
+        introspection_concurrency=3,
+        formatter_concurrency=2,
+        render_concurrency=5,
+    )
+
+    assert queries_to_generate.introspection_concurrency == 3
+    assert queries_to_generate.formatter_concurrency == 2
+    assert queries_to_generate.render_concurrency == 5
+
+
+def test_get_queries_to_generate_uses_default_concurrency_settings() -> None:
+    queries_to_generate = get_strictql_queries_to_generate(
+        parsed_queries_to_generate_by_query_file_path={},
+        code_generated_dir="generated_code",
+        parsed_databases={},
+        environment_variables={},
+    )
+
+    assert (
+        queries_to_generate.introspection_concurrency
+        == get_default_introspection_concurrency()
+    )
+    assert (
+        queries_to_generate.formatter_concurrency == get_default_formatter_concurrency()
+    )
+    assert queries_to_generate.render_concurrency == get_default_render_concurrency()
@@ -0,0 +1,265 @@
+import pathlib
+import tempfile
+
+import pytest
+from pydantic import SecretStr
+
+from strictql_postgres.__main__ import check, generate
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.fast_check import (
+    FastCheckError,
+    FastCheckResult,
+    check_generated_code_inputs,
+)
+from strictql_postgres.generated_code_writer import write_generated_code
+from strictql_postgres.generation_inputs import create_query_hash
+from strictql_postgres.meta_file import (
+    STRICTQL_META_FILE_NAME,
+    GeneratedFileInputsHashes,
+)
+from strictql_postgres.python_types import CodeFormat, Integer, String
+from strictql_postgres.queries_to_generate import (
+    DataBaseSettings,
+    QueryToGenerate,
+    StrictQLQueriesToGenerate,
+)
+from strictql_postgres.schema_snapshot import SchemaSnapshot
+from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
+
+
+def _create_query_to_generate(query: str) -> QueryToGenerate:
+    return QueryToGenerate(
+        query=query,
+        parameters={},
+        database_name="db",
+        database_connection_url=SecretStr(""),
+        query_type="fetch",
+        function_name=StringInSnakeLowerCase("query"),
+    )
+
+
+def _create_queries_to_generate(
+    generated_code_path: pathlib.Path,
+    queries_to_generate: dict[pathlib.Path, QueryToGenerate],
+    code_format: CodeFormat = "ruff",
+) -> StrictQLQueriesToGenerate:
+    return StrictQLQueriesToGenerate(
+        queries_to_generate=queries_to_generate,
+        databases={"db": DataBaseSettings(connection_url=SecretStr(""))},
+        generated_code_path=generated_code_path,
+        code_format=code_format,
+    )
+
+
+def _write_generated_code(
+    generated_code_path: pathlib.Path,
+    queries_to_generate: dict[pathlib.Path, QueryToGenerate],
+) -> None:
+    write_generated_code(
+        target_directory=generated_code_path,
+        files={file_path: "code" for file_path in queries_to_generate},
+        meta_file_name=STRICTQL_META_FILE_NAME,
+        files_inputs_hashes={
+            file_path: GeneratedFileInputsHashes(
+                query_hash=create_query_hash(query_to_generate=query_to_generate),
+                introspection_hash="",
+            )
+            for file_path, query_to_generate in queries_to_generate.items()
+        },
+    )
+
+
+def test_fast_check_works() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generated_code_path = pathlib.Path(tmpdir).resolve() / "generated_code"
+        unchanged_file = generated_code_path / "unchanged.py"
+        changed_file = generated_code_path / "subdir" / "changed.py"
+        removed_file = generated_code_path / "removed.py"
+        new_file = generated_code_path / "new.py"
+        _write_generated_code(
+            generated_code_path=generated_code_path,
+            queries_to_generate={
+                unchanged_file: _create_query_to_generate("select 1"),
+                changed_file: _create_query_to_generate("select 2"),
+                removed_file: _create_query_to_generate("select 3"),
+            },
+        )
+
+        assert check_generated_code_inputs(
+            queries_to_generate=_create_queries_to_generate(
+                generated_code_path=generated_code_path,
+                queries_to_generate={
+                    unchanged_file: _create_query_to_generate("select 1"),
+                    changed_file: _create_query_to_generate("select 22"),
+                    new_file: _create_query_to_generate("select 4"),
+                },
+            ),
+            meta_file_name=STRICTQL_META_FILE_NAME,
+        ) == FastCheckResult(
+            missed_files={new_file},
+            extra_files={removed_file},
+            stale_files={changed_file},
+        )
+
+
+def test_fast_check_raises_error_when_code_changed_manually() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generated_code_path = pathlib.Path(tmpdir).resolve() / "generated_code"
+        file_path = generated_code_path / "file.py"
+        queries_to_generate = {file_path: _create_query_to_generate("select 1")}
+        _write_generated_code(
+            generated_code_path=generated_code_path,
+            queries_to_generate=queries_to_generate,
+        )
+        file_path.write_text("changed manually")
+
+        with pytest.raises(FastCheckError) as error:
+            check_generated_code_inputs(
+                queries_to_generate=_create_queries_to_generate(
+                    generated_code_path=generated_code_path,
+                    queries_to_generate=queries_to_generate,
+                ),
+                meta_file_name=STRICTQL_META_FILE_NAME,
+            )
+
+        assert (
+            error.value.error
+            == "Current meta file content not equals to expected content, looks like code was changed manually"
+        )
+
+
+def test_fast_check_finds_stale_files_when_code_format_changed() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generated_code_path = pathlib.Path(tmpdir).resolve() / "generated_code"
+        file_path = generated_code_path / "file.py"
+        queries_to_generate = {file_path: _create_query_to_generate("select 1")}
+        _write_generated_code(
+            generated_code_path=generated_code_path,
+            queries_to_generate=queries_to_generate,
+        )
+
+        assert check_generated_code_inputs(
+            queries_to_generate=_create_queries_to_generate(
+                generated_code_path=generated_code_path,
+                queries_to_generate=queries_to_generate,
+                code_format="none",
+            ),
+            meta_file_name=STRICTQL_META_FILE_NAME,
+        ) == FastCheckResult(
+            missed_files=set(),
+            extra_files=set(),
+            stale_files={file_path},
+        )
+
+
+def test_fast_check_finds_stale_files_when_ruff_settings_changed(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    generated_code_path = tmp_path / "generated_code"
+    file_path = generated_code_path / "file.py"
+    queries_to_generate = {file_path: _create_query_to_generate("select 1")}
+    project_path = tmp_path / "project"
+    changed_project_path = tmp_path / "changed_project"
+    for path, line_length in [(project_path, 88), (changed_project_path, 120)]:
+        path.mkdir()
+        (path / "pyproject.toml").write_text(
+            f"[tool.ruff]\nline-length = {line_length}\n"
+        )
+    monkeypatch.chdir(project_path)
+    _write_generated_code(
+        generated_code_path=generated_code_path,
+        queries_to_generate=queries_to_generate,
+    )
+    monkeypatch.chdir(changed_project_path)
+
+    assert check_generated_code_inputs(
+        queries_to_generate=_create_queries_to_generate(
+            generated_code_path=generated_code_path,
+            queries_to_generate=queries_to_generate,
+        ),
+        meta_file_name=STRICTQL_META_FILE_NAME,
+    ) == FastCheckResult(
+        missed_files=set(),
+        extra_files=set(),
+        stale_files={file_path},
+    )
+
+
+def _create_project(project_path: pathlib.Path, settings: str, queries: str) -> None:
+    (project_path / "pyproject.toml").write_text(
+        f"""
+[tool.strictql_postgres]
+code_generate_dir = "generated_code"
+query_files_path = ["strictql.toml"]
+{settings}
+[tool.strictql_postgres.databases]
+db = {{ env_name_to_read_connection_url = "DB_URL" }}
+"""
+    )
+    (project_path / "strictql.toml").write_text(queries)
+    SchemaSnapshot.create(
+        introspections={
+            "db": {
+                "select id, name from users": QueryIntrospection(
+                    response_schema={
+                        "id": Integer(is_optional=True),
+                        "name": String(is_optional=True),
+                    },
+                    bind_params_types=[],
+                ),
+                "select id from admins": QueryIntrospection(
+                    response_schema={"id": Integer(is_optional=True)},
+                    bind_params_types=[],
+                ),
+            }
+        }
+    ).save(path=project_path / "strictql_snapshot.json")
+
+
+QUERIES = """
+[queries.fetch_users]
+query = "select id, name from users"
+database = "db"
+query_type = "fetch"
+relative_path = "users/fetch_users.py"
+
+[queries.fetch_admins]
+query = "select id from admins"
+database = "db"
+query_type = "fetch"
+relative_path = "users/fetch_admins.py"
+"""
+
+
+async def test_check_fast_with_shared_models_and_changed_query(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _create_project(
+        project_path=tmp_path, settings="shared_models = true", queries=QUERIES
+    )
+    monkeypatch.chdir(tmp_path)
+    await generate(offline=True)
+
+    # the query changes, but the generated code stays the same
+    (tmp_path / "strictql.toml").write_text(
+        QUERIES.replace("select id, name from users", "select id,  name from users")
+    )
+
+    await check(fast=True, offline=True)
+
+
+async def test_check_fast_with_lazy_imports_and_changed_query(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _create_project(
+        project_path=tmp_path, settings="lazy_imports = true", queries=QUERIES
+    )
+    monkeypatch.chdir(tmp_path)
+    await generate(offline=True)
+
+    # the query changes, but the generated code stays the same
+    (tmp_path / "strictql.toml").write_text(
+        QUERIES.replace("select id, name from users", "select id,  name from users")
+    )
+
+    await check(fast=True, offline=True)
@@ -1,3 +1,4 @@
+import os
 import pathlib
 import tempfile
 
@@ -5,12 +6,16 @@ import pytest
 
 from strictql_postgres.generated_code_writer import (
     GeneratedCodeWriterError,
+    GeneratedFile,
+    read_generated_code,
     write_generated_code,
 )
 from strictql_postgres.meta_file import (
     FILE_EXTENSIONS_TO_EXCLUDE,
     STRICTQL_META_FILE_NAME,
+    GeneratedFileInputsHashes,
     generate_meta_file,
+    parse_meta_file_content,
 )
 
 
@@ -38,7 +43,9 @@ def test_write_generated_code_works_when_directory_does_not_exist() -> None:
 
         meta_file = generated_code_directory / STRICTQL_META_FILE_NAME
         assert meta_file.exists()
-        assert meta_file.read_text() == generate_meta_file(
+        assert parse_meta_file_content(
+            meta_file.read_text()
+        ).checksum == generate_meta_file(
             path=generated_code_directory,
             meta_file_name=STRICTQL_META_FILE_NAME,
             exclude_file_extensions=FILE_EXTENSIONS_TO_EXCLUDE,
@@ -69,7 +76,9 @@ def test_write_generated_code_recreate_directory_when_directory_exists_and_meta_
 
         meta_file = generated_code_directory / STRICTQL_META_FILE_NAME
         assert meta_file.exists()
-        assert meta_file.read_text() == generate_meta_file(
+        assert parse_meta_file_content(
+            meta_file.read_text()
+        ).checksum == generate_meta_file(
             path=generated_code_directory,
             meta_file_name=STRICTQL_META_FILE_NAME,
             exclude_file_extensions=FILE_EXTENSIONS_TO_EXCLUDE,
@@ -96,7 +105,9 @@ def test_write_generated_code_recreate_directory_when_directory_exists_and_meta_
 
         meta_file = generated_code_directory / STRICTQL_META_FILE_NAME
         assert meta_file.exists()
-        assert meta_file.read_text() == generate_meta_file(
+        assert parse_meta_file_content(
+            meta_file.read_text()
+        ).checksum == generate_meta_file(
             path=generated_code_directory,
             meta_file_name=STRICTQL_META_FILE_NAME,
             exclude_file_extensions=FILE_EXTENSIONS_TO_EXCLUDE,
@@ -192,3 +203,81 @@ def test_write_generated_code_raises_when_directory_is_not_a_directory() -> None
                 error.value.error
                 == f"Code generation path`{file.resolve()}` is not a directory."
             )
+
+
+def test_write_generated_code_does_not_rewrite_unchanged_files() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generated_code_directory = pathlib.Path(tmpdir) / "generated_code"
+        unchanged_file = generated_code_directory / "unchanged.py"
+        changed_file = generated_code_directory / "subdir" / "changed.py"
+        removed_file = generated_code_directory / "removed" / "removed.py"
+
+        write_generated_code(
+            target_directory=generated_code_directory,
+            files={
+                unchanged_file: "unchanged",
+                changed_file: "old content",
+                removed_file: "removed",
+            },
+            meta_file_name=STRICTQL_META_FILE_NAME,
+        )
+        removed_file_bytecode = removed_file.parent / "__pycache__" / "removed.pyc"
+        removed_file_bytecode.parent.mkdir()
+        removed_file_bytecode.write_text("bytecode")
+        os.utime(unchanged_file, ns=(0, 0))
+
+        write_generated_code(
+            target_directory=generated_code_directory,
+            files={
+                unchanged_file: "unchanged",
+                changed_file: "new content",
+            },
+            meta_file_name=STRICTQL_META_FILE_NAME,
+        )
+
+        assert unchanged_file.stat().st_mtime_ns == 0
+        assert changed_file.read_text() == "new content"
+        assert not removed_file.parent.exists()
+
+
+def test_read_generated_code_returns_files_with_inputs_hashes() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generated_code_directory = pathlib.Path(tmpdir) / "generated_code"
+        file_path = generated_code_directory / "subdir" / "file.py"
+        inputs_hashes = GeneratedFileInputsHashes(
+            query_hash="query_hash", introspection_hash="introspection_hash"
+        )
+
+        assert (
+            read_generated_code(
+                target_directory=generated_code_directory,
+                meta_file_name=STRICTQL_META_FILE_NAME,
+            )
+            == {}
+        )
+
+        write_generated_code(
+            target_directory=generated_code_directory,
+            files={file_path: "content"},
+            meta_file_name=STRICTQL_META_FILE_NAME,
+            files_inputs_hashes={file_path: inputs_hashes},
+        )
+
+        assert read_generated_code(
+            target_directory=generated_code_directory,
+            meta_file_name=STRICTQL_META_FILE_NAME,
+        ) == {
+            file_path.resolve(): GeneratedFile(
+                content="content", inputs_hashes=inputs_hashes
+            )
+        }
+
+        file_path.write_text("changed manually")
+
+        assert (
+            read_generated_code(
+                target_directory=generated_code_directory,
+                meta_file_name=STRICTQL_META_FILE_NAME,
+            )
+            == {}
+        )
@@ -0,0 +1,46 @@
+import pathlib
+
+from strictql_postgres.generation_inputs import get_ruff_settings_version
+
+
+def test_get_ruff_settings_version_depends_on_closest_ruff_settings(
+    tmp_path: pathlib.Path,
+) -> None:
+    project_path = tmp_path / "project"
+    package_path = project_path / "package"
+    package_path.mkdir(parents=True)
+    # pyproject.toml files without ruff settings are skipped by ruff
+    (package_path / "pyproject.toml").write_text("[project]\nname = 'package'\n")
+    (project_path / "pyproject.toml").write_text("[tool.ruff]\nline-length = 100\n")
+    other_project_path = tmp_path / "other_project"
+    other_project_path.mkdir()
+    (other_project_path / "ruff.toml").write_text("line-length = 100\n")
+    changed_project_path = tmp_path / "changed_project"
+    changed_project_path.mkdir()
+    (changed_project_path / "ruff.toml").write_text("line-length = 120\n")
+
+    assert get_ruff_settings_version(
+        directory=package_path
+    ) == get_ruff_settings_version(directory=project_path)
+    assert get_ruff_settings_version(
+        directory=project_path
+    ) != get_ruff_settings_version(directory=changed_project_path)
+    assert get_ruff_settings_version(
+        directory=other_project_path
+    ) != get_ruff_settings_version(directory=changed_project_path)
+
+
+def test_get_ruff_settings_version_depends_on_extended_settings(
+    tmp_path: pathlib.Path,
+) -> None:
+    versions = []
+    for quote_style in ["double", "single"]:
+        project_path = tmp_path / quote_style
+        project_path.mkdir()
+        (project_path / "ruff.toml").write_text('extend = "base.toml"\n')
+        (project_path / "base.toml").write_text(
+            f'[format]\nquote-style = "{quote_style}"\n'
+        )
+        versions.append(get_ruff_settings_version(directory=project_path))
+
+    assert versions[0] != versions[1]
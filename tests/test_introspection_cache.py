@@ -0,0 +1,211 @@
+import dataclasses
+import pathlib
+import tempfile
+
+import asyncpg
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.introspection_cache import (
+    INTROSPECTION_CACHE_VERSION,
+    IntrospectionCache,
+    IntrospectionCacheFileModel,
+    create_introspection_cache_key,
+    dump_query_introspection,
+    get_catalog_fingerprint,
+    load_query_introspection,
+)
+from strictql_postgres.python_types import (
+    DateTimeType,
+    DecimalType,
+    Integer,
+    RecursiveListType,
+    String,
+)
+from strictql_postgres.query_generator import get_query_introspection
+
+QUERY_INTROSPECTION = QueryIntrospection(
+    response_schema={
+        "id": Integer(is_optional=True),
+        "name": String(is_optional=False),
+        "created_at": DateTimeType(is_optional=True),
+        "amounts": RecursiveListType(
+            generic_type=DecimalType(is_optional=True), is_optional=True
+        ),
+    },
+    bind_params_types=[
+        RecursiveListType(generic_type=Integer(is_optional=True), is_optional=True),
+        String(is_optional=True),
+    ],
+    not_null_columns=frozenset({"id"}),
+    columns_postgres_types={
+        "id": "int4",
+        "name": "text",
+        "created_at": "timestamptz",
+        "amounts": "numeric[]",
+    },
+)
+
+
+def test_dump_and_load_query_introspection() -> None:
+    assert (
+        load_query_introspection(
+            cached_introspection=dump_query_introspection(
+                introspection=QUERY_INTROSPECTION
+            )
+        )
+        == QUERY_INTROSPECTION
+    )
+
+
+def test_dump_and_load_query_introspection_without_nullability() -> None:
+    introspection = dataclasses.replace(QUERY_INTROSPECTION, not_null_columns=None)
+
+    assert (
+        load_query_introspection(
+            cached_introspection=dump_query_introspection(introspection=introspection)
+        )
+        == introspection
+    )
+
+
+def test_cache_key_does_not_depend_on_query_formatting() -> None:
+    assert create_introspection_cache_key(
+        query="select id, name from users where id = $1", catalog_fingerprint="1"
+    ) == create_introspection_cache_key(
+        query="SELECT id,\n       name\nFROM users\nWHERE id = $1;",
+        catalog_fingerprint="1",
+    )
+
+
+def test_cache_key_depends_on_query_and_catalog_fingerprint() -> None:
+    key = create_introspection_cache_key(query="select 1", catalog_fingerprint="1")
+
+    assert key != create_introspection_cache_key(
+        query="select 2", catalog_fingerprint="1"
+    )
+    assert key != create_introspection_cache_key(
+        query="select 1", catalog_fingerprint="2"
+    )
+
+
+def test_cache_key_for_invalid_query() -> None:
+    assert create_introspection_cache_key(
+        query="sselect 1", catalog_fingerprint="1"
+    ) != create_introspection_cache_key(query="sselect 2", catalog_fingerprint="1")
+
+
+def test_introspection_cache_saves_only_used_entries() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = pathlib.Path(tmpdir) / "cache" / "introspection_cache.json"
+
+        cache = IntrospectionCache.load(path=cache_path)
+        assert cache.get(key="used") is None
+        cache.set(key="used", introspection=QUERY_INTROSPECTION)
+        cache.set(key="unused", introspection=QUERY_INTROSPECTION)
+        cache.save()
+
+        cache = IntrospectionCache.load(path=cache_path)
+        assert cache.get(key="used") == QUERY_INTROSPECTION
+        cache.save()
+
+        cache = IntrospectionCache.load(path=cache_path)
+        assert cache.get(key="used") == QUERY_INTROSPECTION
+        assert cache.get(key="unused") is None
+
+
+def test_introspection_cache_for_database() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = IntrospectionCache.load(
+            path=pathlib.Path(tmpdir) / "introspection_cache.json"
+        )
+        database_cache = cache.for_database(catalog_fingerprint="1")
+        database_cache.set(query="select 1", introspection=QUERY_INTROSPECTION)
+
+        assert database_cache.get(query="SELECT 1") == QUERY_INTROSPECTION
+        assert cache.for_database(catalog_fingerprint="2").get(query="select 1") is None
+
+
+def test_introspection_cache_ignores_broken_file() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = pathlib.Path(tmpdir) / "introspection_cache.json"
+        cache_path.write_text("{")
+
+        cache = IntrospectionCache.load(path=cache_path)
+        assert cache.get(key="key") is None
+        cache.set(key="key", introspection=QUERY_INTROSPECTION)
+        cache.save()
+
+        assert (
+            IntrospectionCache.load(path=cache_path).get(key="key")
+            == QUERY_INTROSPECTION
+        )
+
+
+def test_introspection_cache_ignores_file_with_another_version() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = pathlib.Path(tmpdir) / "introspection_cache.json"
+        cache_path.write_text(
+            IntrospectionCacheFileModel(
+                version=INTROSPECTION_CACHE_VERSION + 1,
+                entries={
+                    "key": dump_query_introspection(introspection=QUERY_INTROSPECTION)
+                },
+            ).model_dump_json()
+        )
+
+        assert IntrospectionCache.load(path=cache_path).get(key="key") is None
+
+
+async def test_catalog_fingerprint_changes_when_schema_changes(
+    asyncpg_connection_pool_to_test_db: asyncpg.Pool,
+) -> None:
+    async with asyncpg_connection_pool_to_test_db.acquire() as connection:
+        initial_fingerprint = await get_catalog_fingerprint(connection=connection)
+        assert initial_fingerprint == await get_catalog_fingerprint(
+            connection=connection
+        )
+
+        await connection.execute("create table users (id integer)")
+        fingerprint_after_create_table = await get_catalog_fingerprint(
+            connection=connection
+        )
+        assert fingerprint_after_create_table != initial_fingerprint
+
+        await connection.execute("alter table users alter column id type bigint")
+        assert (
+            await get_catalog_fingerprint(connection=connection)
+            != fingerprint_after_create_table
+        )
+
+
+async def test_get_query_introspection_infers_nullability_only_if_required(
+    asyncpg_connection_pool_to_test_db: asyncpg.Pool,
+) -> None:
+    async with asyncpg_connection_pool_to_test_db.acquire() as connection:
+        await connection.execute("create table users (id integer not null)")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = IntrospectionCache.load(
+                path=pathlib.Path(tmpdir) / "introspection_cache.json"
+            ).for_database(catalog_fingerprint="1")
+
+            introspection = await get_query_introspection(
+                query="select id from users",
+                connection=connection,
+                introspection_cache=cache,
+            )
+            assert introspection.not_null_columns is None
+
+            # the cached introspection without nullability is introspected again
+            introspection = await get_query_introspection(
+                query="select id from users",
+                connection=connection,
+                introspection_cache=cache,
+                infer_nullability=True,
+            )
+            assert introspection.not_null_columns == frozenset({"id"})
+
+            introspection = await get_query_introspection(
+                query="select id from users",
+                connection=connection,
+                introspection_cache=cache,
+            )
+            assert introspection.not_null_columns is None
@@ -0,0 +1,108 @@
+import importlib
+import pathlib
+import sys
+
+import pytest
+from pydantic import SecretStr
+
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.lazy_package import (
+    PACKAGE_INIT_FILE_NAME,
+    get_package_init_files_paths,
+)
+from strictql_postgres.python_types import Integer, String
+from strictql_postgres.queries_generator import generate_queries
+from strictql_postgres.queries_to_generate import (
+    DataBaseSettings,
+    QueryToGenerate,
+    StrictQLQueriesToGenerate,
+)
+from strictql_postgres.schema_snapshot import SchemaSnapshot
+from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
+
+
+def test_get_package_init_files_paths() -> None:
+    generated_code_path = pathlib.Path("generated_code").resolve()
+
+    assert get_package_init_files_paths(
+        files_paths=[
+            generated_code_path / "users" / "admins" / "fetch_admins.py",
+            generated_code_path / "users" / "fetch_users.py",
+            generated_code_path / "fetch_orders.py",
+        ],
+        generated_code_path=generated_code_path,
+    ) == [
+        generated_code_path / PACKAGE_INIT_FILE_NAME,
+        generated_code_path / "users" / PACKAGE_INIT_FILE_NAME,
+        generated_code_path / "users" / "admins" / PACKAGE_INIT_FILE_NAME,
+    ]
+
+
+async def test_generate_queries_with_lazy_imports(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    generated_code_path = tmp_path / "lazy_generated_code"
+    connection_url = SecretStr("")
+    queries = {
+        "select id, name from users": "fetch_users",
+        "select id from users where id = $1": "fetch_user",
+    }
+    queries_to_generate = StrictQLQueriesToGenerate(
+        queries_to_generate={
+            generated_code_path / "users" / f"{function_name}.py": QueryToGenerate(
+                query=query,
+                parameters={},
+                database_name="db",
+                database_connection_url=connection_url,
+                query_type="fetch",
+                function_name=StringInSnakeLowerCase(function_name),
+                lazy_imports=True,
+            )
+            for query, function_name in queries.items()
+        },
+        databases={"db": DataBaseSettings(connection_url=connection_url)},
+        generated_code_path=generated_code_path,
+        lazy_imports=True,
+    )
+    schema_snapshot = SchemaSnapshot.create(
+        introspections={
+            "db": {
+                query: QueryIntrospection(
+                    response_schema={
+                        "id": Integer(is_optional=True),
+                        "name": String(is_optional=True),
+                    },
+                    bind_params_types=[],
+                )
+                for query in queries
+            }
+        }
+    )
+
+    generated_files = await generate_queries(
+        queries_to_generate=queries_to_generate, schema_snapshot=schema_snapshot
+    )
+
+    assert list(generated_files)[-2:] == [
+        generated_code_path.resolve() / PACKAGE_INIT_FILE_NAME,
+        generated_code_path.resolve() / "users" / PACKAGE_INIT_FILE_NAME,
+    ]
+    for file_path, generated_file in generated_files.items():
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(generated_file.content)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    users_package = importlib.import_module("lazy_generated_code.users")
+    assert "lazy_generated_code.users.fetch_users" not in sys.modules
+
+    fetch_users_model: object = getattr(users_package, "FetchUsersModel")
+
+    assert "lazy_generated_code.users.fetch_users" in sys.modules
+    assert "lazy_generated_code.users.fetch_user" not in sys.modules
+    model_name: object = getattr(fetch_users_model, "__name__")
+    assert model_name == "FetchUsersModel"
+    # validators of the model are built on first use
+    is_model_complete: object = getattr(fetch_users_model, "__pydantic_complete__")
+    assert is_model_complete is False
+    with pytest.raises(AttributeError):
+        getattr(users_package, "not_generated")
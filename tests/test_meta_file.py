@@ -7,7 +7,9 @@ from strictql_postgres.meta_file import (
     FILE_EXTENSIONS_TO_EXCLUDE,
     STRICTQL_META_FILE_NAME,
     GenerateMetaFileError,
+    MetaFileContent,
     generate_meta_file,
+    parse_meta_file_content,
 )
 
 
@@ -108,3 +110,7 @@ def test_generate_meta_file_skip_excluded_extensions() -> None:
             meta_file_content_before_file_with_extension_to_skip
             == meta_file_content_after_file_with_extension_to_skip
         )
+
+
+def test_parse_meta_file_content_with_only_checksum() -> None:
+    assert parse_meta_file_content("checksum") == MetaFileContent(checksum="checksum")
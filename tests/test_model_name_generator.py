@@ -2,6 +2,8 @@ import pytest
 
 from strictql_postgres.model_name_generator import (
     generate_model_name_by_function_name,
+    generate_params_model_name_by_function_name,
+    generate_record_decoder_name_by_model_name,
 )
 from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
 
@@ -20,3 +22,28 @@ def test_generate_model_name_by_function_name(
         generate_model_name_by_function_name(function_name=function_name)
         == expected_model_name
     )
+
+
+@pytest.mark.parametrize(
+    ("model_name", "expected_decoder_name"),
+    [
+        ("GetUsersModel", "decode_get_users_model"),
+        ("GetUser2Model", "decode_get_user2_model"),
+    ],
+)
+def test_generate_record_decoder_name_by_model_name(
+    model_name: str, expected_decoder_name: str
+) -> None:
+    assert (
+        generate_record_decoder_name_by_model_name(model_name=model_name)
+        == expected_decoder_name
+    )
+
+
+def test_generate_params_model_name_by_function_name() -> None:
+    assert (
+        generate_params_model_name_by_function_name(
+            function_name=StringInSnakeLowerCase("insert_users")
+        )
+        == "InsertUsersParams"
+    )
@@ -0,0 +1,60 @@
+import pytest
+
+import asyncpg
+from strictql_postgres.nullability import get_not_null_columns
+
+TABLES = """
+create table users (id integer primary key, name text not null, email text);
+create table orders (id integer primary key, user_id integer not null references users (id), comment text);
+"""
+
+
+@pytest.mark.parametrize(
+    ("query", "expected_not_null_columns"),
+    [
+        ("select id, name, email from users", {"id", "name"}),
+        ("select u.id as user_id, u.* from users u", {"user_id", "id", "name"}),
+        (
+            "select u.name, o.id as order_id from users u join orders o on o.user_id = u.id",
+            {"name", "order_id"},
+        ),
+        (
+            "select u.name, o.id as order_id from users u left join orders o on o.user_id = u.id",
+            {"name"},
+        ),
+        (
+            "select u.name, o.user_id from users u full join orders o on o.user_id = u.id",
+            set(),
+        ),
+        (
+            "select name::varchar, count(*) as count, 1 as one from users group by name",
+            {"name", "count", "one"},
+        ),
+        ("select max(id) as max_id, null::integer as nothing from users", set()),
+        ("select id from users union select id from orders", set()),
+        ("select name from users group by rollup (name)", set()),
+        ("with u as (select id from users) select id from u", set()),
+        ("select id from (select id from users) as u", set()),
+        (
+            "insert into users (id, name) values (1, 'name') returning id, name, email",
+            {"id", "name"},
+        ),
+    ],
+)
+async def test_get_not_null_columns(
+    asyncpg_connection_to_test_db: asyncpg.Connection,
+    query: str,
+    expected_not_null_columns: set[str],
+) -> None:
+    await asyncpg_connection_to_test_db.execute(TABLES)
+    prepared_statement = await asyncpg_connection_to_test_db.prepare(query)
+
+    not_null_columns = await get_not_null_columns(
+        query=query,
+        column_names=[
+            attribute.name for attribute in prepared_statement.get_attributes()
+        ],
+        connection=asyncpg_connection_to_test_db,
+    )
+
+    assert not_null_columns == expected_not_null_columns
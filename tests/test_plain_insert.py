@@ -0,0 +1,47 @@
+import pytest
+
+from strictql_postgres.plain_insert import (
+    NotPlainInsertError,
+    PlainInsert,
+    parse_plain_insert,
+)
+
+
+@pytest.mark.parametrize(
+    ("query", "expected_plain_insert"),
+    [
+        (
+            "insert into users (id, name) values ($1, $2)",
+            PlainInsert(schema_name=None, table_name="users", columns=["id", "name"]),
+        ),
+        (
+            "INSERT INTO public.users (name) VALUES ($1);",
+            PlainInsert(schema_name="public", table_name="users", columns=["name"]),
+        ),
+    ],
+)
+def test_parse_plain_insert(query: str, expected_plain_insert: PlainInsert) -> None:
+    assert parse_plain_insert(query=query) == expected_plain_insert
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "select $1::int",
+        "insert into users (id, name) values ($1, $2); select 1",
+        "insert into users values ($1, $2)",
+        "insert into users (id, name) values ($2, $1)",
+        "insert into users (id, name) values ($1, 'name')",
+        "insert into users (id, name) values ($1, $2), ($3, $4)",
+        "insert into users (id, name) select $1, $2",
+        "insert into users (id, name) values ($1, $2) returning id",
+        "insert into users (id, name) values ($1, $2) on conflict do nothing",
+        "with a as (select 1) insert into users (id, name) values ($1, $2)",
+        "insert into",
+    ],
+)
+def test_parse_plain_insert_raises_error_if_query_is_not_plain_insert(
+    query: str,
+) -> None:
+    with pytest.raises(NotPlainInsertError):
+        parse_plain_insert(query=query)
@@ -0,0 +1,80 @@
+import pytest
+
+from asyncpg import Connection, Pool
+from strictql_postgres.prepared_statements_registry import (
+    PreparedStatementsRegistry,
+    PreparedStatementsRegistryError,
+)
+
+
+async def test_prepared_statements_registry_prepares_query_once_per_connection(
+    asyncpg_connection_to_test_db: Connection,
+) -> None:
+    registry = PreparedStatementsRegistry()
+
+    statement = await registry.prepare(asyncpg_connection_to_test_db, "select 1")
+
+    assert (
+        await registry.prepare(asyncpg_connection_to_test_db, "select 1") is statement
+    )
+    assert (
+        await registry.prepare(asyncpg_connection_to_test_db, "select 2")
+        is not statement
+    )
+
+
+async def test_prepared_statements_registry_raises_error_for_pool_connection(
+    asyncpg_connection_pool_to_test_db: Pool,
+) -> None:
+    registry = PreparedStatementsRegistry()
+
+    async with asyncpg_connection_pool_to_test_db.acquire() as connection:
+        with pytest.raises(
+            PreparedStatementsRegistryError,
+            match="Pool connections are not supported",
+        ):
+            await registry.prepare(connection, "select 1")
+
+
+async def test_prepared_statements_registry_prepares_evicted_query_again(
+    asyncpg_connection_to_test_db: Connection,
+) -> None:
+    registry = PreparedStatementsRegistry()
+    statement = await registry.prepare(asyncpg_connection_to_test_db, "select 1")
+
+    registry.evict(asyncpg_connection_to_test_db, "select 1")
+    registry.evict(asyncpg_connection_to_test_db, "select 2")
+
+    assert (
+        await registry.prepare(asyncpg_connection_to_test_db, "select 1")
+        is not statement
+    )
+
+
+async def test_generated_code_prepares_statement_again_after_result_type_changed(
+    asyncpg_connection_to_test_db: Connection,
+) -> None:
+    from tests.code_generator.expected_generated_code.fetch_all_with_prepared_statements_registry import (
+        FetchAllUsersModel,
+        fetch_all_users,
+    )
+
+    await asyncpg_connection_to_test_db.execute(
+        "create table users (id serial not null, name text)"
+    )
+    await asyncpg_connection_to_test_db.execute(
+        "insert into users (id, name) values ($1, $2)", 1, "kek"
+    )
+    assert list(
+        await fetch_all_users(asyncpg_connection_to_test_db, id=1, name="kek")
+    ) == [FetchAllUsersModel(id=1, name="kek")]
+
+    # the generated query selects all columns, so its result type changes
+    await asyncpg_connection_to_test_db.execute(
+        "alter table users add column email text"
+    )
+
+    for _ in range(2):
+        assert list(
+            await fetch_all_users(asyncpg_connection_to_test_db, id=1, name="kek")
+        ) == [FetchAllUsersModel(id=1, name="kek")]
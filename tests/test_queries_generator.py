@@ -5,6 +5,8 @@ from unittest.mock import AsyncMock
 import pytest
 from pydantic import SecretStr
 
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.python_types import Integer, String
 from strictql_postgres.queries_generator import (
     PostgresConnectionError,
     QueriesGeneratorErrors,
@@ -17,6 +19,7 @@ from strictql_postgres.queries_to_generate import (
     StrictQLQueriesToGenerate,
 )
 from strictql_postgres.query_generator import QueryPythonCodeGeneratorError
+from strictql_postgres.schema_snapshot import SchemaSnapshot
 from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
 
 
@@ -51,13 +54,16 @@ async def test_strictql_generator_works() -> None:
 
 async def test_strictql_generator_handle_query_generator_error() -> None:
     with mock.patch(
-        "strictql_postgres.queries_generator.generate_query_python_code",
+        "strictql_postgres.queries_generator.get_query_introspection",
         new=AsyncMock(),
-    ) as mocked_generate_query_python_code:
+    ) as mocked_get_query_introspection:
         query_generator_error1 = "kek"
         query_generator_error2 = "eke"
-        mocked_generate_query_python_code.side_effect = [  # type: ignore[misc]
-            "a=1",
+        mocked_get_query_introspection.side_effect = [  # type: ignore[misc]
+            QueryIntrospection(
+                response_schema={"value": Integer(is_optional=True)},
+                bind_params_types=[],
+            ),
             QueryPythonCodeGeneratorError(query_generator_error1),
             QueryPythonCodeGeneratorError(query_generator_error2),
         ]
@@ -139,3 +145,45 @@ async def test_strictql_generator_handle_invalid_postgres_login_password() -> No
         error.value.error
         == "<class 'asyncpg.exceptions.InvalidPasswordError'>: password authentication failed for user \"postgres\""
     )
+
+
+async def test_generate_queries_without_code_format_imports_only_used_names() -> None:
+    connection_url = SecretStr("")
+    file_path = pathlib.Path("generated_code") / "fetch_users.py"
+    query = "select id, name from users"
+
+    generated_files = await generate_queries(
+        queries_to_generate=StrictQLQueriesToGenerate(
+            queries_to_generate={
+                file_path: QueryToGenerate(
+                    query=query,
+                    parameters={},
+                    database_name="db",
+                    database_connection_url=connection_url,
+                    query_type="fetch",
+                    function_name=StringInSnakeLowerCase("fetch_users"),
+                ),
+            },
+            databases={"db": DataBaseSettings(connection_url=connection_url)},
+            generated_code_path=pathlib.Path("generated_code"),
+            code_format="none",
+        ),
+        schema_snapshot=SchemaSnapshot.create(
+            introspections={
+                "db": {
+                    query: QueryIntrospection(
+                        response_schema={
+                            "id": Integer(is_optional=False),
+                            "name": String(is_optional=True),
+                        },
+                        bind_params_types=[],
+                    )
+                }
+            }
+        ),
+    )
+
+    # rows are validated by a type adapter, records are not decoded one by one
+    content = generated_files[file_path].content
+    assert "_rows_adapter.validate_python(rows)" in content
+    assert "Record" not in content
@@ -0,0 +1,79 @@
+import pathlib
+
+import pytest
+
+from strictql_postgres import queries_renderer
+from strictql_postgres.code_quality import CodeFixer
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.python_types import Integer, String
+from strictql_postgres.queries_renderer import (
+    QueryToRender,
+    get_render_processes_count,
+    render_queries,
+)
+from strictql_postgres.query_generator import QueryToGenerateInfo
+from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
+
+
+def _create_query_to_render(index: int) -> QueryToRender:
+    return QueryToRender(
+        file_path=pathlib.Path(f"query_{index}.py"),
+        query_to_generate=QueryToGenerateInfo(
+            query=f"select id, name from users where id = $1 limit {index}",
+            function_name=StringInSnakeLowerCase(f"fetch_users_{index}"),
+            params={},
+            query_type="fetch",
+        ),
+        introspection=QueryIntrospection(
+            response_schema={
+                "id": Integer(is_optional=True),
+                "name": String(is_optional=True),
+            },
+            # params count differs from the query to generate for the last query
+            bind_params_types=[] if index != 3 else [Integer(is_optional=True)],
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    ("queries_count", "concurrency", "expected_processes_count"),
+    [
+        (0, 8, 1),
+        (queries_renderer.MIN_QUERIES_COUNT_PER_RENDER_PROCESS - 1, 8, 1),
+        (queries_renderer.MIN_QUERIES_COUNT_PER_RENDER_PROCESS * 3, 8, 3),
+        (queries_renderer.MIN_QUERIES_COUNT_PER_RENDER_PROCESS * 100, 8, 8),
+    ],
+)
+def test_get_render_processes_count(
+    queries_count: int, concurrency: int, expected_processes_count: int
+) -> None:
+    assert (
+        get_render_processes_count(queries_count=queries_count, concurrency=concurrency)
+        == expected_processes_count
+    )
+
+
+async def test_render_queries_in_processes_is_equal_to_rendering_in_current_process(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    queries_to_render = [_create_query_to_render(index=index) for index in range(4)]
+
+    expected_result = await render_queries(
+        queries_to_render=queries_to_render, concurrency=1
+    )
+    monkeypatch.setattr(queries_renderer, "MIN_QUERIES_COUNT_PER_RENDER_PROCESS", 1)
+    actual_result = await render_queries(
+        queries_to_render=queries_to_render, concurrency=2
+    )
+
+    # imports are iterated in the order of string hashes, which differs between processes,
+    # so the code is compared after formatting
+    code_fixer = CodeFixer()
+    assert await code_fixer.try_to_improve_files(
+        files=actual_result.rendered_files
+    ) == await code_fixer.try_to_improve_files(files=expected_result.rendered_files)
+    assert actual_result.errors == expected_result.errors
+    assert list(actual_result.rendered_files) == [
+        pathlib.Path(f"query_{index}.py") for index in range(3)
+    ]
+    assert list(actual_result.errors) == [pathlib.Path("query_3.py")]
@@ -0,0 +1,155 @@
+import pathlib
+
+import pytest
+from pydantic import SecretStr
+
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.introspection_cache import INTROSPECTION_CACHE_VERSION
+from strictql_postgres.python_types import Integer, String
+from strictql_postgres.queries_generator import (
+    QueriesGeneratorErrors,
+    generate_queries,
+)
+from strictql_postgres.queries_to_generate import (
+    DataBaseSettings,
+    QueryToGenerate,
+    StrictQLQueriesToGenerate,
+)
+from strictql_postgres.schema_snapshot import (
+    SchemaSnapshot,
+    SchemaSnapshotError,
+    SchemaSnapshotFileModel,
+)
+from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
+
+QUERY_INTROSPECTION = QueryIntrospection(
+    response_schema={
+        "id": Integer(is_optional=True),
+        "name": String(is_optional=True),
+    },
+    bind_params_types=[Integer(is_optional=True)],
+)
+
+
+def test_schema_snapshot_save_and_load(tmp_path: pathlib.Path) -> None:
+    snapshot_path = tmp_path / "snapshot.json"
+    SchemaSnapshot.create(
+        introspections={
+            "db": {"select id, name from users where id = $1": QUERY_INTROSPECTION}
+        }
+    ).save(path=snapshot_path)
+
+    schema_snapshot = SchemaSnapshot.load(path=snapshot_path)
+
+    assert (
+        schema_snapshot.get(
+            database_name="db",
+            query="SELECT id,   name FROM users WHERE id = $1",
+        )
+        == QUERY_INTROSPECTION
+    )
+    assert schema_snapshot.get(database_name="other_db", query="select 1") is None
+
+
+def test_schema_snapshot_load_raises_error_if_file_not_found(
+    tmp_path: pathlib.Path,
+) -> None:
+    with pytest.raises(SchemaSnapshotError):
+        SchemaSnapshot.load(path=tmp_path / "snapshot.json")
+
+
+def test_schema_snapshot_load_raises_error_if_version_changed(
+    tmp_path: pathlib.Path,
+) -> None:
+    snapshot_path = tmp_path / "snapshot.json"
+    snapshot_path.write_text(
+        SchemaSnapshotFileModel(
+            version=INTROSPECTION_CACHE_VERSION + 1, databases={}
+        ).model_dump_json()
+    )
+
+    with pytest.raises(SchemaSnapshotError):
+        SchemaSnapshot.load(path=snapshot_path)
+
+
+def _create_queries_to_generate(
+    query: str, infer_nullability: bool = False
+) -> StrictQLQueriesToGenerate:
+    # connection urls are not required without connecting to databases
+    connection_url = SecretStr("")
+    return StrictQLQueriesToGenerate(
+        queries_to_generate={
+            pathlib.Path("fetch_user.py"): QueryToGenerate(
+                query=query,
+                parameters={},
+                database_name="db",
+                database_connection_url=connection_url,
+                query_type="fetch",
+                function_name=StringInSnakeLowerCase("fetch_user"),
+                infer_nullability=infer_nullability,
+            )
+        },
+        databases={"db": DataBaseSettings(connection_url=connection_url)},
+        generated_code_path=pathlib.Path("generated_code"),
+    )
+
+
+async def test_generate_queries_from_schema_snapshot() -> None:
+    schema_snapshot = SchemaSnapshot.create(
+        introspections={
+            "db": {
+                "select 1 as value": QueryIntrospection(
+                    response_schema={"value": Integer(is_optional=True)},
+                    bind_params_types=[],
+                )
+            }
+        }
+    )
+
+    generated_files = await generate_queries(
+        queries_to_generate=_create_queries_to_generate(query="select 1 as value"),
+        schema_snapshot=schema_snapshot,
+    )
+
+    assert "async def fetch_user(" in (
+        generated_files[pathlib.Path("fetch_user.py")].content
+    )
+
+
+async def test_generate_queries_from_schema_snapshot_raises_error_if_query_not_found() -> (
+    None
+):
+    with pytest.raises(QueriesGeneratorErrors) as error:
+        await generate_queries(
+            queries_to_generate=_create_queries_to_generate(query="select 2 as value"),
+            schema_snapshot=SchemaSnapshot.create(introspections={}),
+        )
+
+    assert [query_error.error for query_error in error.value.errors] == [
+        "Query not found in the schema snapshot, update the snapshot by the `snapshot` command"
+    ]
+
+
+async def test_generate_queries_from_schema_snapshot_raises_error_if_nullability_not_found() -> (
+    None
+):
+    with pytest.raises(QueriesGeneratorErrors) as error:
+        await generate_queries(
+            queries_to_generate=_create_queries_to_generate(
+                query="select 1 as value", infer_nullability=True
+            ),
+            schema_snapshot=SchemaSnapshot.create(
+                introspections={
+                    "db": {
+                        "select 1 as value": QueryIntrospection(
+                            response_schema={"value": Integer(is_optional=True)},
+                            bind_params_types=[],
+                        )
+                    }
+                }
+            ),
+        )
+
+    assert [query_error.error for query_error in error.value.errors] == [
+        "Nullability of columns of the query not found in the schema snapshot, update the snapshot by the `snapshot` command"
+    ]
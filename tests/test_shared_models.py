@@ -0,0 +1,210 @@
+import dataclasses
+import importlib
+import pathlib
+
+import pytest
+from pydantic import SecretStr
+
+from strictql_postgres.common_types import QueryIntrospection
+from strictql_postgres.python_types import (
+    InnerModelType,
+    Integer,
+    ModelType,
+    String,
+)
+from strictql_postgres.queries_generator import generate_queries
+from strictql_postgres.queries_to_generate import (
+    DataBaseSettings,
+    QueryToGenerate,
+    StrictQLQueriesToGenerate,
+)
+from strictql_postgres.schema_snapshot import SchemaSnapshot
+from strictql_postgres.shared_models import (
+    SHARED_MODELS_FILE_NAME,
+    create_shared_model_type,
+    get_shared_models_module,
+)
+from strictql_postgres.string_in_snake_case import StringInSnakeLowerCase
+
+
+def test_create_shared_model_type_names_models_by_structure() -> None:
+    inner_model_type = ModelType(name="Inner", fields={"id": Integer(is_optional=True)})
+    model_type = ModelType(
+        name="FetchUsersModel",
+        fields={
+            "name": String(is_optional=True),
+            "inner": InnerModelType(model_type=inner_model_type, is_optional=False),
+        },
+    )
+    same_model_type = ModelType(name="FetchUserModel", fields=model_type.fields)
+
+    shared_model_type = create_shared_model_type(
+        model_type=model_type, model_backend="pydantic"
+    )
+
+    assert (
+        shared_model_type.name
+        == create_shared_model_type(
+            model_type=same_model_type, model_backend="pydantic"
+        ).name
+    )
+    assert (
+        shared_model_type.name
+        != create_shared_model_type(
+            model_type=model_type, model_backend="dataclass"
+        ).name
+    )
+    assert (
+        shared_model_type.name
+        != create_shared_model_type(
+            model_type=inner_model_type, model_backend="pydantic"
+        ).name
+    )
+
+
+@pytest.mark.parametrize(
+    ("relative_path", "expected_module"),
+    [
+        ("fetch_users.py", "._shared_models"),
+        ("users/fetch_users.py", ".._shared_models"),
+    ],
+)
+def test_get_shared_models_module(relative_path: str, expected_module: str) -> None:
+    generated_code_path = pathlib.Path("generated_code")
+
+    assert (
+        get_shared_models_module(
+            file_path=generated_code_path / relative_path,
+            generated_code_path=generated_code_path,
+        )
+        == expected_module
+    )
+
+
+async def test_generate_queries_with_shared_models(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    generated_code_path = tmp_path / "shared_models_generated_code"
+    connection_url = SecretStr("")
+    queries = {
+        "select id, name from users": "fetch_users",
+        "select id, name from users where id = $1": "fetch_user",
+    }
+    queries_to_generate = StrictQLQueriesToGenerate(
+        queries_to_generate={
+            generated_code_path / "users" / f"{function_name}.py": QueryToGenerate(
+                query=query,
+                parameters={},
+                database_name="db",
+                database_connection_url=connection_url,
+                query_type="fetch",
+                function_name=StringInSnakeLowerCase(function_name),
+                shared_models=True,
+            )
+            for query, function_name in queries.items()
+        },
+        databases={"db": DataBaseSettings(connection_url=connection_url)},
+        generated_code_path=generated_code_path,
+        shared_models=True,
+    )
+    introspection = QueryIntrospection(
+        response_schema={
+            "id": Integer(is_optional=True),
+            "name": String(is_optional=True),
+        },
+        bind_params_types=[],
+    )
+    schema_snapshot = SchemaSnapshot.create(
+        introspections={"db": {query: introspection for query in queries}}
+    )
+
+    generated_files = await generate_queries(
+        queries_to_generate=queries_to_generate, schema_snapshot=schema_snapshot
+    )
+
+    shared_models_code = generated_files[
+        generated_code_path / SHARED_MODELS_FILE_NAME
+    ].content
+    assert shared_models_code.count("class ") == 1
+    for file_path, generated_file in generated_files.items():
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(generated_file.content)
+        if file_path.name != SHARED_MODELS_FILE_NAME:
+            assert "class " not in generated_file.content
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    fetch_users_module = importlib.import_module(
+        "shared_models_generated_code.users.fetch_users"
+    )
+    fetch_user_module = importlib.import_module(
+        "shared_models_generated_code.users.fetch_user"
+    )
+    fetch_users_model: object = getattr(fetch_users_module, "FetchUsersModel")
+    fetch_user_model: object = getattr(fetch_user_module, "FetchUserModel")
+    assert fetch_users_model is fetch_user_model
+
+
+async def test_generate_queries_renders_shared_models_module_only_if_inputs_changed(
+    tmp_path: pathlib.Path,
+) -> None:
+    generated_code_path = tmp_path / "generated_code"
+    connection_url = SecretStr("")
+    queries_to_generate = StrictQLQueriesToGenerate(
+        queries_to_generate={
+            generated_code_path / "fetch_users.py": QueryToGenerate(
+                query="select id, name from users",
+                parameters={},
+                database_name="db",
+                database_connection_url=connection_url,
+                query_type="fetch",
+                function_name=StringInSnakeLowerCase("fetch_users"),
+                shared_models=True,
+            )
+        },
+        databases={"db": DataBaseSettings(connection_url=connection_url)},
+        generated_code_path=generated_code_path,
+        code_format="none",
+        shared_models=True,
+    )
+    shared_models_path = generated_code_path.resolve() / SHARED_MODELS_FILE_NAME
+
+    def create_schema_snapshot(name_type: String | Integer) -> SchemaSnapshot:
+        return SchemaSnapshot.create(
+            introspections={
+                "db": {
+                    "select id, name from users": QueryIntrospection(
+                        response_schema={
+                            "id": Integer(is_optional=True),
+                            "name": name_type,
+                        },
+                        bind_params_types=[],
+                    )
+                }
+            }
+        )
+
+    generated_files = await generate_queries(
+        queries_to_generate=queries_to_generate,
+        schema_snapshot=create_schema_snapshot(name_type=String(is_optional=True)),
+    )
+    # the module is taken from previously generated files, so it is not rendered again
+    previously_generated_files = {
+        **generated_files,
+        shared_models_path: dataclasses.replace(
+            generated_files[shared_models_path], content="previously generated"
+        ),
+    }
+
+    generated_files = await generate_queries(
+        queries_to_generate=queries_to_generate,
+        previously_generated_files=previously_generated_files,
+        schema_snapshot=create_schema_snapshot(name_type=String(is_optional=True)),
+    )
+    assert generated_files[shared_models_path].content == "previously generated"
+
+    generated_files = await generate_queries(
+        queries_to_generate=queries_to_generate,
+        previously_generated_files=previously_generated_files,
+        schema_snapshot=create_schema_snapshot(name_type=Integer(is_optional=True)),
+    )
+    assert "name: int | None" in generated_files[shared_models_path].content
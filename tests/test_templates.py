@@ -0,0 +1,35 @@
+import pathlib
+
+from strictql_postgres.templates import (
+    render_template,
+    set_templates_module_directory,
+)
+
+
+def test_render_template_stores_compiled_templates_in_module_directory(
+    tmp_path: pathlib.Path,
+) -> None:
+    rendered_in_memory = render_template(
+        "record_decoder.txt",
+        decoder_name="decode_user",
+        model_name="User",
+        fields=[("id", "record[0]")],
+        fields_types=["int"],
+        constructor="validate",
+    )
+
+    set_templates_module_directory(module_directory=tmp_path)
+    try:
+        rendered_from_module = render_template(
+            "record_decoder.txt",
+            decoder_name="decode_user",
+            model_name="User",
+            fields=[("id", "record[0]")],
+            fields_types=["int"],
+            constructor="validate",
+        )
+    finally:
+        set_templates_module_directory(module_directory=None)
+
+    assert rendered_from_module == rendered_in_memory
+    assert (tmp_path / "record_decoder.txt.py").is_file()